@@ -51,10 +51,28 @@ INSTALLED_APPS = [
     'corsheaders',                  # Django CORS headers
 ]
 
+# Swagger/ReDoc and the schema endpoints (settings_api only loads them with API_DOCS=1)
+API_DOCS = True
+
+# The schema is generated once per process, or at build time with:
+#   python manage.py build_schema
+# and served from memory (see entrega/schema.py). DEBUG always introspects the code.
+OPENAPI_SCHEMA = {
+    'ARTIFACT_DIR': BASE_DIR / 'openapi',
+    'USE_ARTIFACT': not DEBUG,
+}
+
+# Swagger UI and ReDoc fetch the cached document instead of ?format=openapi
+SWAGGER_SETTINGS = {'SPEC_URL': ('schema-json', {'format': '.json'})}
+REDOC_SETTINGS = {'SPEC_URL': ('schema-json', {'format': '.json'})}
+
 # Custom User Model
 AUTH_USER_MODEL = 'entrega.User'
 
 MIDDLEWARE = [
+    'entrega.metrics.MetricsMiddleware',
+    'entrega.profiling.ProfilingMiddleware',
+    'entrega.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -63,8 +81,61 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'entrega.db.routers.ReplicaRoutingMiddleware',
+    'entrega.db.slowlog.SlowQueryMiddleware',
 ]
 
+# Request metrics served at /metrics (see entrega/metrics.py). With several worker
+# processes set METRICS_DIR to a directory they share so /metrics adds them up
+METRICS = {
+    'DIR': os.environ.get('METRICS_DIR'),
+    'FLUSH_INTERVAL': 5,
+    # Scrapes send "Authorization: Bearer <token>"; without it /metrics only answers with DEBUG on
+    'TOKEN': os.environ.get('METRICS_TOKEN'),
+}
+
+# Queries slower than THRESHOLD_MS are logged with their plan to FILE (see
+# entrega/db/slowlog.py), report with: python manage.py slowqueries
+SLOW_QUERIES = {
+    'ENABLED': os.environ.get('SLOW_QUERIES') == '1',
+    'THRESHOLD_MS': int(os.environ.get('SLOW_QUERY_MS', 200)),
+    'FILE': BASE_DIR / 'logs' / 'slow_queries.log',
+    'MAX_BYTES': 10 * 1024 * 1024,
+    'BACKUP_COUNT': 5,
+    # Parameter values (password hashes, customer details) are left out unless enabled
+    'LOG_PARAMS': False,
+}
+
+# Profiles of requests sent with an X-Profile token from api/profiling/token/
+# (see entrega/profiling.py)
+PROFILING = {
+    'DIR': BASE_DIR / 'profiles',
+    'TOKEN_MAX_AGE': 600,
+    'SAMPLE_INTERVAL': 0.001,
+    # Spends the single-use tokens: must be shared by every process (not LocMem) unless DEBUG
+    'CACHE': 'default',
+}
+
+# JSON responses of MIN_SIZE bytes or more are sent with brotli (if installed)
+# or gzip; GETs to CATALOG_VIEWS are cached already compressed (see
+# entrega/compression.py)
+COMPRESSION = {
+    'MIN_SIZE': 1024,
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 5,
+    'CATALOG_VIEWS': [
+        'product_list', 'product_detail', 'category_list', 'category_detail', 'category_products',
+        'product_list_async', 'product_detail_async', 'category_list_async', 'category_detail_async',
+    ],
+    'CATALOG_TIMEOUT': 300,
+}
+
+# "Everything" lists (all orders, all customers) are streamed in pages of
+# CHUNK_SIZE rows (see entrega/streaming.py)
+STREAMING = {
+    'CHUNK_SIZE': 500,
+}
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -95,45 +166,167 @@ WSGI_APPLICATION = 'apiIntegracion.wsgi.application'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'entrega.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson when installed, same output as JSONRenderer/JSONParser (see entrega/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': (
+        'entrega.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'entrega.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
     # 'AUTH_HEADER_TYPES': ('Bearer',),
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=15),  # Duración del token de acceso
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),    # Duración del token de refresco
+    'TOKEN_OBTAIN_SERIALIZER': 'entrega.authentication.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'entrega.authentication.RevocationAwareTokenRefreshSerializer',
+}
+
+# Build request.user from the JWT claims (user_type, customer_id, supplier_id)
+# instead of loading auth_user and the profile on every request. is_active and
+# user_type are not checked per request: deactivating a user, changing their
+# user_type or moving/deleting their profile with .save()/.delete() revokes
+# their tokens instead (seen by other workers within JWT_REVOCATION['SYNC_INTERVAL'])
+JWT_CLAIMS_AUTH = True
+
+# Password hashing pool shared by the login endpoints (see entrega/login.py).
+# Only used with the default ModelBackend; other AUTHENTICATION_BACKENDS go
+# through authenticate() without the pool
+LOGIN = {
+    'HASH_WORKERS': 4,
+    'MAX_QUEUED': 16,
 }
+
+# Bulk user provisioning (see entrega/provisioning.py, python manage.py import_users)
+PROVISIONING = {
+    'HASH_WORKERS': None,  # hashing threads, None uses every CPU
+    'BATCH_SIZE': 500,
+    'MAX_USERS': 1000,
+}
+
+# Revoked tokens are kept in memory per process and synced from the database
+JWT_REVOCATION = {
+    'SYNC_INTERVAL': 5,
+    'OVERLAP': 30,
+}
+
+# Number of "frequently bought together" products kept per product
+RECOMMENDATIONS_TOP_N = 10
+
+# Background job queue (see entrega/jobs.py, run with: python manage.py run_workers)
+JOB_QUEUE = {
+    'BATCH_SIZE': 50,
+    'POLL_INTERVAL': 1.0,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF': 5,
+    'LOCK_TIMEOUT': 300,
+}
+
+# Shipped orders older than this are moved to the archive tables by: python manage.py archive_orders
+ORDER_ARCHIVE_AFTER_DAYS = 365
+ORDER_ARCHIVE_BATCH_SIZE = 500
+
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'  # Solo para desarrollo
+DEFAULT_FROM_EMAIL = 'no-reply@ferremas.cl'
+
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
 SQLITE_CONFIG = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('DB_SQLITE_NAME', BASE_DIR / 'db.sqlite3'),
+    }
+}
+
+# SQLite for branch stores with concurrent users (entrega/db/sqlite_tuned):
+# WAL so readers do not wait for writers, pragmas applied on every connect
+SQLITE_TUNED_CONFIG = {
+    'default': {
+        'ENGINE': 'entrega.db.sqlite_tuned',
+        'NAME': os.environ.get('DB_SQLITE_NAME', BASE_DIR / 'db.sqlite3'),
+        'CONN_MAX_AGE': 60,
+        'PRAGMAS': {
+            'journal_mode': 'wal',
+            'synchronous': 'normal',  # safe with WAL, a power loss may drop only the last commits
+            'mmap_size': 256 * 1024 * 1024,
+            'busy_timeout': 20000,  # ms waiting for the write lock before "database is locked"
+            'cache_size': -20000,  # KiB
+            'temp_store': 'memory',
+        },
+        'TRANSACTION_MODE': 'IMMEDIATE',
     }
 }
 
 MYSQL_CONFIG = {
     'default': {
         'ENGINE': 'django.db.backends.mysql',
-        'NAME': 'integracionecomerce',
-        'USER': 'admin',
-        'PASSWORD': 'N17382965-5',
-        'HOST': '127.0.0.1',
-        'PORT': '3306',
+        'NAME': os.environ.get('DB_NAME', 'integracionecomerce'),
+        'USER': os.environ.get('DB_USER', 'admin'),
+        'PASSWORD': os.environ.get('DB_PASSWORD', 'N17382965-5'),
+        'HOST': os.environ.get('DB_HOST', '127.0.0.1'),
+        'PORT': os.environ.get('DB_PORT', '3306'),
         'OPTIONS': {
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'"
-        }
+        },
+        # Keep each thread's connection open between requests, checked before reuse
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
-# Elige la configuración activa:
-# DATABASES = MYSQL_CONFIG
-DATABASES = SQLITE_CONFIG  # Using SQLite for development
+# DB_POOL=1: connections come from a pool shared by every thread of the process
+# (entrega/db/mysql_pool) and go back to it at the end of each request
+if os.environ.get('DB_POOL') == '1':
+    MYSQL_CONFIG['default'].update({
+        'ENGINE': 'entrega.db.mysql_pool',
+        'CONN_MAX_AGE': 0,
+        'POOL': {
+            'MAX_SIZE': int(os.environ.get('DB_POOL_SIZE', 10)),
+            'TIMEOUT': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+            'RECYCLE': 3600,
+            'PING_AFTER': 30,
+        },
+    })
+
+# Elige la configuración activa con DB_PROFILE=sqlite (por defecto), sqlite_tuned o mysql
+DB_PROFILE = os.environ.get('DB_PROFILE', 'sqlite')
+DATABASES = {
+    'mysql': MYSQL_CONFIG,
+    'sqlite_tuned': SQLITE_TUNED_CONFIG,
+}.get(DB_PROFILE, SQLITE_CONFIG)
+
+# Optional read replica of the active profile, e.g. locally with two SQLite files:
+#   cp db.sqlite3 replica.sqlite3 && DB_REPLICA_NAME=replica.sqlite3 python manage.py runserver
+# or a second MySQL with DB_REPLICA_HOST / DB_REPLICA_PORT
+REPLICA_ENV = {'NAME': 'DB_REPLICA_NAME', 'HOST': 'DB_REPLICA_HOST', 'PORT': 'DB_REPLICA_PORT'}
+REPLICA_CONFIG = {key: os.environ[var] for key, var in REPLICA_ENV.items() if os.environ.get(var)}
+if REPLICA_CONFIG:
+    DATABASES['replica'] = {**DATABASES['default'], **REPLICA_CONFIG, 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_ROUTERS = ['entrega.db.routers.ReplicaRouter']
+
+# GETs to these views read from the replica, unless the user wrote something
+# in the last STICKY_SECONDS (see entrega/db/routers.py)
+DB_ROUTING = {
+    'REPLICA': 'replica',
+    'STICKY_SECONDS': 5,
+    'READ_VIEWS': [
+        'product_list', 'product_detail', 'product_list_async', 'product_detail_async',
+        'category_list', 'category_detail', 'category_products', 'category_list_async', 'category_detail_async',
+        'supplier_list', 'supplier_detail', 'supplier_products',
+        'order_list', 'order_detail', 'order_list_async', 'order_detail_async',
+    ],
+}
 
 
 # Password validation
@@ -0,0 +1,49 @@
+"""
+Production settings for processes that only serve the JWT API.
+
+    DJANGO_SETTINGS_MODULE=apiIntegracion.settings_api
+
+Same as ``settings`` without the admin, sessions, messages, CSRF and
+clickjacking layers (JWT requests carry no cookies) and without the
+browsable API. The documentation apps (drf_yasg, static files) and their
+URLs are only loaded with ``API_DOCS=1``.
+"""
+from .settings import *  # noqa: F401,F403
+
+DEBUG = os.environ.get('DEBUG') == '1'
+ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '*').split(',')
+
+API_DOCS = os.environ.get('API_DOCS') == '1'
+OPENAPI_SCHEMA = {**OPENAPI_SCHEMA, 'USE_ARTIFACT': not DEBUG}
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'entrega',
+    'rest_framework',
+    'rest_framework_simplejwt',
+    'corsheaders',
+]
+if API_DOCS:
+    INSTALLED_APPS += ['django.contrib.staticfiles', 'drf_yasg']
+
+MIDDLEWARE = [
+    'entrega.metrics.MetricsMiddleware',
+    'entrega.profiling.ProfilingMiddleware',
+    'entrega.compression.CompressionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'entrega.db.routers.ReplicaRoutingMiddleware',
+    'entrega.db.slowlog.SlowQueryMiddleware',
+]
+
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'OPTIONS': {'context_processors': ['django.template.context_processors.request']},
+}]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ('entrega.renderers.FastJSONRenderer',),
+}
@@ -14,37 +14,33 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="API de Integración",
-        default_version='v1',
-        description="Documentación de la API de Integración",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="soporte@example.com"),
-        license=openapi.License(name="MIT License"),
-    ),
-    public=True,
-    permission_classes=(AllowAny,),
-)
-
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('',include("entrega.urls")),
-    re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 ]
+
+# The api-only profile (settings_api) leaves out the admin and, unless API_DOCS=1, the docs
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
+
+if settings.API_DOCS:
+    from entrega.views.viewsSchema import schema_document, schema_view
+
+    urlpatterns += [
+        re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_document, name='schema-json'),
+        path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
+        path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    ]
+
 if settings.DEBUG:
     urlpatterns+=static(settings.MEDIA_URL,document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Requests/second of /api/products/ with and without the connection pool.
+
+Needs a MySQL reachable through the DB_* variables, e.g. a local stand-in:
+    docker run -d -p 3306:3306 -e MYSQL_ROOT_PASSWORD=root -e MYSQL_DATABASE=integracionecomerce mysql:8
+    DB_PROFILE=mysql DB_USER=root DB_PASSWORD=root python manage.py migrate
+    DB_PROFILE=mysql DB_USER=root DB_PASSWORD=root python benchmarks/bench_db_pool.py --threads 16
+
+Each mode runs in its own process; every thread serves requests through
+the Django handler and closes connections the way the request cycle does:
+  connect     CONN_MAX_AGE=0, a new connection per request
+  persistent  CONN_MAX_AGE=60, one connection per thread
+  pool        DB_POOL=1, a pool of DB_POOL_SIZE shared by all threads
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    'connect': {'DB_POOL': '0', 'DB_CONN_MAX_AGE': '0'},
+    'persistent': {'DB_POOL': '0', 'DB_CONN_MAX_AGE': '60'},
+    'pool': {'DB_POOL': '1'},
+}
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+def run_mode(args):
+    """Child process: load the endpoint from ``args.threads`` threads, print JSON."""
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'apiIntegracion.settings')
+    import django
+    django.setup()
+    from django.db import close_old_connections
+    from django.test import Client
+    from entrega.db.pool import pool_stats
+
+    stop = threading.Event()
+    latencies, errors = [], []
+
+    def worker():
+        client = Client()
+        while not stop.is_set():
+            started = time.perf_counter()
+            response = client.get(args.path)
+            # The test client skips the request_finished cleanup, do it like a real request
+            close_old_connections()
+            if response.status_code == 200:
+                latencies.append((time.perf_counter() - started) * 1000)
+            else:
+                errors.append(response.status_code)
+
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    print(json.dumps({
+        'requests_per_second': len(latencies) / args.duration,
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+        'errors': len(errors),
+        'pools': pool_stats(),
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--path', default='/api/products/')
+    parser.add_argument('--mode', choices=MODES, action='append', help="modes to run (default: all)")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return run_mode(args)
+
+    if os.environ.get('DB_PROFILE') != 'mysql':
+        print("Warning: DB_PROFILE is not 'mysql', measuring the SQLite profile")
+    print(f"\n{'mode':<11} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}  pool")
+    for mode in args.mode or MODES:
+        env = dict(os.environ, **MODES[mode])
+        output = subprocess.run(
+            [sys.executable, __file__, '--child', '--threads', str(args.threads),
+             '--duration', str(args.duration), '--path', args.path],
+            env=env, cwd=PROJECT_DIR, capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        pool = result['pools'].get('default', {})
+        pool = f"created={pool['created']} reused={pool['reused']} waits={pool['waits']}" if pool else '-'
+        print(f"{mode:<11} {result['requests_per_second']:>9.1f} {result['p50']:>8.1f} "
+              f"{result['p99']:>8.1f} {result['errors']:>7}  {pool}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+DRF JSONRenderer/JSONParser vs entrega.renderers (orjson) on 10k-row bodies.
+
+Payloads, --rows rows each (synthetic, seeded):
+  products      ProductSerializer output: decimals already strings
+  orders        OrderSerializer output with 1-5 nested order_details
+  orders-raw    the same orders as .values() rows: Decimal and datetime
+                objects left to the encoder
+
+Checks that both renderers produce the same bytes, then prints the median
+and p95 of --repeat runs of each and the speedup.
+
+Run from the project directory:
+    python benchmarks/bench_json_render.py --rows 10000 --repeat 20
+"""
+import argparse
+import io
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+def product_row(rng, i):
+    return {
+        'product_id': i,
+        'category_name': rng.choice(('Herramientas', 'Electricidad', 'Gasfitería', 'Pinturas')),
+        'supplier_name': f'Proveedor {rng.randint(1, 50)}',
+        'product_name': f'Taladro Inalámbrico {i}',
+        'quantity_per_unit': rng.choice(('1 unidad', 'Caja 10', '1 galón')),
+        'unit_price': f'{rng.randint(290, 250000)}.00',
+        'units_in_order': rng.randint(0, 40),
+        'units_in_stock': rng.randint(0, 500),
+        'reorder_level': 10,
+        'discount': rng.choice(('0.00', '0.05', '0.10')),
+        'picture': None,
+        'category': rng.randint(1, 15),
+        'supplier': rng.randint(1, 50),
+    }
+
+def order_row(rng, i, raw):
+    ordered = datetime(2024, 1, 1, tzinfo=dt_timezone.utc) + timedelta(seconds=rng.randint(0, 365 * 86400))
+    money = (lambda value: value) if raw else str
+    when = (lambda value: value) if raw else (lambda value: value.isoformat().replace('+00:00', 'Z'))
+    details = [
+        {'id': i * 10 + n, 'product_name': f'Martillo Pro {n}', 'unit_price': money(Decimal(f'{rng.randint(290, 90000)}.00')),
+         'quantity': rng.randint(1, 10), 'discount': money(Decimal('0.00')), 'order': i, 'product': rng.randint(1, 10000)}
+        for n in range(rng.randint(1, 5))
+    ]
+    return {
+        'order_id': i,
+        'order_details': details,
+        'customer_name': f'Cliente {rng.randint(1, 5000)}',
+        'shipper_name': rng.choice(('Chilexpress', 'Starken', None)),
+        'order_date': when(ordered),
+        'required_date': when(ordered + timedelta(days=7)),
+        'shipped_date': None,
+        'freight': money(Decimal(rng.choice(('0.00', '2990.00', '4990.00')))),
+        'status': rng.choice(('pending', 'paid', 'delivered')),
+        'customer': rng.randint(1, 5000),
+        'shipper': rng.randint(1, 3),
+    }
+
+def payloads(rows, seed):
+    rng = random.Random(seed)
+    yield 'products', [product_row(rng, i) for i in range(rows)]
+    rng = random.Random(seed)
+    yield 'orders', [order_row(rng, i, raw=False) for i in range(rows)]
+    rng = random.Random(seed)
+    yield 'orders-raw', [order_row(rng, i, raw=True) for i in range(rows)]
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=49)
+    args = parser.parse_args()
+
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'apiIntegracion.settings')
+    import django
+    django.setup()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from entrega import renderers
+    from entrega.renderers import FastJSONParser, FastJSONRenderer
+
+    if renderers.orjson is None:
+        print('orjson is not installed: FastJSONRenderer is JSONRenderer, nothing to compare')
+        return
+    print(f'{args.rows} rows, median/p95 of {args.repeat} runs, orjson {renderers.orjson.__version__}\n')
+    print(f"{'payload':<12} {'op':<7} {'size':>9} {'json ms':>16} {'orjson ms':>16} {'speedup':>8}")
+    for name, data in payloads(args.rows, args.seed):
+        body = JSONRenderer().render(data)
+        if FastJSONRenderer().render(data) != body:
+            sys.exit(f'{name}: FastJSONRenderer output differs from JSONRenderer')
+        ops = (
+            ('render', lambda r=JSONRenderer(): r.render(data), lambda r=FastJSONRenderer(): r.render(data)),
+            ('parse', lambda p=JSONParser(): p.parse(io.BytesIO(body)), lambda p=FastJSONParser(): p.parse(io.BytesIO(body))),
+        )
+        for op, stdlib, fast in ops:
+            slow_times, fast_times = timed(stdlib, args.repeat), timed(fast, args.repeat)
+            slow_median, fast_median = statistics.median(slow_times), statistics.median(fast_times)
+            print(f'{name:<12} {op:<7} {len(body) / 1024:>7.0f}KB '
+                  f'{slow_median:>8.1f}/{percentile(slow_times, 95):<7.1f} {fast_median:>8.1f}/{percentile(fast_times, 95):<7.1f} '
+                  f'{slow_median / fast_median:>7.1f}x')
+
+if __name__ == "__main__":
+    main()
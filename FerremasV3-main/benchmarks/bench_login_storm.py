@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Login storm benchmark: catalog latency while many users log in at once.
+
+Start the API first, for example:
+    uvicorn apiIntegracion.asgi:application --workers 2
+then compare the sync and async login endpoints:
+    python benchmarks/bench_login_storm.py --login-path /api/auth/login/
+    python benchmarks/bench_login_storm.py --login-path /api/auth/login/async/
+
+Catalog p99 should stay close to the baseline during the storm.
+"""
+import argparse
+import statistics
+import threading
+import time
+
+import requests
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+def catalog_client(base_url, stop, latencies):
+    session = requests.Session()
+    while not stop.is_set():
+        started = time.perf_counter()
+        session.get(f"{base_url}/api/products/")
+        latencies.append((time.perf_counter() - started) * 1000)
+
+def login_client(base_url, login_path, username, password, stop, results):
+    session = requests.Session()
+    while not stop.is_set():
+        response = session.post(f"{base_url}{login_path}", json={'username': username, 'password': password})
+        results.append(response.status_code)
+
+def run_phase(args, storm):
+    stop = threading.Event()
+    latencies, logins = [], []
+    threads = [
+        threading.Thread(target=catalog_client, args=(args.base_url, stop, latencies))
+        for _ in range(args.catalog_clients)
+    ]
+    if storm:
+        threads += [
+            threading.Thread(target=login_client, args=(args.base_url, args.login_path, args.username, args.password, stop, logins))
+            for _ in range(args.storm_clients)
+        ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return latencies, logins
+
+def report(name, latencies, logins, duration):
+    print(f"\n=== {name} ===")
+    print(f"  catalog requests: {len(latencies)} ({len(latencies) / duration:.1f} req/s)")
+    if latencies:
+        print(f"  catalog p50: {statistics.median(latencies):.1f} ms  "
+              f"p95: {percentile(latencies, 95):.1f} ms  p99: {percentile(latencies, 99):.1f} ms")
+    if logins:
+        ok = logins.count(200)
+        throttled = logins.count(429)
+        print(f"  logins: {ok} ok ({ok / duration:.1f}/s), {throttled} throttled, "
+              f"{len(logins) - ok - throttled} other")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default="http://127.0.0.1:8000")
+    parser.add_argument('--login-path', default="/api/auth/login/async/")
+    parser.add_argument('--username', default="admin")
+    parser.add_argument('--password', default="admin123")
+    parser.add_argument('--catalog-clients', type=int, default=4)
+    parser.add_argument('--storm-clients', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    args = parser.parse_args()
+
+    baseline, _ = run_phase(args, storm=False)
+    report("Baseline (catalog only)", baseline, [], args.duration)
+    storm, logins = run_phase(args, storm=True)
+    report(f"Login storm on {args.login_path}", storm, logins, args.duration)
+    if baseline and storm:
+        print(f"\n  p99 change: {percentile(storm, 99) - percentile(baseline, 99):+.1f} ms")
+
+if __name__ == "__main__":
+    main()
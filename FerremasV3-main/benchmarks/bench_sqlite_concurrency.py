@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Mixed cart writes and catalog reads on SQLite, default vs tuned profile.
+
+Each profile runs in its own process on a fresh copy of db.sqlite3 (the
+project database is never touched): --writers threads add items to their
+own customer's cart (clearing it now and then) while --readers threads
+list /api/products/. Reports throughput and how many requests failed,
+e.g. with "database is locked".
+
+    python benchmarks/bench_sqlite_concurrency.py --writers 8 --readers 8 --duration 10
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILES = ('sqlite', 'sqlite_tuned')
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+def run_profile(args):
+    """Child process: seed customers, run the mixed load, print JSON."""
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'apiIntegracion.settings')
+    import django
+    django.setup()
+    from django.contrib.auth.hashers import make_password
+    from django.core.management import call_command
+    from django.db import close_old_connections
+    from django.test import Client
+    from entrega.authentication import tokens_for_user
+    from entrega.models import Customer, Product, User
+
+    call_command('migrate', verbosity=0)
+    product = Product.objects.first() or Product.objects.create(product_name="Bench", unit_price=1)
+    password = make_password('benchpassword')
+    tokens = []
+    for i in range(args.writers):
+        user = User.objects.create(username=f'bench_writer_{i}', password=password, user_type='customer')
+        Customer.objects.create(user=user)
+        tokens.append(tokens_for_user(user)['access'])
+    close_old_connections()
+
+    stop = threading.Event()
+    results = {'read': [], 'write': [], 'errors': []}
+
+    def timed(kind, call):
+        started = time.perf_counter()
+        try:
+            # Server errors such as "database is locked" come back as 500
+            ok = call().status_code < 400
+        finally:
+            # Same cleanup as the end of a real request
+            close_old_connections()
+        if ok:
+            results[kind].append((time.perf_counter() - started) * 1000)
+        else:
+            results['errors'].append(kind)
+
+    def writer(token):
+        client = Client(raise_request_exception=False, HTTP_AUTHORIZATION=f'Bearer {token}')
+        count = 0
+        while not stop.is_set():
+            count += 1
+            if count % 20 == 0:
+                timed('write', lambda: client.delete('/api/cart/clear/'))
+            else:
+                timed('write', lambda: client.post(
+                    '/api/cart/', {'product': product.pk, 'num_of_products': 1}, content_type='application/json'
+                ))
+
+    def reader():
+        client = Client(raise_request_exception=False)
+        while not stop.is_set():
+            timed('read', lambda: client.get('/api/products/'))
+
+    threads = [threading.Thread(target=writer, args=(token,)) for token in tokens]
+    threads += [threading.Thread(target=reader) for _ in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    print(json.dumps({
+        'reads_per_second': len(results['read']) / args.duration,
+        'writes_per_second': len(results['write']) / args.duration,
+        'read_p99': percentile(results['read'], 99),
+        'write_p99': percentile(results['write'], 99),
+        'errors': len(results['errors']),
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--profile', choices=PROFILES, action='append', help="profiles to run (default: both)")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return run_profile(args)
+
+    print(f"\n{'profile':<13} {'reads/s':>9} {'writes/s':>9} {'read p99':>9} {'write p99':>10} {'errors':>7}")
+    for profile in args.profile or PROFILES:
+        with tempfile.TemporaryDirectory() as tmp:
+            database = os.path.join(tmp, 'bench.sqlite3')
+            shutil.copy(os.path.join(PROJECT_DIR, 'db.sqlite3'), database)
+            env = dict(os.environ, DB_PROFILE=profile, DB_SQLITE_NAME=database)
+            output = subprocess.run(
+                [sys.executable, __file__, '--child', '--writers', str(args.writers),
+                 '--readers', str(args.readers), '--duration', str(args.duration)],
+                env=env, cwd=PROJECT_DIR, capture_output=True, text=True, check=True,
+            ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{profile:<13} {result['reads_per_second']:>9.1f} {result['writes_per_second']:>9.1f} "
+              f"{result['read_p99']:>8.1f}ms {result['write_p99']:>8.1f}ms {result['errors']:>7}")
+
+if __name__ == "__main__":
+    main()
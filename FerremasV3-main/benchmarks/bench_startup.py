@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Cold start and per-request overhead: full settings vs the api-only profile.
+
+For each settings module, --runs fresh processes load Django, build the
+WSGI application and serve a first request (cold start). One more process
+then serves --requests requests in a loop (per-request overhead). Runs on a
+copy of db.sqlite3.
+
+    python benchmarks/bench_startup.py --runs 5 --requests 2000
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILES = ('apiIntegracion.settings', 'apiIntegracion.settings_api')
+
+def child(args):
+    started = time.perf_counter()
+    sys.path.insert(0, PROJECT_DIR)
+    from django.core.wsgi import get_wsgi_application
+    from django.test import Client
+    get_wsgi_application()
+    setup_done = time.perf_counter()
+    client = Client()
+    assert client.get(args.path).status_code == 200
+    first_done = time.perf_counter()
+
+    per_request = None
+    if args.requests:
+        loop_started = time.perf_counter()
+        for _ in range(args.requests):
+            client.get(args.path)
+        per_request = (time.perf_counter() - loop_started) / args.requests * 1e6
+    print(json.dumps({
+        'setup_ms': (setup_done - started) * 1000,
+        'first_request_ms': (first_done - setup_done) * 1000,
+        'per_request_us': per_request,
+        'modules': len(sys.modules),
+    }))
+
+def run_child(profile, env, path, requests=0):
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, __file__, '--child', '--path', path, '--requests', str(requests)],
+        env=dict(env, DJANGO_SETTINGS_MODULE=profile), cwd=PROJECT_DIR,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['process_ms'] = (time.perf_counter() - started) * 1000
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--path', default='/api/categories/')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, 'bench.sqlite3')
+        shutil.copy(os.path.join(PROJECT_DIR, 'db.sqlite3'), database)
+        env = dict(os.environ, DB_SQLITE_NAME=database)
+        env.pop('API_DOCS', None)
+
+        print(f"\n{'settings':<30} {'process ms':>11} {'setup ms':>9} {'1st req ms':>11} {'modules':>8} {'us/request':>11}")
+        for profile in PROFILES:
+            cold = [run_child(profile, env, args.path) for _ in range(args.runs)]
+            warm = run_child(profile, env, args.path, args.requests)
+            print(f"{profile:<30} {statistics.median(r['process_ms'] for r in cold):>11.1f} "
+                  f"{statistics.median(r['setup_ms'] for r in cold):>9.1f} "
+                  f"{statistics.median(r['first_request_ms'] for r in cold):>11.1f} "
+                  f"{cold[0]['modules']:>8} {warm['per_request_us']:>11.1f}")
+
+if __name__ == "__main__":
+    main()
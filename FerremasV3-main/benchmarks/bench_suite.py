@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Reproducible load test of realistic traffic mixes, results stored as JSON.
+
+1. Seeds a synthetic dataset with generate_dataset (--products,
+   --customers, --orders, --seed) into a fresh SQLite database in a
+   temporary directory.
+2. Starts the API under uvicorn or gunicorn (--server, --workers) on it.
+3. Runs --users virtual users for --duration seconds after --warmup. Each
+   one logs in as its own customer and keeps picking a scenario by the
+   weights in --mix:
+     browse    categories, products of a category, one product
+     search    product search by name
+     cart      add a product to the cart, view the cart
+     checkout  add a product to the cart, create the order
+     employee  list every order, as an employee
+4. Prints requests/s and p50/p95/p99 per endpoint and writes everything,
+   with the git commit, to benchmarks/results/<time>-<commit>.json.
+
+    python benchmarks/bench_suite.py --users 32 --duration 30 --workers 4
+    python benchmarks/bench_suite.py --compare benchmarks/results/<earlier run>.json
+    python benchmarks/bench_suite.py --diff OLD.json NEW.json
+
+The load generator is a single Python process: with many users on a fast
+machine it can become the bottleneck, check its CPU before trusting the
+top throughput.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(PROJECT_DIR, 'benchmarks', 'results')
+PASSWORD = 'benchpassword'
+DEFAULT_MIX = 'browse=50,search=20,cart=15,checkout=10,employee=5'
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}, choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+# Dataset, in a child process with Django set up on the temporary database
+
+def seed(args):
+    sys.path.insert(0, PROJECT_DIR)
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from entrega.dataset import PRODUCT_WORDS
+    from entrega.models import Category, Product
+
+    call_command('migrate', verbosity=0)
+    call_command(
+        'generate_dataset', seed=args.seed, products=args.products, customers=args.customers,
+        orders=args.orders, carts=0, employees=1, prefix='bench', password=PASSWORD, verbosity=0,
+        stdout=sys.stderr,
+    )
+    print(json.dumps({
+        'customers': [f'bench_customer_{i + 1}' for i in range(args.customers)],
+        'employee': 'bench_employee_1',
+        'products': list(Product.objects.values_list('pk', flat=True)),
+        'categories': list(Category.objects.values_list('pk', flat=True)),
+        'words': [word.lower() for word in PRODUCT_WORDS],
+    }))
+
+# Scenarios: lists of (endpoint label, method, path, json body)
+
+def browse(user, data, rng):
+    product = rng.choice(data['products'])
+    return [
+        ('category_list', 'get', '/api/categories/', None),
+        ('product_list_by_category', 'get', f"/api/products/?category={rng.choice(data['categories'])}", None),
+        ('product_detail', 'get', f'/api/products/{product}/', None),
+    ]
+
+def search(user, data, rng):
+    return [('product_search', 'get', f"/api/products/?search={rng.choice(data['words'])}", None)]
+
+def cart(user, data, rng):
+    return [
+        ('cart_add', 'post', '/api/cart/', {'product': rng.choice(data['products']), 'num_of_products': rng.randint(1, 3)}),
+        ('cart_list', 'get', '/api/cart/', None),
+    ]
+
+def checkout(user, data, rng):
+    return [
+        ('cart_add', 'post', '/api/cart/', {'product': rng.choice(data['products']), 'num_of_products': 1}),
+        ('order_create', 'post', '/api/orders/create/', {'freight': 0}),
+    ]
+
+def employee(user, data, rng):
+    return [('order_list_employee', 'get', '/api/orders/', None)]
+
+SCENARIOS = {
+    'browse': browse,
+    'search': search,
+    'cart': cart,
+    'checkout': checkout,
+    'employee': employee,
+}
+
+class VirtualUser(threading.Thread):
+    def __init__(self, base_url, username, employee_name, data, mix, seed, results):
+        super().__init__(daemon=True)
+        self.base_url = base_url
+        self.usernames = {'customer': username, 'employee': employee_name}
+        self.data = data
+        self.mix = mix
+        self.rng = random.Random(seed)
+        self.results = results
+        self.session = requests.Session()
+        self.tokens = {}
+        self.recording = False
+        self.stop = threading.Event()
+
+    def token(self, role):
+        if role not in self.tokens:
+            response = self.session.post(f'{self.base_url}/api/token/', json={
+                'username': self.usernames[role], 'password': PASSWORD,
+            }, timeout=60)
+            response.raise_for_status()
+            self.tokens[role] = response.json()['access']
+        return self.tokens[role]
+
+    def request(self, label, method, path, body, role):
+        headers = {'Authorization': f'Bearer {self.token(role)}'}
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, f'{self.base_url}{path}', json=body, headers=headers, timeout=60)
+            ok = response.status_code < 400
+            if response.status_code == 401:
+                # Expired access token: log in again next time
+                self.tokens.pop(role, None)
+        except requests.RequestException:
+            ok = False
+        elapsed = (time.perf_counter() - started) * 1000
+        if self.recording:
+            self.results.append((label, elapsed, ok))
+
+    def run(self):
+        names, weights = zip(*self.mix.items())
+        while not self.stop.is_set():
+            scenario = self.rng.choices(names, weights)[0]
+            role = 'employee' if scenario == 'employee' else 'customer'
+            for label, method, path, body in SCENARIOS[scenario](self, self.data, self.rng):
+                if self.stop.is_set():
+                    break
+                self.request(label, method, path, body, role)
+
+# Server
+
+def server_command(args):
+    if args.server == 'gunicorn':
+        if shutil.which('gunicorn') is None:
+            sys.exit('gunicorn is not installed (pip install gunicorn), or use --server uvicorn')
+        return ['gunicorn', 'apiIntegracion.wsgi:application', '--bind', f'127.0.0.1:{args.port}',
+                '--workers', str(args.workers), '--threads', str(args.threads), '--log-level', 'warning']
+    return [sys.executable, '-m', 'uvicorn', 'apiIntegracion.asgi:application', '--port', str(args.port),
+            '--workers', str(args.workers), '--log-level', 'warning', '--no-access-log']
+
+def wait_ready(url, process, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Server exited with code {process.returncode}')
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server did not start: {url}')
+
+# Results
+
+def summarize(samples, duration):
+    endpoints = {}
+    for label in sorted({label for label, _, _ in samples}):
+        latencies = [elapsed for name, elapsed, ok in samples if name == label and ok]
+        errors = sum(1 for name, _, ok in samples if name == label and not ok)
+        endpoints[label] = {
+            'requests': len(latencies),
+            'errors': errors,
+            'rps': len(latencies) / duration,
+            'mean_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+        }
+    latencies = [elapsed for _, elapsed, ok in samples if ok]
+    total = {
+        'requests': len(latencies),
+        'errors': sum(1 for _, _, ok in samples if not ok),
+        'rps': len(latencies) / duration,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+    }
+    return endpoints, total
+
+def print_table(result):
+    print(f"\n{'endpoint':<26} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    rows = list(result['endpoints'].items()) + [('TOTAL', result['total'])]
+    for label, stats in rows:
+        print(f"{label:<26} {stats['rps']:>8.1f} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} "
+              f"{stats['p99_ms']:>8.1f} {stats['errors']:>7}")
+
+def print_diff(old, new):
+    print(f"\n{old.get('commit', '?')[:10]} -> {new.get('commit', '?')[:10]}")
+    print(f"{'endpoint':<26} {'req/s':>18} {'p95 ms':>18} {'p99 ms':>18}")
+    rows = dict(new['endpoints'], TOTAL=new['total'])
+    before = dict(old['endpoints'], TOTAL=old['total'])
+
+    def change(key, stats, base):
+        if base is None:
+            return f"{stats[key]:>8.1f}      new"
+        delta = (stats[key] - base[key]) / base[key] * 100 if base[key] else 0.0
+        return f"{stats[key]:>8.1f} {delta:>+8.1f}%"
+
+    for label, stats in rows.items():
+        base = before.get(label)
+        print(f"{label:<26} {change('rps', stats, base)} {change('p95_ms', stats, base)} {change('p99_ms', stats, base)}")
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=PROJECT_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=PROJECT_DIR,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+    return commit, dirty
+
+def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=args.settings, DB_PROFILE=args.db_profile,
+                   DB_SQLITE_NAME=os.path.join(tmp, 'bench.sqlite3'))
+        seeding_started = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, __file__, '--child-seed', '--products', str(args.products),
+             '--customers', str(args.customers), '--orders', str(args.orders), '--seed', str(args.seed)],
+            env=env, cwd=PROJECT_DIR, capture_output=True, text=True, check=True,
+        ).stdout
+        data = json.loads(output.strip().splitlines()[-1])
+        print(f"Seeded {args.products} products, {args.customers} customers and {args.orders} orders "
+              f"in {time.perf_counter() - seeding_started:.1f}s")
+
+        base_url = f'http://127.0.0.1:{args.port}'
+        server = subprocess.Popen(server_command(args), env=env, cwd=PROJECT_DIR)
+        try:
+            wait_ready(f'{base_url}/api/categories/', server)
+            samples = []
+            users = [
+                VirtualUser(base_url, data['customers'][i % len(data['customers'])], data['employee'],
+                            data, args.mix, args.seed + i, samples)
+                for i in range(args.users)
+            ]
+            for user in users:
+                user.start()
+            time.sleep(args.warmup)
+            for user in users:
+                user.recording = True
+            time.sleep(args.duration)
+            for user in users:
+                user.recording = False
+                user.stop.set()
+            for user in users:
+                user.join(timeout=60)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    endpoints, total = summarize(samples, args.duration)
+    commit, dirty = git_commit()
+    return {
+        'commit': commit,
+        'dirty': dirty,
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'config': {key: value for key, value in vars(args).items()
+                   if key not in ('child_seed', 'output', 'compare', 'diff')},
+        'endpoints': endpoints,
+        'total': total,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=16, help='concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=30.0, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=5.0, help='seconds before measuring')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX, help=f'scenario weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--customers', type=int, default=100)
+    parser.add_argument('--orders', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=1, help='random seed of the dataset and the users')
+    parser.add_argument('--server', choices=('uvicorn', 'gunicorn'), default='uvicorn')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=4, help='threads per gunicorn worker')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--settings', default='apiIntegracion.settings_api')
+    parser.add_argument('--db-profile', default='sqlite_tuned')
+    parser.add_argument('--output', default=None, help='results file (default: benchmarks/results/<time>-<commit>.json)')
+    parser.add_argument('--compare', default=None, metavar='BASELINE', help='print the change against an earlier results file')
+    parser.add_argument('--diff', nargs=2, metavar=('OLD', 'NEW'), help='only compare two results files')
+    parser.add_argument('--child-seed', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if isinstance(args.mix, str):
+        args.mix = parse_mix(args.mix)
+
+    if args.child_seed:
+        return seed(args)
+    if args.diff:
+        with open(args.diff[0]) as old, open(args.diff[1]) as new:
+            return print_diff(json.load(old), json.load(new))
+
+    result = run(args)
+    print_table(result)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{result['commit'][:10]}{'-dirty' if result['dirty'] else ''}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f'\nResults written to {output}')
+    if args.compare:
+        with open(args.compare) as f:
+            print_diff(json.load(f), result)
+
+if __name__ == "__main__":
+    main()
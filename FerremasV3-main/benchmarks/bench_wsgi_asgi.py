@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+WSGI vs ASGI throughput for the product catalog.
+
+Starts uvicorn three times on the same port and loads /api/products/:
+  wsgi        apiIntegracion.wsgi, sync ProductListView (uvicorn --interface wsgi)
+  asgi-sync   apiIntegracion.asgi, sync ProductListView
+  asgi-async  apiIntegracion.asgi, async product_list (/api/products/async/)
+
+Run from the project directory:
+    python benchmarks/bench_wsgi_asgi.py --concurrency 64 --duration 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = [
+    ('wsgi', ['apiIntegracion.wsgi:application', '--interface', 'wsgi'], '/api/products/'),
+    ('asgi-sync', ['apiIntegracion.asgi:application'], '/api/products/'),
+    ('asgi-async', ['apiIntegracion.asgi:application'], '/api/products/async/'),
+]
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+def wait_ready(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server did not start: {url}")
+
+def load(url, concurrency, duration):
+    stop = threading.Event()
+    latencies, errors = [], []
+
+    def client():
+        session = requests.Session()
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                response = session.get(url, timeout=30)
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+                    continue
+            except requests.RequestException as e:
+                errors.append(type(e).__name__)
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument('--concurrency', type=int, default=32, help="concurrent client threads")
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--warmup', type=float, default=2.0)
+    parser.add_argument('--only', choices=[name for name, _, _ in SCENARIOS], action='append')
+    args = parser.parse_args()
+
+    results = []
+    for name, app_args, path in SCENARIOS:
+        if args.only and name not in args.only:
+            continue
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', *app_args, '--port', str(args.port),
+             '--workers', str(args.workers), '--no-access-log', '--log-level', 'warning'],
+            cwd=PROJECT_DIR,
+        )
+        try:
+            url = f"http://127.0.0.1:{args.port}{path}"
+            wait_ready(url)
+            load(url, args.concurrency, args.warmup)
+            latencies, errors = load(url, args.concurrency, args.duration)
+        finally:
+            server.terminate()
+            server.wait()
+        results.append((name, latencies, errors))
+
+    print(f"\n{'scenario':<12} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, latencies, errors in results:
+        print(f"{name:<12} {len(latencies) / args.duration:>9.1f} {percentile(latencies, 50):>8.1f} "
+              f"{percentile(latencies, 95):>8.1f} {percentile(latencies, 99):>8.1f} {len(errors):>7}")
+
+if __name__ == "__main__":
+    main()
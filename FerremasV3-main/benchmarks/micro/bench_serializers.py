@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+import pytest
+from django.db.models import Count
+
+from entrega.models import Cart, Customer, Order, Product
+from entrega.serializers import CartCreateSerializer, OrderSerializer, ProductSerializer
+
+
+@pytest.fixture
+def customer():
+    # The customer with the most orders (Zipf: one of the regulars)
+    return Customer.objects.annotate(n=Count('order')).order_by('-n', 'pk').select_related('user').first()
+
+
+def bench_product_serializer_one(bench):
+    product = Product.objects.order_by('pk').first()
+    bench(lambda: ProductSerializer(product).data)
+
+
+def bench_product_serializer_list_200(bench):
+    # As ProductListView: the queryset is evaluated by the serializer
+    bench(lambda: ProductSerializer(Product.objects.order_by('pk')[:200], many=True).data)
+
+
+def bench_order_serializer_one(bench):
+    order = Order.objects.annotate(n=Count('orderdetails')).filter(n__gte=3).order_by('pk').first()
+    # Fresh instance every round: orderdetails_set is not cached on the order
+    bench(lambda: OrderSerializer(Order.objects.get(pk=order.pk)).data)
+
+
+def bench_order_serializer_customer_orders(bench, customer):
+    # As OrderListView for a customer, nested OrderDetailsSerializer included
+    bench(lambda: OrderSerializer(Order.objects.filter(customer=customer), many=True).data)
+
+
+def bench_order_serializer_list_100(bench):
+    bench(lambda: OrderSerializer(Order.objects.order_by('-order_date')[:100], many=True).data)
+
+
+def bench_cart_create_new_item(bench, customer):
+    product = Product.objects.order_by('pk').first()
+    context = {'request': SimpleNamespace(user=customer.user)}
+
+    def add():
+        serializer = CartCreateSerializer(data={'product': product.pk, 'num_of_products': 2}, context=context)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+    bench(add, setup=lambda: Cart.objects.filter(customer=customer).delete())
+
+
+def bench_cart_create_existing_item(bench, customer):
+    product = Product.objects.order_by('pk').first()
+    context = {'request': SimpleNamespace(user=customer.user)}
+    Cart.objects.create(customer=customer, product=product, num_of_products=1, total_price=product.unit_price)
+
+    def add():
+        serializer = CartCreateSerializer(data={'product': product.pk, 'num_of_products': 1}, context=context)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+    bench(add)
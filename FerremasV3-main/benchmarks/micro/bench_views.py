@@ -0,0 +1,53 @@
+import pytest
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from entrega.models import Cart, Customer, Product, Shipper
+from entrega.views.viewsOrder import OrderCreateView, OrderListView
+
+factory = APIRequestFactory()
+
+
+@pytest.fixture
+def customer():
+    return Customer.objects.select_related('user').order_by('pk').first()
+
+
+def fill_cart(customer, size):
+    products = list(Product.objects.order_by('pk')[:size])
+
+    def setup():
+        Cart.objects.filter(customer=customer).delete()
+        Cart.objects.bulk_create([
+            Cart(customer=customer, product=product, num_of_products=2, total_price=product.unit_price * 2)
+            for product in products
+        ])
+
+    return setup
+
+
+@pytest.mark.parametrize('size', [1, 5, 20])
+def bench_order_create_from_cart(bench, customer, size):
+    view = OrderCreateView.as_view()
+    body = {'required_date': '2025-01-15T12:00:00Z', 'freight': '2990.00', 'shipper': Shipper.objects.first().pk}
+
+    def post():
+        request = factory.post('/api/orders/create/', body, format='json')
+        force_authenticate(request, user=customer.user)
+        response = view(request)
+        assert response.status_code == 201, response.data
+
+    bench(post, setup=fill_cart(customer, size))
+
+
+def bench_order_list_customer(bench, customer):
+    view = OrderListView.as_view()
+
+    def get():
+        request = factory.get('/api/orders/')
+        force_authenticate(request, user=customer.user)
+        response = view(request)
+        # Streamed: the pages are read and serialized while the body is consumed
+        b''.join(response.streaming_content)
+        response.close()
+
+    bench(get)
@@ -0,0 +1,183 @@
+"""
+Micro-benchmarks of serializers and view hot paths, run with pytest:
+
+    pytest benchmarks/micro
+    pytest benchmarks/micro --bench-save          # store the medians as the new baseline
+    pytest benchmarks/micro -k order --bench-rounds 100
+
+Each benchmark gets the ``bench`` fixture and calls ``bench(fn, setup=...)``:
+``setup`` runs untimed before every round, ``fn`` is timed over
+``--bench-rounds`` rounds (more for fast benchmarks, until the rounds add
+up to ``--bench-min-time`` seconds) after a few warmup calls. Every benchmark runs on
+the same dataset, seeded once per session by generate_dataset with a fixed
+seed (see ``DATASET``).
+
+The fastest round of each benchmark is compared against the fastest round
+in ``baseline.json``: noise (other processes, GC, frequency scaling) only
+ever adds time, so the minimum moves with the code far more than the
+median does. The test fails when it is more than ``--bench-threshold``
+(25% by default) slower, or more than the spread of this run's rounds
+(interquartile range over median) when that is wider: a run that noisy
+cannot tell a 25% change apart. A benchmark over the limit is measured a
+second time and only fails if that run is over it too. The baseline holds absolute timings from
+one machine: after changing machines, or after a change that is slower on
+purpose, run once with ``--bench-save`` and commit the file. All results go to
+``benchmarks/results/micro-<time>-<commit>.json``.
+"""
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_suite import RESULTS_DIR, git_commit, percentile  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DATASET = {
+    'seed': 46, 'products': 2000, 'customers': 200, 'employees': 1, 'carts': 0, 'orders': 2000,
+    'end_date': date(2024, 12, 31), 'days': 365, 'prefix': 'micro',
+}
+
+MAX_ROUNDS = 10000
+
+_results = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('micro-benchmarks')
+    group.addoption('--bench-rounds', type=int, default=30, help='Timed rounds per benchmark')
+    group.addoption('--bench-warmup', type=int, default=3, help='Untimed calls before the rounds')
+    group.addoption('--bench-min-time', type=float, default=1.0,
+                    help='Keep adding rounds until they take this many seconds in total')
+    group.addoption('--bench-threshold', type=float, default=0.25,
+                    help='Fail when the fastest round is this much slower than the baseline (0.25 = 25%%)')
+    group.addoption('--bench-baseline', default=BASELINE, help='Baseline JSON file')
+    group.addoption('--bench-save', action='store_true', help='Write the timings of this run as the baseline')
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)['benchmarks']
+
+
+def summarize(times):
+    ms = [t * 1000 for t in times]
+    return {
+        'rounds': len(ms),
+        'min_ms': min(ms),
+        'median_ms': statistics.median(ms),
+        'mean_ms': statistics.mean(ms),
+        'stdev_ms': statistics.stdev(ms) if len(ms) > 1 else 0.0,
+        'p95_ms': percentile(ms, 95),
+        'iqr_ms': percentile(ms, 75) - percentile(ms, 25),
+        'max_ms': max(ms),
+    }
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker):
+    from django.core.management import call_command
+
+    with django_db_blocker.unblock():
+        call_command('generate_dataset', verbosity=0, stdout=open(os.devnull, 'w'), **DATASET)
+
+
+@pytest.fixture
+def bench(request, db):
+    config = request.config
+    baseline = load_baseline(config.getoption('bench_baseline'))
+
+    def measure(fn, setup, rounds):
+        times = []
+        # Short benchmarks get more rounds, so one slow stretch cannot cover them all
+        while len(times) < rounds or (sum(times) < config.getoption('bench_min_time') and len(times) < MAX_ROUNDS):
+            if setup:
+                setup()
+            started = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - started)
+        return summarize(times)
+
+    def run(fn, setup=None, rounds=None):
+        rounds = rounds or config.getoption('bench_rounds')
+        for _ in range(config.getoption('bench_warmup')):
+            if setup:
+                setup()
+            fn()
+        stats = measure(fn, setup, rounds)
+
+        name = request.node.name
+        _results[name] = stats
+        previous = baseline.get(name)
+        if previous and 'min_ms' in previous and not config.getoption('bench_save'):
+            stats['baseline_min_ms'] = previous['min_ms']
+
+            def regressed(stats):
+                change = stats['min_ms'] / previous['min_ms'] - 1
+                allowed = max(config.getoption('bench_threshold'), stats['iqr_ms'] / stats['median_ms'])
+                return change, allowed, change > allowed
+
+            change, allowed, failed = regressed(stats)
+            if failed:
+                # Measure once more before failing: a regression shows up twice
+                stats = _results[name] = {**measure(fn, setup, rounds), 'baseline_min_ms': previous['min_ms']}
+                change, allowed, failed = regressed(stats)
+            if failed:
+                pytest.fail(
+                    f"{name}: fastest round {stats['min_ms']:.3f} ms is {change:.0%} slower "
+                    f"than the baseline {previous['min_ms']:.3f} ms (allowed {allowed:.0%})"
+                )
+        return stats
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not _results:
+        return
+    write = terminalreporter.write_line
+    terminalreporter.section('micro-benchmarks')
+    write(f"{'benchmark':<40} {'min':>10} {'median':>10} {'iqr':>9} {'baseline':>10} {'change':>8}")
+    for name, stats in sorted(_results.items()):
+        base = stats.get('baseline_min_ms')
+        change = f"{stats['min_ms'] / base - 1:+.1%}" if base else '-'
+        write(f"{name:<40} {stats['min_ms']:>8.3f}ms {stats['median_ms']:>8.3f}ms "
+              f"{stats['iqr_ms']:>7.3f}ms {f'{base:.3f}ms' if base else '-':>10} {change:>8}")
+
+
+def pytest_sessionfinish(session):
+    if not _results:
+        return
+    config = session.config
+    commit, dirty = git_commit()
+    result = {
+        'commit': commit,
+        'dirty': dirty,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'dataset': {**DATASET, 'end_date': DATASET['end_date'].isoformat()},
+        'benchmarks': _results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = os.path.join(
+        RESULTS_DIR, f"micro-{datetime.now():%Y%m%d-%H%M%S}-{commit[:10]}{'-dirty' if dirty else ''}.json"
+    )
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+    if config.getoption('bench_save'):
+        # Keep the baselines of benchmarks not run this time (e.g. with -k)
+        baseline = load_baseline(config.getoption('bench_baseline'))
+        baseline.update({
+            name: {'min_ms': round(stats['min_ms'], 4), 'median_ms': round(stats['median_ms'], 4)}
+            for name, stats in _results.items()
+        })
+        with open(config.getoption('bench_baseline'), 'w') as f:
+            json.dump({'commit': commit, 'python': result['python'],
+                       'benchmarks': dict(sorted(baseline.items()))}, f, indent=2)
+            f.write('\n')
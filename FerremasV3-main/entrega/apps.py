@@ -4,3 +4,32 @@ from django.apps import AppConfig
 class EntregaConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'entrega'
+
+    def ready(self):
+        # Registers the job handlers used by run_workers
+        from . import tasks  # noqa: F401
+
+        from . import metrics
+        if metrics.get_option('SERIALIZERS'):
+            metrics.instrument_serializers()
+
+        from django.db.models.signals import post_delete, post_save, pre_save
+        from .compression import invalidate_catalog
+        from .models import Category, Customer, Product, Supplier, User
+        for model in (Product, Category, Supplier):
+            post_save.connect(invalidate_catalog, sender=model, dispatch_uid=f'catalog.save.{model.__name__}')
+            post_delete.connect(invalidate_catalog, sender=model, dispatch_uid=f'catalog.delete.{model.__name__}')
+
+        from . import revocation
+        pre_save.connect(revocation.revoke_changed_user, sender=User, dispatch_uid='entrega.revoke_changed_user')
+        for model in (Customer, Supplier):
+            pre_save.connect(revocation.revoke_changed_profile, sender=model,
+                             dispatch_uid=f'revocation.save.{model.__name__}')
+            post_delete.connect(revocation.revoke_deleted_profile, sender=model,
+                                dispatch_uid=f'revocation.delete.{model.__name__}')
+
+        from django.db.backends.signals import connection_created
+        connection_created.connect(metrics.install, dispatch_uid='entrega.metrics')
+        from .db import slowlog
+        if slowlog.get_option('ENABLED'):
+            connection_created.connect(slowlog.install, dispatch_uid='entrega.slowlog')
@@ -0,0 +1,133 @@
+"""
+Hot/cold split for orders.
+
+``archive_orders`` moves closed (shipped, delivered or cancelled) orders
+older than ``ORDER_ARCHIVE_AFTER_DAYS``, and their details, from ``Order``
+/ ``OrderDetails`` into ``ArchivedOrder`` / ``ArchivedOrderDetails`` in
+batches, keeping the hot tables and their indexes small. Lookups by
+``order_id`` go through ``find_order`` / ``find_orders``, which fall back
+to the archive when the order is no longer hot.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.http import Http404
+from django.utils import timezone
+
+from . import recommendations
+from .models import ArchivedOrder, ArchivedOrderdetails, Order, Orderdetails
+
+ORDER_FIELDS = (
+    'order_id', 'customer_id', 'order_date', 'required_date', 'shipped_date', 'freight', 'shipper_id', 'status',
+    'recommendations_counted',
+)
+DETAIL_FIELDS = ('id', 'order_id', 'product_id', 'unit_price', 'quantity', 'discount')
+
+
+def get_archive_after_days():
+    return getattr(settings, 'ORDER_ARCHIVE_AFTER_DAYS', 365)
+
+
+def archivable_orders(older_than_days=None):
+    days = get_archive_after_days() if older_than_days is None else older_than_days
+    cutoff = timezone.now() - timedelta(days=days)
+    # Never move the newest order: MySQL rebuilds AUTO_INCREMENT from MAX(order_id)
+    # on restart, so archiving it could let a new order reuse an archived id.
+    newest = Order.objects.aggregate(newest=Max('order_id'))['newest'] or 0
+    closed = [status for status, _ in Order.STATUS_CHOICES if status not in Order.OPEN_STATUSES]
+    # Served by the (status, order_date) index
+    return Order.objects.filter(
+        status__in=closed, order_date__lt=cutoff, order_id__lt=newest
+    )
+
+
+def archive_orders(older_than_days=None, batch_size=None, progress=None):
+    """
+    Move archivable orders in batches of ``batch_size``, one transaction
+    per batch. Returns the number of orders archived.
+    """
+    batch_size = batch_size or getattr(settings, 'ORDER_ARCHIVE_BATCH_SIZE', 500)
+    queryset = archivable_orders(older_than_days).order_by('order_id')
+    archived = 0
+    while True:
+        with transaction.atomic():
+            # Not while recommendations are being refreshed: see recommendations.lock
+            recommendations.lock()
+            ids = list(queryset.values_list('order_id', flat=True)[:batch_size])
+            if not ids:
+                break
+            ArchivedOrder.objects.bulk_create([
+                ArchivedOrder(**row)
+                for row in Order.objects.filter(order_id__in=ids).values(*ORDER_FIELDS)
+            ])
+            ArchivedOrderdetails.objects.bulk_create([
+                ArchivedOrderdetails(**row)
+                for row in Orderdetails.objects.filter(order_id__in=ids).values(*DETAIL_FIELDS)
+            ], batch_size=batch_size)
+            Orderdetails.objects.filter(order_id__in=ids).delete()
+            Order.objects.filter(order_id__in=ids).delete()
+        archived += len(ids)
+        if progress:
+            progress(archived)
+    return archived
+
+
+def find_order(order_id):
+    """Hot order if present, else the archived copy. Raises Http404."""
+    order = Order.objects.filter(order_id=order_id).first()
+    if order is None:
+        order = ArchivedOrder.objects.filter(order_id=order_id).first()
+    if order is None:
+        raise Http404('No Order matches the given query.')
+    return order
+
+
+def find_orders(order_ids, customer=None):
+    """Orders by id from the hot table, completed from the archive."""
+    hot = Order.objects.filter(order_id__in=order_ids)
+    if customer is not None:
+        hot = hot.filter(customer=customer)
+    orders = list(hot)
+    missing = set(order_ids) - {order.order_id for order in orders}
+    if missing:
+        cold = ArchivedOrder.objects.filter(order_id__in=missing)
+        if customer is not None:
+            cold = cold.filter(customer=customer)
+        orders += list(cold)
+    return sorted(orders, key=lambda order: order.order_id)
+
+
+def preload_orders(queryset):
+    # Everything OrderSerializer reads, so it can also run inside the event loop
+    return queryset.select_related('customer', 'shipper').prefetch_related('orderdetails_set__product')
+
+
+async def afind_order(order_id):
+    """Async ``find_order`` with the serializer relations preloaded. Raises Http404."""
+    for model in (Order, ArchivedOrder):
+        try:
+            return await preload_orders(model.objects).aget(order_id=order_id)
+        except model.DoesNotExist:
+            pass
+    raise Http404('No Order matches the given query.')
+
+
+async def afind_orders(order_ids, customer=None):
+    """Async ``find_orders`` with the serializer relations preloaded."""
+    hot = preload_orders(Order.objects.filter(order_id__in=order_ids))
+    if customer is not None:
+        hot = hot.filter(customer=customer)
+    orders = [order async for order in hot]
+    missing = set(order_ids) - {order.order_id for order in orders}
+    if missing:
+        cold = preload_orders(ArchivedOrder.objects.filter(order_id__in=missing))
+        if customer is not None:
+            cold = cold.filter(customer=customer)
+        orders += [order async for order in cold]
+    return sorted(orders, key=lambda order: order.order_id)
+
+
+def is_archived(order):
+    return isinstance(order, ArchivedOrder)
@@ -0,0 +1,149 @@
+"""
+JWT authentication that trusts the claims in the token.
+
+Tokens minted through ``ClaimsRefreshToken`` carry ``user_type``,
+``customer_id`` and ``supplier_id``. When ``JWT_CLAIMS_AUTH`` is enabled,
+``ClaimsJWTAuthentication`` builds a ``ClaimsUser`` from them instead of
+loading ``auth_user`` and the profile, so views that only need
+``request.user.user_type`` / ``request.user.customer`` run without auth
+queries. Tokens issued before the claims existed fall back to the regular
+database lookup.
+
+Since the user row is not loaded, simplejwt's ``CHECK_USER_IS_ACTIVE`` does
+not apply to claims tokens, and the claims are never compared with the
+database. Saving a user deactivated or with another ``user_type``, or
+moving or deleting their customer or supplier profile, revokes their tokens
+instead (``revocation.revoke_changed_user`` and friends), refresh tokens
+included. Changes made with ``QuerySet.update`` keep the old claims valid
+until the tokens expire unless ``revocation.revoke_user`` is called.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import revocation
+from .models import Customer, Supplier, User
+
+
+class ClaimsRefreshToken(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        return cls.for_profiles(
+            user,
+            customer_id=Customer.objects.filter(user=user).values_list('pk', flat=True).first(),
+            supplier_id=Supplier.objects.filter(user=user).values_list('pk', flat=True).first(),
+        )
+
+    @classmethod
+    def for_profiles(cls, user, customer_id=None, supplier_id=None):
+        """``for_user`` without the profile queries, when the ids are already known."""
+        token = super().for_user(user)
+        # Copied into every access token derived from this refresh token
+        token['username'] = user.username
+        token['user_type'] = user.user_type
+        token['customer_id'] = customer_id
+        token['supplier_id'] = supplier_id
+        return token
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = ClaimsRefreshToken
+
+
+class RevocationAwareTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        if revocation.is_revoked(self.token_class(attrs['refresh'])):
+            raise InvalidToken(_('Token has been revoked'))
+        return super().validate(attrs)
+
+
+def tokens_for_user(user, **profile_ids):
+    # Callers that know customer_id / supplier_id skip the profile lookups
+    if profile_ids:
+        refresh = ClaimsRefreshToken.for_profiles(user, **profile_ids)
+    else:
+        refresh = ClaimsRefreshToken.for_user(user)
+    return {
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+    }
+
+
+def _stored(instance):
+    # Behave like a row loaded from the database, not a new object
+    instance._state.adding = False
+    return instance
+
+
+class ClaimsUser(TokenUser):
+    """
+    Stateless user built from token claims. ``customer`` and ``supplier``
+    are stand-ins carrying only their primary key, which is all the views
+    need to filter or create related rows.
+    """
+
+    @cached_property
+    def user_type(self):
+        return self.token.get('user_type')
+
+    @cached_property
+    def customer(self):
+        customer_id = self.token.get('customer_id')
+        if customer_id is None:
+            raise Customer.DoesNotExist('Customer profile not found')
+        return _stored(Customer(pk=customer_id, user_id=self.id))
+
+    @cached_property
+    def supplier(self):
+        supplier_id = self.token.get('supplier_id')
+        if supplier_id is None:
+            raise Supplier.DoesNotExist('Supplier profile not found')
+        return _stored(Supplier(pk=supplier_id, user_id=self.id))
+
+    def get_user(self):
+        """Load the full ``User`` row, for the few views that need it."""
+        return User.objects.get(pk=self.id)
+
+
+def get_full_user(user):
+    return user.get_user() if isinstance(user, ClaimsUser) else user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if revocation.is_revoked(validated_token):
+            raise InvalidToken(_('Token has been revoked'))
+        return validated_token
+
+    def get_user(self, validated_token):
+        if getattr(settings, 'JWT_CLAIMS_AUTH', True) and 'user_type' in validated_token:
+            return ClaimsUser(validated_token)
+        return super().get_user(validated_token)
+
+
+async def aauthenticate(request):
+    """
+    ``ClaimsJWTAuthentication.authenticate`` for native async views: claims
+    tokens are checked without leaving the event loop. Returns
+    ``(user, token)`` or ``None``, raises ``AuthenticationFailed``.
+    """
+    if not revocation.is_started():
+        await sync_to_async(revocation.start)()
+    authentication = ClaimsJWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    validated_token = authentication.get_validated_token(raw_token)
+    if getattr(settings, 'JWT_CLAIMS_AUTH', True) and 'user_type' in validated_token:
+        return ClaimsUser(validated_token), validated_token
+    return await sync_to_async(authentication.get_user)(validated_token), validated_token
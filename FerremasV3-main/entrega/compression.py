@@ -0,0 +1,243 @@
+"""
+Compression of JSON responses and a cache of compressed catalog pages.
+
+``CompressionMiddleware`` encodes JSON responses of at least
+``COMPRESSION['MIN_SIZE']`` bytes with brotli (when the ``brotli`` package
+is installed) or gzip, whichever the client's ``Accept-Encoding`` prefers.
+Streaming JSON responses are compressed chunk by chunk. Other content
+types, small bodies and responses that already have a
+``Content-Encoding`` pass through untouched.
+
+GETs to the public catalog views in ``CATALOG_VIEWS`` are also cached:
+the first request stores the body with every encoding already applied,
+later ones get the stored variant without running the view or compressing
+again. Saving or deleting a product, category or supplier invalidates
+every page at once by bumping a version number in the key. Entries also
+expire after ``CATALOG_TIMEOUT`` seconds, for changes made with bulk
+queries that send no signals. As with replica pins, use a cache shared by
+all processes (Redis, Memcached) when running more than one.
+"""
+import gzip
+import hashlib
+import zlib
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .metrics import record_cache
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only without it
+    brotli = None
+
+DEFAULTS = {
+    'MIN_SIZE': 1024,
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 5,    # 0-11, higher is smaller but much slower past ~6
+    'CONTENT_TYPES': ('application/json',),
+    'CATALOG_VIEWS': (),
+    'CATALOG_TIMEOUT': 300,
+    'CACHE': 'default',
+}
+
+_VERSION_KEY = 'catalog-version'
+
+
+def get_option(name):
+    return getattr(settings, 'COMPRESSION', {}).get(name, DEFAULTS[name])
+
+
+def encodings():
+    """Supported encodings, preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(accept_encoding):
+    """Best supported encoding allowed by an ``Accept-Encoding`` header, or None."""
+    weights = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        q = 1.0
+        if params.strip().startswith('q='):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip().lower()] = q
+    best, best_q = None, 0.0
+    for coding in encodings():
+        q = weights.get(coding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=get_option('BROTLI_QUALITY'))
+    # mtime=0 keeps the output identical for identical content
+    return gzip.compress(content, compresslevel=get_option('GZIP_LEVEL'), mtime=0)
+
+
+class StreamCompressor:
+    """Compresses a body chunk by chunk, flushing after every chunk so clients see rows as they come."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=get_option('BROTLI_QUALITY'))
+        else:
+            # wbits 31: gzip container, with mtime 0 like compress()
+            self._compressor = zlib.compressobj(get_option('GZIP_LEVEL'), zlib.DEFLATED, 31)
+
+    def compress(self, chunk):
+        if self.encoding == 'br':
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def compress_stream(chunks, encoding):
+    compressor = StreamCompressor(encoding)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding):
+    """``compress_stream`` for the async iterators of ASGI streaming responses."""
+    compressor = StreamCompressor(encoding)
+    # zlib and brotli release the GIL: compress pages off the event loop
+    compress = sync_to_async(compressor.compress, thread_sensitive=False)
+    async for chunk in chunks:
+        data = await compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def is_compressible(response):
+    content_type = response.get('Content-Type', '').split(';')[0].strip()
+    return (
+        content_type in get_option('CONTENT_TYPES')
+        and not response.has_header('Content-Encoding')
+        and 200 <= response.status_code < 300
+    )
+
+
+def catalog_version():
+    cache = caches[get_option('CACHE')]
+    version = cache.get(_VERSION_KEY)
+    if version is None:
+        cache.add(_VERSION_KEY, 1, None)
+        version = cache.get(_VERSION_KEY, 1)
+    return version
+
+
+def invalidate_catalog(**kwargs):
+    """Drop every cached catalog page (also a post_save/post_delete receiver)."""
+    cache = caches[get_option('CACHE')]
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.add(_VERSION_KEY, 2, None)
+
+
+def catalog_key(request):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'catalog:{catalog_version()}:{path}'
+
+
+def build_entry(response):
+    """The body of ``response`` in every encoding, for the catalog cache."""
+    content = response.content
+    entry = {'content_type': response['Content-Type'], 'identity': content}
+    if len(content) >= get_option('MIN_SIZE'):
+        for encoding in encodings():
+            entry[encoding] = compress(content, encoding)
+    return entry
+
+
+def entry_response(entry, encoding):
+    if encoding not in entry:
+        encoding = None
+    response = HttpResponse(entry[encoding or 'identity'], content_type=entry['content_type'])
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+    return response
+
+
+def should_compress(response):
+    if not is_compressible(response):
+        return False
+    return response.streaming or len(response.content) >= get_option('MIN_SIZE')
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if getattr(request, '_catalog_key', None) is None and not should_compress(response):
+            return response
+        # Compressing (and storing catalog pages) is CPU work: off the event loop
+        return await sync_to_async(self.process_response)(request, response)
+
+    def process_response(self, request, response):
+        key = getattr(request, '_catalog_key', None)
+        if key is not None and response.status_code == 200 and is_compressible(response) and not response.streaming:
+            entry = build_entry(response)
+            caches[get_option('CACHE')].set(key, entry, get_option('CATALOG_TIMEOUT'))
+            return entry_response(entry, negotiate(request.headers.get('Accept-Encoding', '')))
+        return self.compress_response(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if request.method != 'GET' or match.url_name not in get_option('CATALOG_VIEWS'):
+            return None
+        # The browsable API renders HTML for the same URL
+        if 'text/html' in request.headers.get('Accept', ''):
+            return None
+        key = catalog_key(request)
+        entry = caches[get_option('CACHE')].get(key)
+        record_cache('catalog', entry is not None)
+        if entry is None:
+            request._catalog_key = key
+            return None
+        return entry_response(entry, negotiate(request.headers.get('Accept-Encoding', '')))
+
+    def compress_response(self, request, response):
+        if not should_compress(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            stream = acompress_stream if response.is_async else compress_stream
+            response.streaming_content = stream(response.streaming_content, encoding)
+            del response['Content-Length']
+        else:
+            response.content = compress(response.content, encoding)
+            response['Content-Length'] = str(len(response.content))
+        if response.has_header('ETag'):
+            # Same entity, different bytes: a strong ETag would be wrong now
+            response['ETag'] = 'W/' + response['ETag'].removeprefix('W/')
+        response['Content-Encoding'] = encoding
+        return response
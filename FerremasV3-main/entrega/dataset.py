@@ -0,0 +1,240 @@
+"""
+Synthetic data at production scale (``python manage.py generate_dataset``).
+
+Everything is drawn from one ``random.Random(seed)``, so the same options
+give the same rows; only the dates move with ``end`` (today by default).
+
+- Product popularity is Zipfian (exponent ``zipf``): a few products are in
+  most order lines and carts, the long tail is rarely sold. Customers
+  order with a flatter Zipf, so some are regulars and most buy once.
+- Order dates follow ``MONTH_WEIGHTS`` (December and the November sales
+  peak, a February lull) and ``WEEKDAY_WEIGHTS`` over the last ``days``
+  days. Orders older than two weeks are mostly delivered; recent ones are
+  spread over the open statuses.
+
+Rows go in with ``bulk_create`` in batches of ``batch_size``. Their ids
+are read back by range (MySQL does not return them), which assumes
+nothing else inserts into the same tables meanwhile.
+"""
+import itertools
+import math
+import random
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Cart, Category, Order, Orderdetails, Product, Shipper, Supplier, User
+from .provisioning import create_users
+
+# January .. December
+MONTH_WEIGHTS = (0.8, 0.7, 0.9, 1.0, 1.0, 0.9, 0.9, 1.0, 1.1, 1.1, 1.6, 2.0)
+# Monday .. Sunday
+WEEKDAY_WEIGHTS = (1.1, 1.0, 1.0, 1.0, 1.2, 1.4, 0.8)
+
+CATEGORY_WORDS = (
+    'Herramientas', 'Electricidad', 'Gasfitería', 'Pinturas', 'Jardín', 'Fijaciones', 'Seguridad',
+    'Construcción', 'Iluminación', 'Baño', 'Cocina', 'Adhesivos', 'Abrasivos', 'Maderas', 'Automóvil',
+)
+PRODUCT_WORDS = (
+    'Martillo', 'Taladro', 'Sierra', 'Llave', 'Destornillador', 'Alicate', 'Tornillo', 'Clavo', 'Pintura',
+    'Brocha', 'Cinta', 'Escalera', 'Manguera', 'Candado', 'Lija', 'Nivel', 'Cable', 'Enchufe', 'Ampolleta',
+    'Pegamento', 'Guante', 'Casco', 'Rodillo', 'Llana', 'Perno', 'Tuerca', 'Bisagra', 'Cerradura',
+)
+PRODUCT_ADJECTIVES = (
+    'Pro', 'Industrial', 'Compacto', 'Inalámbrico', 'Reforzado', 'Básico', 'Premium', 'Mini', 'Galvanizado',
+    'Eléctrico', 'Ajustable', 'Multiuso',
+)
+CLOSED_MIX = (('delivered', 85), ('shipped', 8), ('cancelled', 7))
+OPEN_MIX = (('pending', 30), ('paid', 30), ('picking', 20), ('shipped', 15), ('cancelled', 5))
+
+
+def zipf_cum_weights(n, exponent):
+    """Cumulative weights of ranks 1..n for ``random.choices(cum_weights=...)``."""
+    return list(itertools.accumulate(1 / (rank ** exponent) for rank in range(1, n + 1)))
+
+
+def _chunks(total, size):
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+class DatasetGenerator:
+    def __init__(self, seed=0, batch_size=5000, zipf=1.1, password='testpass123', prefix='gen', progress=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.zipf = zipf
+        self.password = password
+        self.prefix = prefix
+        self.progress = progress or (lambda label, done, total: None)
+        self.counts = {}
+
+    def _insert(self, model, objects):
+        """``bulk_create`` and return the new ids, in insertion order."""
+        last = model.objects.aggregate(last=Max('pk'))['last'] or 0
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+        return list(model.objects.filter(pk__gt=last).order_by('pk').values_list('pk', flat=True))
+
+    def _count(self, label, added):
+        self.counts[label] = self.counts.get(label, 0) + added
+
+    def categories_and_suppliers(self, categories, suppliers):
+        rng = self.rng
+        names = [
+            CATEGORY_WORDS[i % len(CATEGORY_WORDS)] + (f' {i // len(CATEGORY_WORDS) + 1}' if i >= len(CATEGORY_WORDS) else '')
+            for i in range(categories)
+        ]
+        self.category_ids = self._insert(Category, [
+            Category(category_name=name, description=f'Productos de {name.lower()}') for name in names
+        ])
+        self.supplier_ids = self._insert(Supplier, [
+            Supplier(contact_name=f'Proveedor {i + 1}', contact_title='Ventas', phone=f'+569{rng.randint(10000000, 99999999)}')
+            for i in range(suppliers)
+        ])
+        self.shipper_ids = self._insert(Shipper, [
+            Shipper(company_name=name, phone=f'+562{rng.randint(1000000, 9999999)}')
+            for name in ('Chilexpress', 'Starken', 'Correos de Chile')
+        ])
+        self._count('categories', categories)
+        self._count('suppliers', suppliers)
+
+    def products(self, total):
+        rng = self.rng
+        self.products_by_rank = []   # (id, price), most popular first
+        for start, size in _chunks(total, self.batch_size):
+            batch = []
+            for i in range(start, start + size):
+                # Log-normal prices: many cheap items, a few expensive machines
+                price = Decimal(str(round(min(max(math.exp(rng.gauss(8.5, 1.2)), 290), 2_500_000))))
+                batch.append(Product(
+                    product_name=f'{rng.choice(PRODUCT_WORDS)} {rng.choice(PRODUCT_ADJECTIVES)} {i + 1}',
+                    category_id=rng.choice(self.category_ids),
+                    supplier_id=rng.choice(self.supplier_ids),
+                    quantity_per_unit=rng.choice(('1 unidad', 'Caja 10', 'Caja 50', 'Pack 3', '1 kg', '1 galón')),
+                    unit_price=price,
+                    units_in_order=0,
+                    units_in_stock=rng.randint(0, 500),
+                    reorder_level=rng.choice((5, 10, 20)),
+                    discount=Decimal(rng.choice(('0.00', '0.00', '0.00', '0.05', '0.10'))),
+                ))
+            with transaction.atomic():
+                ids = self._insert(Product, batch)
+            self.products_by_rank.extend(zip(ids, (product.unit_price for product in batch)))
+            self._count('products', size)
+            self.progress('products', start + size, total)
+        # Popularity does not follow the id order
+        rng.shuffle(self.products_by_rank)
+        self.product_weights = zipf_cum_weights(len(self.products_by_rank), self.zipf)
+
+    def customers(self, total, employees):
+        hashed = make_password(self.password)
+        self.customer_ids = []
+        for start, size in _chunks(total, self.batch_size):
+            rows = [
+                {
+                    'username': f'{self.prefix}_customer_{i + 1}',
+                    'email': f'{self.prefix}_customer_{i + 1}@example.com',
+                    'first_name': 'Cliente',
+                    'last_name': str(i + 1),
+                }
+                for i in range(start, start + size)
+            ]
+            users = create_users(rows, [hashed] * size, 'customer', self.batch_size)
+            self.customer_ids.extend(user.customer.pk for user in users)
+            self._count('customers', size)
+            self.progress('customers', start + size, total)
+        User.objects.bulk_create([
+            User(username=f'{self.prefix}_employee_{i + 1}', password=hashed, user_type='employee', is_staff=True)
+            for i in range(employees)
+        ])
+        self._count('employees', employees)
+        # Regulars and one-off buyers, flatter than product popularity
+        self.customer_weights = zipf_cum_weights(len(self.customer_ids), 0.6)
+
+    def _popular_products(self, k):
+        return self.rng.choices(self.products_by_rank, cum_weights=self.product_weights, k=k)
+
+    def carts(self, total):
+        rng = self.rng
+        # One cart line per (customer, product)
+        total = min(total, len(self.customer_ids) * len(self.products_by_rank))
+        lines = {}
+        while len(lines) < total:
+            customer_id = rng.choices(self.customer_ids, cum_weights=self.customer_weights)[0]
+            product_id, price = self._popular_products(1)[0]
+            lines.setdefault((customer_id, product_id), price)
+        for start, size in _chunks(total, self.batch_size):
+            batch = []
+            for (customer_id, product_id), price in itertools.islice(lines.items(), start, start + size):
+                quantity = rng.randint(1, 4)
+                batch.append(Cart(customer_id=customer_id, product_id=product_id,
+                                  num_of_products=quantity, total_price=price * quantity))
+            Cart.objects.bulk_create(batch, batch_size=self.batch_size)
+            self._count('carts', size)
+            self.progress('carts', start + size, total)
+
+    def _order_days(self, days, end):
+        first = end - timedelta(days=days - 1)
+        calendar = [first + timedelta(days=i) for i in range(days)]
+        weights = itertools.accumulate(MONTH_WEIGHTS[d.month - 1] * WEEKDAY_WEIGHTS[d.weekday()] for d in calendar)
+        return calendar, list(weights)
+
+    def orders(self, total, days, end):
+        rng = self.rng
+        calendar, day_weights = self._order_days(days, end)
+        recent = end - timedelta(days=14)
+        line_counts, line_weights = (1, 2, 3, 4, 5, 6, 8, 10), (35, 25, 15, 10, 6, 4, 3, 2)
+        for start, size in _chunks(total, self.batch_size):
+            orders, lines = [], []
+            customers = rng.choices(self.customer_ids, cum_weights=self.customer_weights, k=size)
+            for day, customer_id in zip(rng.choices(calendar, cum_weights=day_weights, k=size), customers):
+                # Shopping hours, 8:00 to 23:00
+                ordered = timezone.make_aware(
+                    datetime.combine(day, time(rng.randint(8, 22), rng.randint(0, 59), rng.randint(0, 59)))
+                )
+                status = self._status(OPEN_MIX if day >= recent else CLOSED_MIX)
+                shipped = ordered + timedelta(days=rng.randint(1, 5)) if status in ('shipped', 'delivered') else None
+                orders.append(Order(
+                    customer_id=customer_id,
+                    order_date=ordered,
+                    required_date=ordered + timedelta(days=7),
+                    shipped_date=shipped,
+                    freight=Decimal(rng.choice(('0.00', '2990.00', '4990.00', '7990.00'))),
+                    shipper_id=rng.choice(self.shipper_ids) if shipped else None,
+                    status=status,
+                ))
+                products = dict(self._popular_products(rng.choices(line_counts, line_weights)[0]))
+                lines.append(products)
+            with transaction.atomic():
+                order_ids = self._insert(Order, orders)
+                details = [
+                    Orderdetails(order_id=order_id, product_id=product_id, unit_price=price,
+                                 quantity=rng.choices((1, 2, 3, 5, 10), (60, 20, 10, 6, 4))[0], discount=Decimal('0.00'))
+                    for order_id, products in zip(order_ids, lines)
+                    for product_id, price in products.items()
+                ]
+                Orderdetails.objects.bulk_create(details, batch_size=self.batch_size)
+            self._count('orders', size)
+            self._count('order_lines', len(details))
+            self.progress('orders', start + size, total)
+
+    def _status(self, mix):
+        statuses, weights = zip(*mix)
+        return self.rng.choices(statuses, weights)[0]
+
+    def generate(self, categories=15, suppliers=50, products=10000, customers=5000, employees=5,
+                 carts=2000, orders=50000, days=730, end=None):
+        if User.objects.filter(username__startswith=f'{self.prefix}_').exists():
+            raise ValueError(f'Users named {self.prefix}_* already exist, choose another prefix')
+        end = end or timezone.localdate()
+        self.categories_and_suppliers(categories, suppliers)
+        self.products(products)
+        self.customers(customers, employees)
+        if carts:
+            self.carts(carts)
+        if orders:
+            self.orders(orders, days, end)
+        return self.counts
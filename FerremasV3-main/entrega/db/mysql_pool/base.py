@@ -0,0 +1,47 @@
+"""
+MySQL backend whose connections come from a per-process pool shared by
+all threads, instead of one connect per request (or per thread with
+``CONN_MAX_AGE``). Closing a connection gives it back to the pool.
+
+    'ENGINE': 'entrega.db.mysql_pool',
+    'CONN_MAX_AGE': 0,  # hand the connection back at the end of every request
+    'POOL': {'MAX_SIZE': 10, 'TIMEOUT': 10, 'RECYCLE': 3600, 'PING_AFTER': 30},
+"""
+from django.db.backends.mysql.base import Database, DatabaseWrapper as MySQLDatabaseWrapper
+
+from ..pool import ConnectionPool, PoolTimeout, get_pool
+
+
+def _ping(connection):
+    try:
+        connection.ping()
+    except Database.Error:
+        return False
+    return True
+
+
+class DatabaseWrapper(MySQLDatabaseWrapper):
+    def _pool(self, conn_params=None):
+        options = {key.lower(): value for key, value in self.settings_dict.get('POOL', {}).items()}
+        return get_pool(self.alias, lambda: ConnectionPool(
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params), _ping, **options
+        ))
+
+    def get_new_connection(self, conn_params):
+        try:
+            return self._pool(conn_params).acquire()
+        except PoolTimeout as e:
+            # wrap_database_errors turns it into django.db.OperationalError
+            raise Database.OperationalError(str(e)) from e
+
+    def _close(self):
+        if self.connection is None:
+            return
+        discard = self.errors_occurred and not self.is_usable()
+        if not discard and (self.in_atomic_block or not self.autocommit):
+            # Do not hand uncommitted work to the next borrower
+            try:
+                self.connection.rollback()
+            except Database.Error:
+                discard = True
+        self._pool().release(self.connection, discard=discard)
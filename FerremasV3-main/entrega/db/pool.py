@@ -0,0 +1,147 @@
+"""
+Thread-safe pool of DB-API connections, shared by every thread of a
+process (see ``entrega.db.mysql_pool``).
+
+Idle connections are reused last-in first-out so the hot ones stay warm.
+A connection is closed instead of reused once it is older than
+``RECYCLE`` seconds, and is pinged first when it sat idle for more than
+``PING_AFTER`` seconds. At most ``MAX_SIZE`` connections are open; beyond
+that ``acquire`` waits up to ``TIMEOUT`` seconds and raises ``PoolTimeout``.
+"""
+import collections
+import os
+import threading
+import time
+
+DEFAULTS = {
+    'MAX_SIZE': 10,
+    'TIMEOUT': 10,
+    'RECYCLE': 3600,
+    'PING_AFTER': 30,
+}
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, connect, is_usable, max_size=None, timeout=None, recycle=None, ping_after=None):
+        self._connect = connect
+        self._is_usable = is_usable
+        self.max_size = DEFAULTS['MAX_SIZE'] if max_size is None else max_size
+        self.timeout = DEFAULTS['TIMEOUT'] if timeout is None else timeout
+        self.recycle = DEFAULTS['RECYCLE'] if recycle is None else recycle
+        self.ping_after = DEFAULTS['PING_AFTER'] if ping_after is None else ping_after
+        self._cond = threading.Condition()
+        self._idle = collections.deque()   # (connection, released_at)
+        self._created_at = {}              # id(connection) -> creation time
+        self._size = 0                     # idle + in use
+        self._stats = collections.Counter()
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        while True:
+            with self._cond:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeout(f'No connection available within {self.timeout}s')
+                    if not waited:
+                        self._stats['waits'] += 1
+                        waited = True
+                    self._cond.wait(remaining)
+                if self._idle:
+                    connection, released_at = self._idle.pop()
+                else:
+                    # Reserve the slot, connect outside the lock
+                    self._size += 1
+                    connection = None
+
+            if connection is None:
+                return self._open()
+            # Checks run outside the lock, they may hit the network
+            now = time.monotonic()
+            if now - self._created_at[id(connection)] > self.recycle:
+                self._discard(connection)
+            elif now - released_at > self.ping_after and not self._is_usable(connection):
+                self._discard(connection)
+            else:
+                self._stats['reused'] += 1
+                return connection
+
+    def release(self, connection, discard=False):
+        if discard:
+            self._discard(connection)
+            return
+        with self._cond:
+            self._idle.append((connection, time.monotonic()))
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'idle': idle,
+                'in_use': self._size - idle,
+                'created': self._stats['created'],
+                'reused': self._stats['reused'],
+                'discarded': self._stats['discarded'],
+                'waits': self._stats['waits'],
+                'timeouts': self._stats['timeouts'],
+            }
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = list(self._idle), collections.deque()
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def _open(self):
+        try:
+            connection = self._connect()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created_at[id(connection)] = time.monotonic()
+            self._stats['created'] += 1
+        return connection
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._created_at.pop(id(connection), None)
+            self._size -= 1
+            self._stats['discarded'] += 1
+            self._cond.notify()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+# Sockets must not be shared with the parent (e.g. gunicorn --preload): start over in the child
+os.register_at_fork(after_in_child=_pools.clear)
+
+
+def get_pool(alias, factory):
+    """The pool of database ``alias``, created by ``factory()`` on first use."""
+    pool = _pools.get(alias)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                pool = _pools[alias] = factory()
+    return pool
+
+
+def pool_stats():
+    return {alias: pool.stats() for alias, pool in _pools.items()}
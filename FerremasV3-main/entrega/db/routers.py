@@ -0,0 +1,133 @@
+"""
+Read-replica routing.
+
+``ReplicaRoutingMiddleware`` marks GET/HEAD/OPTIONS requests to the views
+in ``DB_ROUTING['READ_VIEWS']`` (catalog and order reads) and
+``ReplicaRouter`` sends their reads to the ``DB_ROUTING['REPLICA']``
+alias. Everything else, writes included, uses ``default``.
+
+After a successful write the user is pinned to ``default`` for
+``DB_ROUTING['STICKY_SECONDS']`` so they read their own cart and orders
+even while the replica lags. Pins live in the Django cache: use a cache
+shared by all processes (Redis, Memcached) when running more than one.
+"""
+import contextvars
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.state import token_backend
+
+from ..metrics import record_cache
+
+DEFAULTS = {
+    'REPLICA': 'replica',
+    'STICKY_SECONDS': 5,
+    'CACHE': 'default',
+    'READ_VIEWS': (),
+}
+
+_read_from_replica = contextvars.ContextVar('read_from_replica', default=False)
+
+
+def get_option(name):
+    return getattr(settings, 'DB_ROUTING', {}).get(name, DEFAULTS[name])
+
+
+def _pin_key(user_id):
+    return f'replica-pin:{user_id}'
+
+
+def pin_to_primary(user_id):
+    caches[get_option('CACHE')].set(_pin_key(user_id), True, get_option('STICKY_SECONDS'))
+
+
+def is_pinned(user_id):
+    if user_id is None:
+        return False
+    pinned = caches[get_option('CACHE')].get(_pin_key(user_id), False)
+    record_cache('replica_pins', pinned)
+    return pinned
+
+
+def _token_user_id(request):
+    # Only a routing hint: the view still authenticates the token
+    header = request.META.get(api_settings.AUTH_HEADER_NAME, '').split()
+    if len(header) != 2 or header[0] not in api_settings.AUTH_HEADER_TYPES:
+        return None
+    try:
+        return token_backend.decode(header[1], verify=False).get(api_settings.USER_ID_CLAIM)
+    except TokenBackendError:
+        return None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replica = get_option('REPLICA')
+        if (
+            _read_from_replica.get()
+            and replica in settings.DATABASES
+            # Reads inside a transaction must see its writes
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return replica
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary
+        return db != get_option('REPLICA')
+
+
+def _written_by(request, response):
+    # User to pin after a successful write, if any
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        return _token_user_id(request)
+    return None
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _read_from_replica.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_from_replica.reset(token)
+
+        user_id = _written_by(request, response)
+        if user_id is not None:
+            pin_to_primary(user_id)
+        return response
+
+    async def __acall__(self, request):
+        token = _read_from_replica.set(False)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_from_replica.reset(token)
+
+        user_id = _written_by(request, response)
+        if user_id is not None:
+            await sync_to_async(pin_to_primary)(user_id)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in SAFE_METHODS
+            and request.resolver_match.url_name in get_option('READ_VIEWS')
+            and not is_pinned(_token_user_id(request))
+        ):
+            _read_from_replica.set(True)
@@ -0,0 +1,196 @@
+"""
+Slow-query log.
+
+With ``SLOW_QUERIES['ENABLED']`` every database connection gets a
+``SlowQueryLogger`` execute wrapper. Queries slower than ``THRESHOLD_MS``
+are written as one JSON line to ``SLOW_QUERIES['FILE']`` (rotated at
+``MAX_BYTES``, ``BACKUP_COUNT`` files kept) together with the view that
+ran them (set by ``SlowQueryMiddleware``), the innermost project stack
+frame and, for SELECTs, the plan (``EXPLAIN`` on MySQL,
+``EXPLAIN QUERY PLAN`` on SQLite).
+
+Only the number of parameters is logged: their values include password
+hashes and customer details from user INSERTs and UPDATEs. ``LOG_PARAMS``
+adds them (truncated) for debugging on data that is safe to write out.
+
+``python manage.py slowqueries`` groups the log by ``fingerprint``.
+"""
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import re
+import threading
+import time
+import traceback
+from datetime import datetime, timezone as dt_timezone
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils.deprecation import MiddlewareMixin
+
+DEFAULTS = {
+    'ENABLED': False,
+    'THRESHOLD_MS': 200,
+    'FILE': None,
+    'MAX_BYTES': 10 * 1024 * 1024,
+    'BACKUP_COUNT': 5,
+    'EXPLAIN': True,
+    'LOG_PARAMS': False,
+}
+
+_view = contextvars.ContextVar('slow_query_view', default=None)
+# Set while the plan of a slow query runs, so it is not logged itself
+_explaining = contextvars.ContextVar('slow_query_explaining', default=False)
+
+logger = logging.getLogger('entrega.slowqueries')
+_handler = None
+_handler_lock = threading.Lock()
+
+
+# Wrappers that sit between the project code and the query
+_INSTRUMENTATION = (__file__, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'metrics.py'))
+
+
+def get_option(name):
+    return getattr(settings, 'SLOW_QUERIES', {}).get(name, DEFAULTS[name])
+
+
+def log_file():
+    return get_option('FILE') or os.path.join(settings.BASE_DIR, 'logs', 'slow_queries.log')
+
+
+def _get_logger():
+    # (Re)opened whenever SLOW_QUERIES['FILE'] changes
+    global _handler
+    path = os.path.abspath(log_file())
+    with _handler_lock:
+        if _handler is None or _handler.baseFilename != path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=get_option('MAX_BYTES'), backupCount=get_option('BACKUP_COUNT'), encoding='utf-8',
+            )
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            if _handler is not None:
+                logger.removeHandler(_handler)
+                _handler.close()
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            _handler = handler
+    return logger
+
+
+def fingerprint(sql):
+    """The query with literals and IN lists replaced, for grouping."""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+    sql = re.sub(r'%s|\?', '?', sql)
+    sql = re.sub(r'\(\s*\?(?:\s*,\s*\?)*\s*\)', '(...)', sql)
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+def _caller():
+    for frame in reversed(traceback.extract_stack()):
+        # The innermost frame of project code, not of a library installed under it
+        if (
+            frame.filename.startswith(str(settings.BASE_DIR))
+            and 'site-packages' not in frame.filename
+            and frame.filename not in _INSTRUMENTATION
+        ):
+            return f'{os.path.relpath(frame.filename, settings.BASE_DIR)}:{frame.lineno} in {frame.name}'
+    return None
+
+
+def explain(connection, sql, params):
+    """Plan of a SELECT as a list of text rows, None for other statements."""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    token = _explaining.set(True)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            return [' '.join(str(value) for value in row) for row in cursor.fetchall()]
+    except DatabaseError as exc:
+        return [f'EXPLAIN failed: {exc}']
+    finally:
+        _explaining.reset(token)
+
+
+class SlowQueryLogger:
+    def __call__(self, execute, sql, params, many, context):
+        if _explaining.get():
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if elapsed_ms >= get_option('THRESHOLD_MS'):
+                self.log(context['connection'], sql, params, many, elapsed_ms)
+
+    def log(self, connection, sql, params, many, elapsed_ms):
+        entry = {
+            'time': datetime.now(dt_timezone.utc).isoformat(),
+            'alias': connection.alias,
+            'duration_ms': round(elapsed_ms, 3),
+            'view': _view.get(),
+            'frame': _caller(),
+            'sql': sql,
+            'param_count': len(params or ()),
+            'many': many,
+            'fingerprint': fingerprint(sql),
+        }
+        if get_option('LOG_PARAMS'):
+            entry['params'] = repr(params)[:500]
+        if get_option('EXPLAIN') and not many:
+            entry['explain'] = explain(connection, sql, params)
+        _get_logger().info(json.dumps(entry, default=str))
+
+
+def install(connection, **kwargs):
+    """``connection_created`` receiver: adds the wrapper once per connection object."""
+    if not any(isinstance(wrapper, SlowQueryLogger) for wrapper in connection.execute_wrappers):
+        # First, not last: execute_wrapper() blocks open right now pop the last one on exit
+        connection.execute_wrappers.insert(0, SlowQueryLogger())
+
+
+def read_entries(path=None):
+    """Entries of the log and its rotated files, oldest first."""
+    path = path or log_file()
+    files = [f'{path}.{i}' for i in range(get_option('BACKUP_COUNT'), 0, -1)] + [path]
+    for name in files:
+        if not os.path.exists(name):
+            continue
+        with open(name, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+class SlowQueryMiddleware(MiddlewareMixin):
+    """Tags the queries of a request with its view."""
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _view.set(f'{request.method} {request.path}')
+        try:
+            return self.get_response(request)
+        finally:
+            _view.reset(token)
+
+    async def __acall__(self, request):
+        token = _view.set(f'{request.method} {request.path}')
+        try:
+            return await self.get_response(request)
+        finally:
+            _view.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        _view.set(f'{match.url_name or match.view_name} ({request.method} {request.path})')
@@ -0,0 +1,36 @@
+"""
+SQLite backend tuned for several threads/processes writing at once.
+
+Every new connection applies ``PRAGMAS`` from the database settings (WAL,
+so readers no longer block behind the writer, ``synchronous=NORMAL``,
+``mmap_size``, ``busy_timeout``...). Transactions start with
+``BEGIN IMMEDIATE`` by default: the write lock is taken up front, where
+``busy_timeout`` waits for it, instead of failing with "database is
+locked" when a read transaction tries to write later.
+
+    'ENGINE': 'entrega.db.sqlite_tuned',
+    'PRAGMAS': {'journal_mode': 'wal', 'synchronous': 'normal', ...},
+    'TRANSACTION_MODE': 'IMMEDIATE',
+"""
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 20000,
+    'cache_size': -20000,   # KiB
+    'temp_store': 'memory',
+}
+
+
+class DatabaseWrapper(SQLiteDatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict.get('PRAGMAS', DEFAULT_PRAGMAS).items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict.get('TRANSACTION_MODE', 'IMMEDIATE')
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
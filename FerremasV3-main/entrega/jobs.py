@@ -0,0 +1,206 @@
+"""
+Database-backed job queue for work that should not run inside a request.
+
+Jobs are rows in the ``Job`` table. ``enqueue`` inserts them once the
+surrounding transaction commits, and workers started with
+``manage.py run_workers`` claim queued jobs in batches of the same
+``job_type`` and hand their payloads to the handler registered with
+``@register``. Failed batches are retried with exponential backoff until
+``max_attempts`` is reached.
+"""
+import logging
+import random
+import time
+import uuid
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+DEFAULTS = {
+    'BATCH_SIZE': 50,          # max jobs of one type handled per claim
+    'POLL_INTERVAL': 1.0,      # seconds a worker sleeps when the queue is empty
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF': 5,        # seconds, doubled on every attempt
+    'LOCK_TIMEOUT': 300,       # seconds before a running job is considered abandoned
+}
+
+Handler = namedtuple('Handler', ['func', 'batch_size'])
+
+_handlers = {}
+
+
+def get_option(name):
+    return getattr(settings, 'JOB_QUEUE', {}).get(name, DEFAULTS[name])
+
+
+def register(job_type, batch_size=1):
+    """
+    Register ``func(payloads)`` as the handler of ``job_type``. The handler
+    always receives a list of payloads, at most ``batch_size`` long.
+    """
+    def decorator(func):
+        _handlers[job_type] = Handler(func, batch_size)
+        return func
+    return decorator
+
+
+def enqueue(job_type, payload=None, delay=None, max_attempts=None):
+    enqueue_many([(job_type, payload)], delay=delay, max_attempts=max_attempts)
+
+
+def enqueue_many(jobs, delay=None, max_attempts=None):
+    """
+    Queue ``(job_type, payload)`` pairs with a single insert after the
+    current transaction commits (immediately when not in a transaction).
+    """
+    def create():
+        run_after = timezone.now() + (delay or timedelta())
+        Job.objects.bulk_create([
+            Job(
+                job_type=job_type,
+                payload=payload or {},
+                run_after=run_after,
+                max_attempts=max_attempts or get_option('MAX_ATTEMPTS'),
+            )
+            for job_type, payload in jobs
+        ])
+    transaction.on_commit(create)
+
+
+def claim(worker_id, batch_size=None):
+    """
+    Lock up to ``batch_size`` due jobs sharing the type of the oldest due
+    job. Claiming is a conditional UPDATE, so two workers racing for the
+    same rows never both get them; the loser tries the next due jobs right
+    away. Returns ``[]`` only when nothing is due.
+    """
+    while True:
+        now = timezone.now()
+        due = Job.objects.filter(status=QUEUED, run_after__lte=now).order_by('run_after', 'job_id')
+        job_type = due.values_list('job_type', flat=True).first()
+        if job_type is None:
+            return []
+
+        handler = _handlers.get(job_type)
+        size = min(batch_size or get_option('BATCH_SIZE'), handler.batch_size if handler else 1)
+        ids = list(due.filter(job_type=job_type).values_list('job_id', flat=True)[:size])
+        token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+        claimed = Job.objects.filter(job_id__in=ids, status=QUEUED).update(
+            status=RUNNING, locked_by=token, locked_at=now, attempts=F('attempts') + 1
+        )
+        if claimed:
+            return list(Job.objects.filter(locked_by=token, status=RUNNING).order_by('job_id'))
+
+
+def execute(jobs):
+    job_type = jobs[0].job_type
+    handler = _handlers.get(job_type)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job type '{job_type}'")
+        handler.func([job.payload for job in jobs])
+    except Exception as exc:
+        logger.exception("Job batch %s failed", [job.job_id for job in jobs])
+        _retry_or_fail(jobs, exc)
+        return False
+
+    Job.objects.filter(job_id__in=[job.job_id for job in jobs]).update(
+        status=DONE, finished_at=timezone.now(), locked_by=None, last_error=None
+    )
+    return True
+
+
+def _retry_or_fail(jobs, exc):
+    now = timezone.now()
+    backoff = get_option('RETRY_BACKOFF')
+    for job in jobs:
+        job.last_error = f"{type(exc).__name__}: {exc}"
+        job.locked_by = None
+        if job.attempts >= job.max_attempts:
+            job.status = FAILED
+            job.finished_at = now
+        else:
+            # Exponential backoff with jitter so retried batches spread out
+            seconds = backoff * 2 ** (job.attempts - 1)
+            job.status = QUEUED
+            job.run_after = now + timedelta(seconds=seconds * random.uniform(1, 1.25))
+    Job.objects.bulk_update(jobs, ['status', 'run_after', 'finished_at', 'last_error', 'locked_by'])
+
+
+def requeue_abandoned():
+    """
+    Put back jobs whose worker died while running them. The attempt was
+    counted when the job was claimed, so a job that keeps killing its
+    worker fails once it reaches ``max_attempts``, like one that raises.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=get_option('LOCK_TIMEOUT'))
+    abandoned = Job.objects.filter(status=RUNNING, locked_at__lt=cutoff)
+    error = "Abandoned: the worker stopped while running the job"
+    abandoned.filter(attempts__gte=F('max_attempts')).update(
+        status=FAILED, finished_at=now, locked_by=None, last_error=error
+    )
+    return abandoned.update(status=QUEUED, locked_by=None, last_error=error)
+
+
+def purge_finished(older_than):
+    cutoff = timezone.now() - older_than
+    deleted, _ = Job.objects.filter(status=DONE, finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def work_once(worker_id, batch_size=None):
+    """Claim and run one batch. Returns the number of jobs processed."""
+    jobs = claim(worker_id, batch_size)
+    if jobs:
+        execute(jobs)
+    return len(jobs)
+
+
+def run_worker(worker_id, stop=None, burst=False, batch_size=None):
+    """
+    Process jobs until ``stop`` (anything with ``is_set()``) is set. In
+    ``burst`` mode the worker returns as soon as nothing is due.
+    """
+    poll_interval = get_option('POLL_INTERVAL')
+    lock_timeout = get_option('LOCK_TIMEOUT')
+    last_requeue = 0
+    processed = 0
+    while not (stop and stop.is_set()):
+        if time.monotonic() - last_requeue > lock_timeout:
+            requeue_abandoned()
+            last_requeue = time.monotonic()
+        count = work_once(worker_id, batch_size)
+        processed += count
+        if not count:
+            if burst:
+                break
+            time.sleep(poll_interval)
+    return processed
+
+
+def queue_metrics():
+    """Job counts per type and status, plus the age of the oldest due job."""
+    now = timezone.now()
+    rows = Job.objects.values('job_type', 'status').annotate(
+        count=Count('job_id'), oldest=Min('run_after')
+    ).order_by('job_type', 'status')
+    metrics = {}
+    for row in rows:
+        entry = metrics.setdefault(row['job_type'], {
+            'queued': 0, 'running': 0, 'done': 0, 'failed': 0, 'oldest_queued_seconds': 0,
+        })
+        entry[row['status']] = row['count']
+        if row['status'] == QUEUED and row['oldest'] < now:
+            entry['oldest_queued_seconds'] = round((now - row['oldest']).total_seconds(), 1)
+    return metrics
@@ -0,0 +1,93 @@
+"""
+Credential checks that keep password hashing off the request workers.
+
+PBKDF2 runs in a bounded thread pool (``hashlib`` releases the GIL while
+hashing), at most ``LOGIN['HASH_WORKERS']`` at a time with up to
+``LOGIN['MAX_QUEUED']`` more waiting. Logins beyond that are rejected
+with ``LoginThrottled`` instead of piling up, and unknown or inactive
+usernames are rejected after one indexed lookup without hashing at all.
+
+The pool checks passwords the way ``ModelBackend`` does and sends
+``user_login_failed`` like ``authenticate()``. With other
+``AUTHENTICATION_BACKENDS`` configured, logins go through
+``authenticate()`` itself, without the pool's bound.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.signals import user_login_failed
+
+from .models import User
+
+DEFAULTS = {
+    'HASH_WORKERS': 4,
+    'MAX_QUEUED': 16,
+}
+
+
+class LoginThrottled(Exception):
+    pass
+
+
+def get_option(name):
+    return getattr(settings, 'LOGIN', {}).get(name, DEFAULTS[name])
+
+
+_pool = ThreadPoolExecutor(max_workers=get_option('HASH_WORKERS'), thread_name_prefix='login-hash')
+_slots = threading.BoundedSemaphore(get_option('HASH_WORKERS') + get_option('MAX_QUEUED'))
+
+
+def _submit_check(user, password):
+    if not _slots.acquire(blocking=False):
+        raise LoginThrottled()
+    try:
+        future = _pool.submit(user.check_password, password)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+
+def _can_authenticate(user):
+    # Same rule as ModelBackend.user_can_authenticate
+    return user is not None and getattr(user, 'is_active', True)
+
+
+def _model_backend_only():
+    return list(settings.AUTHENTICATION_BACKENDS) == ['django.contrib.auth.backends.ModelBackend']
+
+
+def _login_failed(username, request):
+    # Same signal and masked credentials as authenticate()
+    user_login_failed.send(
+        sender='django.contrib.auth',
+        credentials={'username': username, 'password': '********************'},
+        request=request,
+    )
+
+
+def check_credentials(username, password, request=None):
+    """Return the user if the password matches, else None."""
+    if not _model_backend_only():
+        return authenticate(request, username=username, password=password)
+    user = User.objects.filter(username=username).first()
+    if _can_authenticate(user) and _submit_check(user, password).result():
+        return user
+    _login_failed(username, request)
+    return None
+
+
+async def acheck_credentials(username, password, request=None):
+    """Async variant: the event loop waits on the pool without blocking."""
+    if not _model_backend_only():
+        return await sync_to_async(authenticate)(request, username=username, password=password)
+    user = await User.objects.filter(username=username).afirst()
+    if _can_authenticate(user) and await asyncio.wrap_future(_submit_check(user, password)):
+        return user
+    await sync_to_async(_login_failed)(username, request)
+    return None
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from entrega.archive import archivable_orders, archive_orders, get_archive_after_days
+
+class Command(BaseCommand):
+    help = 'Move old shipped orders and their details into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='Archive orders older than this many days')
+        parser.add_argument('--batch-size', type=int, default=None, help='Orders moved per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the orders that would be archived')
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else get_archive_after_days()
+        if options['dry_run']:
+            count = archivable_orders(days).count()
+            self.stdout.write(f'{count} orders older than {days} days would be archived.')
+            return
+
+        archived = archive_orders(
+            older_than_days=days,
+            batch_size=options['batch_size'],
+            progress=lambda total: self.stdout.write(f'Archived {total} orders...'),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} orders older than {days} days.'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from entrega.recommendations import refresh_recommendations
+
+class Command(BaseCommand):
+    help = 'Build or incrementally refresh "frequently bought together" recommendations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help='Rebuild from every order, archived ones included, instead of the uncounted ones')
+        parser.add_argument('--top-n', type=int, default=None, help='Neighbours kept per product')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Orders processed per batch')
+
+    def handle(self, *args, **options):
+        result = refresh_recommendations(
+            full=options['full'],
+            top_n=options['top_n'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {result['orders']} orders, updated recommendations for {result['products']} products."
+        ))
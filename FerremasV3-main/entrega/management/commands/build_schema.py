@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from entrega import schema
+
+class Command(BaseCommand):
+    help = 'Generate the OpenAPI schema once and write it as versioned JSON and YAML files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Fail if the written files differ from the current code instead of writing them')
+
+    def handle(self, *args, **options):
+        if schema.artifact_path('json') is None:
+            raise CommandError("OPENAPI_SCHEMA['ARTIFACT_DIR'] is not set")
+
+        if options['check']:
+            current = schema.generate_schema()
+            stale = [
+                str(schema.artifact_path(fmt)) for fmt in schema.CODECS
+                if not schema.artifact_path(fmt).exists()
+                or schema.artifact_path(fmt).read_bytes() != schema.encode(current, fmt)
+            ]
+            if stale:
+                raise CommandError(f"Schema out of date, run build_schema: {', '.join(stale)}")
+            self.stdout.write(self.style.SUCCESS('Schema up to date.'))
+            return
+
+        for path in schema.write_artifacts():
+            self.stdout.write(self.style.SUCCESS(f'Wrote {path} ({path.stat().st_size} bytes)'))
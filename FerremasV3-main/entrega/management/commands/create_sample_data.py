@@ -23,17 +23,18 @@ class Command(BaseCommand):
 
         # Create suppliers
         suppliers_data = [
-            {'company_name': 'Tech Supplies Co', 'contact_name': 'John Smith', 'phone': '555-0101'},
-            {'company_name': 'Hardware Plus', 'contact_name': 'Jane Doe', 'phone': '555-0102'},
+            # Supplier has no company field, the contact identifies it
+            {'contact_name': 'John Smith', 'contact_title': 'Sales Representative', 'phone': '555-0101'},
+            {'contact_name': 'Jane Doe', 'contact_title': 'Sales Manager', 'phone': '555-0102'},
         ]
         
         for sup_data in suppliers_data:
             supplier, created = Supplier.objects.get_or_create(
-                company_name=sup_data['company_name'],
+                contact_name=sup_data['contact_name'],
                 defaults=sup_data
             )
             if created:
-                self.stdout.write(f'Created supplier: {supplier.company_name}')
+                self.stdout.write(f'Created supplier: {supplier.contact_name}')
 
         # Create products
         products_data = [
@@ -42,21 +43,21 @@ class Command(BaseCommand):
                 'unit_price': Decimal('99.99'),
                 'units_in_stock': 50,
                 'category': Category.objects.get(category_name='Electronics'),
-                'supplier': Supplier.objects.get(company_name='Tech Supplies Co'),
+                'supplier': Supplier.objects.get(contact_name='John Smith'),
             },
             {
                 'product_name': 'Power Drill',
                 'unit_price': Decimal('149.99'),
                 'units_in_stock': 25,
                 'category': Category.objects.get(category_name='Tools'),
-                'supplier': Supplier.objects.get(company_name='Hardware Plus'),
+                'supplier': Supplier.objects.get(contact_name='Jane Doe'),
             },
             {
                 'product_name': 'Bluetooth Speaker',
                 'unit_price': Decimal('79.99'),
                 'units_in_stock': 30,
                 'category': Category.objects.get(category_name='Electronics'),
-                'supplier': Supplier.objects.get(company_name='Tech Supplies Co'),
+                'supplier': Supplier.objects.get(contact_name='John Smith'),
             },
         ]
         
@@ -86,9 +87,8 @@ class Command(BaseCommand):
             Customer.objects.get_or_create(
                 user=customer_user,
                 defaults={
-                    'company_name': 'Test Customer Co',
-                    'contact_name': 'Test Customer',
-                    'phone': '555-0001'
+                    'contact_name': 'Test',
+                    'last_name': 'Customer',
                 }
             )
             self.stdout.write('Created test customer user and profile')
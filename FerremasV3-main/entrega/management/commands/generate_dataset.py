@@ -0,0 +1,61 @@
+import time
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from entrega.dataset import DatasetGenerator
+
+class Command(BaseCommand):
+    help = 'Generate a large, reproducible synthetic dataset (products, customers, carts, orders) for benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Same seed and options, same data')
+        parser.add_argument('--products', type=int, default=10000)
+        parser.add_argument('--customers', type=int, default=5000)
+        parser.add_argument('--employees', type=int, default=5)
+        parser.add_argument('--carts', type=int, default=2000, help='Cart lines')
+        parser.add_argument('--orders', type=int, default=50000)
+        parser.add_argument('--categories', type=int, default=15)
+        parser.add_argument('--suppliers', type=int, default=50)
+        parser.add_argument('--days', type=int, default=730, help='Days of order history')
+        parser.add_argument('--end-date', type=date.fromisoformat, default=None,
+                            help='Last day of order history, YYYY-MM-DD (default: today)')
+        parser.add_argument('--zipf', type=float, default=1.1, help='Exponent of product popularity')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk INSERT')
+        parser.add_argument('--prefix', default='gen', help='Username prefix: <prefix>_customer_N, <prefix>_employee_N')
+        parser.add_argument('--password', default='testpass123', help='Password of every generated user')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        reported = {}
+
+        def progress(label, done, total):
+            # One line per 10% of each table
+            step = int(done * 10 / total) if total else 10
+            if step > reported.get(label, -1):
+                reported[label] = step
+                self.stdout.write(f'{label}: {done}/{total} ({time.perf_counter() - started:.1f}s)')
+
+        generator = DatasetGenerator(
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            zipf=options['zipf'],
+            password=options['password'],
+            prefix=options['prefix'],
+            progress=progress,
+        )
+        try:
+            counts = generator.generate(
+                categories=options['categories'],
+                suppliers=options['suppliers'],
+                products=options['products'],
+                customers=options['customers'],
+                employees=options['employees'],
+                carts=options['carts'],
+                orders=options['orders'],
+                days=options['days'],
+                end=options['end_date'],
+            )
+        except ValueError as exc:
+            raise CommandError(exc)
+
+        summary = ', '.join(f'{count} {label}' for label, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Generated {summary} in {time.perf_counter() - started:.1f}s.'))
@@ -0,0 +1,55 @@
+import csv
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from entrega import provisioning
+from entrega.models import User
+from entrega.serializers import BulkUserItemSerializer
+
+class Command(BaseCommand):
+    help = 'Create users (and their Customer/Supplier profile) from a CSV file with a username,email,password,first_name,last_name header'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='CSV file with one user per row')
+        parser.add_argument('--user-type', choices=[choice for choice, _ in User.USER_TYPE_CHOICES], default='customer')
+        parser.add_argument('--hash-workers', type=int, help='Password hashing threads (defaults to PROVISIONING["HASH_WORKERS"])')
+        parser.add_argument('--batch-size', type=int, help='Rows per INSERT (defaults to PROVISIONING["BATCH_SIZE"])')
+        parser.add_argument('--tokens', metavar='JSON_FILE', help='Also mint initial JWTs and write them to this file')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_file'], newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+        except OSError as e:
+            raise CommandError(f'Cannot read {options["csv_file"]}: {e}')
+        if not rows:
+            raise CommandError('No users to import')
+
+        serializer = BulkUserItemSerializer(data=rows, many=True)
+        if not serializer.is_valid():
+            errors = [f'line {line}: {error}' for line, error in enumerate(serializer.errors, start=2) if error]
+            raise CommandError('Invalid rows:\n' + '\n'.join(errors))
+        rows = serializer.validated_data
+        conflicts = provisioning.username_conflicts([row['username'] for row in rows], options['batch_size'])
+        if conflicts:
+            raise CommandError(f"Usernames repeated or already taken: {', '.join(sorted(conflicts))}")
+
+        started = time.perf_counter()
+        hashed = provisioning.hash_passwords([row['password'] for row in rows], options['hash_workers'])
+        hashed_at = time.perf_counter()
+        users = provisioning.create_users(rows, hashed, options['user_type'], options['batch_size'])
+        created_at = time.perf_counter()
+        self.stdout.write(f'Hashed {len(hashed)} passwords in {hashed_at - started:.2f}s')
+        self.stdout.write(f'Inserted {len(users)} users in {created_at - hashed_at:.2f}s')
+
+        if options['tokens']:
+            tokens = provisioning.mint_tokens(users)
+            with open(options['tokens'], 'w', encoding='utf-8') as f:
+                json.dump(tokens, f, indent=2)
+            self.stdout.write(f'Minted tokens in {time.perf_counter() - created_at:.2f}s, written to {options["tokens"]}')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {len(users)} {options["user_type"]} users in {elapsed:.2f}s ({len(users) / elapsed:.1f} users/s)'
+        ))
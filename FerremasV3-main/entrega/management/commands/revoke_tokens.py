@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from entrega import revocation
+from entrega.models import User
+
+class Command(BaseCommand):
+    help = 'Revoke every JWT of a user and/or purge expired revocations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username whose tokens are revoked')
+        parser.add_argument('--purge', action='store_true', help='Delete revocations of already expired tokens')
+
+    def handle(self, *args, **options):
+        if not options['user'] and not options['purge']:
+            raise CommandError('Use --user and/or --purge')
+
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['user']}' not found")
+            revocation.revoke_user(user.pk)
+            self.stdout.write(self.style.SUCCESS(f'Revoked all tokens of {user.username}'))
+
+        if options['purge']:
+            deleted = revocation.purge_expired()
+            self.stdout.write(self.style.SUCCESS(f'Purged {deleted} expired revocations'))
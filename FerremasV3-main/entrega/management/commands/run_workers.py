@@ -0,0 +1,64 @@
+import multiprocessing
+import os
+import signal
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def _worker_main(worker_id, stop, burst, batch_size):
+    import django
+    django.setup()
+    from entrega.jobs import run_worker
+
+    # The parent decides when to stop; children finish their current batch
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    run_worker(worker_id, stop=stop, burst=burst, batch_size=batch_size)
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers (post-checkout emails, invoices, stock and rollups)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2, help='Number of worker processes')
+        parser.add_argument('--batch-size', type=int, default=None, help='Max jobs of one type per batch')
+        parser.add_argument('--burst', action='store_true', help='Exit once the queue has no due jobs')
+        parser.add_argument('--purge-days', type=int, default=7, help='Delete finished jobs older than this on startup')
+
+    def handle(self, *args, **options):
+        from entrega.jobs import purge_finished, run_worker
+
+        purged = purge_finished(timedelta(days=options['purge_days']))
+        if purged:
+            self.stdout.write(f'Purged {purged} finished jobs')
+
+        if options['processes'] <= 1:
+            processed = run_worker(f'{os.getpid()}-0', burst=options['burst'], batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Worker stopped after {processed} jobs.'))
+            return
+
+        # Children must not inherit the parent's open database connections
+        connections.close_all()
+        stop = multiprocessing.Event()
+        workers = [
+            multiprocessing.Process(
+                target=_worker_main,
+                args=(f'{os.getpid()}-{index}', stop, options['burst'], options['batch_size']),
+                daemon=True,
+            )
+            for index in range(options['processes'])
+        ]
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        for worker in workers:
+            worker.start()
+        self.stdout.write(self.style.SUCCESS(f'Started {len(workers)} workers'))
+
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            stop.set()
+            for worker in workers:
+                worker.join()
+        self.stdout.write(self.style.SUCCESS('Workers stopped.'))
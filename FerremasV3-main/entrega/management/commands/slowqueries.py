@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from entrega.db.slowlog import fingerprint, log_file, read_entries
+
+SORT_KEYS = {
+    'total': lambda group: group['total_ms'],
+    'count': lambda group: group['count'],
+    'max': lambda group: group['slowest']['duration_ms'],
+}
+
+class Command(BaseCommand):
+    help = 'Report the slow-query log grouped by normalized SQL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=None, help='Log file (default: SLOW_QUERIES["FILE"])')
+        parser.add_argument('--top', type=int, default=10, help='Number of query groups shown')
+        parser.add_argument('--sort', choices=SORT_KEYS, default='total', help='Order of the groups')
+        parser.add_argument('--view', default=None, help='Only queries run by views containing this text')
+
+    def handle(self, *args, **options):
+        groups = {}
+        for entry in read_entries(options['file']):
+            if options['view'] and options['view'] not in (entry.get('view') or ''):
+                continue
+            key = entry.get('fingerprint') or fingerprint(entry['sql'])
+            group = groups.setdefault(key, {'count': 0, 'total_ms': 0.0, 'views': set(), 'frames': set(), 'slowest': entry})
+            group['count'] += 1
+            group['total_ms'] += entry['duration_ms']
+            group['views'].add(entry.get('view') or '-')
+            group['frames'].add(entry.get('frame') or '-')
+            if entry['duration_ms'] > group['slowest']['duration_ms']:
+                group['slowest'] = entry
+
+        if not groups:
+            self.stdout.write(f"No slow queries in {options['file'] or log_file()}.")
+            return
+
+        ranked = sorted(groups.items(), key=lambda item: SORT_KEYS[options['sort']](item[1]), reverse=True)
+        for rank, (key, group) in enumerate(ranked[:options['top']], 1):
+            slowest = group['slowest']
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"#{rank}  {group['count']} queries, total {group['total_ms']:.1f} ms, "
+                f"avg {group['total_ms'] / group['count']:.1f} ms, max {slowest['duration_ms']:.1f} ms"
+            ))
+            self.stdout.write(f'  {key}')
+            self.stdout.write(f"  views:  {', '.join(sorted(group['views']))}")
+            self.stdout.write(f"  frames: {', '.join(sorted(group['frames']))}")
+            for row in slowest.get('explain') or []:
+                self.stdout.write(f'  plan:   {row}')
+        self.stdout.write(f'{len(groups)} distinct queries, {sum(g["count"] for g in groups.values())} slow queries.')
@@ -0,0 +1,327 @@
+"""
+Request metrics in the Prometheus text format, served at ``/metrics``.
+
+``MetricsMiddleware`` records, per route (the URL name from
+``entrega/urls.py``), a latency histogram, the status codes and the DB
+queries with their time. Streaming responses are recorded when closed,
+so their latency and queries cover the whole body. ``instrument_serializers`` times every
+top-level DRF serializer (validation and rendering) and
+``record_cache`` counts cache hits and misses.
+
+Each process only bumps counters in memory. With ``METRICS['DIR']`` set
+it also writes them to ``<DIR>/metrics-<pid>.json`` at most every
+``FLUSH_INTERVAL`` seconds and at exit, and ``/metrics`` adds up the files
+of every worker. Files of stopped workers still count (counters never go
+down): empty the directory when deploying.
+"""
+import atexit
+import bisect
+import contextvars
+import functools
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+DEFAULTS = {
+    'DIR': None,
+    'FLUSH_INTERVAL': 5,
+    'TOKEN': None,
+    'SERIALIZERS': True,
+    'BUCKETS': (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+}
+
+PREFIX = 'ferremas_'
+
+# name -> (type, help)
+METRICS = {
+    'http_requests_total': ('counter', 'HTTP requests by route, method and status code'),
+    'http_request_duration_seconds': ('histogram', 'HTTP request latency by route and method'),
+    'db_queries_total': ('counter', 'Database queries by route and database alias'),
+    'db_query_duration_seconds_total': ('counter', 'Time spent in database queries by route and database alias'),
+    'serializer_duration_seconds': ('histogram', 'Time spent in top-level serializers by class and phase'),
+    'cache_requests_total': ('counter', 'Cache lookups by cache and result (hit or miss)'),
+    'cache_hit_ratio': ('gauge', 'Cache hits over lookups by cache'),
+}
+
+
+# QueryTimer of the request in progress
+_timer = contextvars.ContextVar('metrics_query_timer', default=None)
+
+
+def get_option(name):
+    return getattr(settings, 'METRICS', {}).get(name, DEFAULTS[name])
+
+
+def _key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Registry:
+    """Counters and histograms of one process."""
+
+    def __init__(self):
+        self.counters = {}     # (name, labels) -> value
+        self.histograms = {}   # (name, labels) -> [bucket counts..., sum, count]
+        self.flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def inc(self, name, labels, value=1):
+        key = (name, _key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        buckets = get_option('BUCKETS')
+        key = (name, _key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [0] * (len(buckets) + 3)
+            # Non-cumulative here, cumulated when rendered
+            histogram[bisect.bisect_left(buckets, value)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'buckets': list(get_option('BUCKETS')),
+                'counters': [[name, labels, value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, labels, list(values)] for (name, labels), values in self.histograms.items()],
+            }
+
+    def clear(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+registry = Registry()
+# A forked worker starts from zero, its parent keeps reporting its own counts
+os.register_at_fork(after_in_child=registry.clear)
+
+
+def _path(pid=None):
+    return os.path.join(get_option('DIR'), f'metrics-{pid or os.getpid()}.json')
+
+
+def flush():
+    """Write this process' counters for the other workers' ``/metrics``."""
+    if not get_option('DIR'):
+        return
+    registry.flushed_at = time.monotonic()
+    os.makedirs(get_option('DIR'), exist_ok=True)
+    descriptor, tmp = tempfile.mkstemp(dir=get_option('DIR'), suffix='.tmp')
+    with os.fdopen(descriptor, 'w') as f:
+        json.dump(registry.snapshot(), f)
+    os.replace(tmp, _path())
+
+
+def maybe_flush():
+    if get_option('DIR') and time.monotonic() - registry.flushed_at >= get_option('FLUSH_INTERVAL'):
+        flush()
+
+
+atexit.register(flush)
+
+
+def record_cache(cache, hit):
+    registry.inc('cache_requests_total', {'cache': cache, 'result': 'hit' if hit else 'miss'})
+
+
+def collect():
+    """Snapshots of this process and, with ``DIR``, of every other worker."""
+    snapshots = [registry.snapshot()]
+    if get_option('DIR'):
+        own = _path()
+        for path in glob.glob(os.path.join(get_option('DIR'), 'metrics-*.json')):
+            if path == own:
+                continue
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                # Removed or replaced while reading
+                continue
+    return snapshots
+
+
+def _merge(snapshots):
+    counters, histograms = {}, {}
+    buckets = list(get_option('BUCKETS'))
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        if snapshot['buckets'] != buckets:
+            # Written with other BUCKETS, its histograms cannot be added up
+            continue
+        for name, labels, values in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            total = histograms.setdefault(key, [0] * len(values))
+            for i, value in enumerate(values):
+                total[i] += value
+    return counters, histograms, buckets
+
+
+def _labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(snapshots=None):
+    """Text exposition format of the merged snapshots."""
+    counters, histograms, buckets = _merge(collect() if snapshots is None else snapshots)
+
+    lookups = {}
+    for (name, labels), value in counters.items():
+        if name == 'cache_requests_total':
+            labels = dict(labels)
+            hits, total = lookups.get(labels['cache'], (0, 0))
+            lookups[labels['cache']] = (hits + value * (labels['result'] == 'hit'), total + value)
+    gauges = {('cache_hit_ratio', (('cache', cache),)): hits / total for cache, (hits, total) in lookups.items()}
+
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        series = {'counter': counters, 'gauge': gauges, 'histogram': histograms}[kind]
+        samples = sorted((labels, value) for (series_name, labels), value in series.items() if series_name == name)
+        if not samples:
+            continue
+        lines.append(f'# HELP {PREFIX}{name} {help_text}')
+        lines.append(f'# TYPE {PREFIX}{name} {kind}')
+        for labels, value in samples:
+            if kind != 'histogram':
+                lines.append(f'{PREFIX}{name}{_labels(labels)} {_number(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(buckets + ['+Inf'], value[:-2]):
+                cumulative += count
+                lines.append(f'{PREFIX}{name}_bucket{_labels(labels, le=bound)} {cumulative}')
+            lines.append(f'{PREFIX}{name}_sum{_labels(labels)} {_number(value[-2])}')
+            lines.append(f'{PREFIX}{name}_count{_labels(labels)} {value[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+class QueryTimer:
+    """Adds up the queries of one request per alias."""
+
+    def __init__(self):
+        self.queries = {}   # alias -> [count, seconds]
+        self.started = time.perf_counter()
+
+    def add(self, alias, seconds):
+        stats = self.queries.setdefault(alias, [0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+
+
+def _time_query(execute, sql, params, many, context):
+    timer = _timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.add(context['connection'].alias, time.perf_counter() - started)
+
+
+def install(connection, **kwargs):
+    """
+    ``connection_created`` receiver: times the queries of the request in
+    progress. The timer is a context variable, so queries run in other
+    threads for the request (``sync_to_async`` under ASGI) count too.
+    """
+    if _time_query not in connection.execute_wrappers:
+        # First, not last: execute_wrapper() blocks open right now pop the last one on exit
+        connection.execute_wrappers.insert(0, _time_query)
+
+
+def record_request(request, response, timer):
+    elapsed = time.perf_counter() - timer.started
+    match = request.resolver_match
+    route = (match.url_name or match.view_name) if match else '<unmatched>'
+    registry.inc('http_requests_total', {'route': route, 'method': request.method, 'status': response.status_code})
+    registry.observe('http_request_duration_seconds', {'route': route, 'method': request.method}, elapsed)
+    for alias, (count, seconds) in timer.queries.items():
+        registry.inc('db_queries_total', {'route': route, 'alias': alias}, count)
+        registry.inc('db_query_duration_seconds_total', {'route': route, 'alias': alias}, seconds)
+    maybe_flush()
+
+
+def _record(request, response, timer):
+    if not response.streaming:
+        record_request(request, response, timer)
+        return
+    # Streamed bodies run their queries while being sent, in the view's
+    # context (where the timer is set): record when the server closes the
+    # response, after the last chunk or on disconnect
+    response._resource_closers.append(functools.partial(record_request, request, response, timer))
+
+
+class MetricsMiddleware(MiddlewareMixin):
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        token = _timer.set(timer)
+        try:
+            response = self.get_response(request)
+        finally:
+            _timer.reset(token)
+        _record(request, response, timer)
+        return response
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        token = _timer.set(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _timer.reset(token)
+        _record(request, response, timer)
+        return response
+
+
+def _timed(method, phase, cached=None):
+    def timed(self, *args, **kwargs):
+        if cached is not None and hasattr(self, cached):
+            return method(self, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            name = type(self).__name__
+            if hasattr(self, 'child'):
+                name = f'{type(self.child).__name__}(many)'
+            registry.observe('serializer_duration_seconds', {'serializer': name, 'phase': phase},
+                             time.perf_counter() - started)
+    return timed
+
+
+def instrument_serializers():
+    """Time ``is_valid`` and ``.data`` of every serializer.
+
+    Nested serializers run inside their parent's ``to_representation``, so
+    only the outermost one is recorded.
+    """
+    from rest_framework.serializers import BaseSerializer
+    if getattr(BaseSerializer, '_metrics_instrumented', False):
+        return
+    BaseSerializer.is_valid = _timed(BaseSerializer.is_valid, 'validate', cached='_validated_data')
+    BaseSerializer.data = property(_timed(BaseSerializer.data.fget, 'render', cached='_data'))
+    BaseSerializer._metrics_instrumented = True
@@ -0,0 +1,53 @@
+# Generated by Django 4.2 on 2026-10-19 19:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entrega', '0002_alter_category_category_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Watermark',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('position', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'Watermark',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.IntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='entrega.product')),
+                ('related_product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='entrega.product')),
+            ],
+            options={
+                'db_table': 'ProductRecommendation',
+                'ordering': ['product', 'rank'],
+                'unique_together': {('product', 'rank')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductCooccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cooccurrences', to='entrega.product')),
+                ('related_product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='entrega.product')),
+            ],
+            options={
+                'db_table': 'ProductCooccurrence',
+                'unique_together': {('product', 'related_product')},
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2 on 2026-10-19 19:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entrega', '0004_job_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('order_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('order_date', models.DateTimeField(blank=True, null=True)),
+                ('required_date', models.DateTimeField(blank=True, null=True)),
+                ('shipped_date', models.DateTimeField(blank=True, null=True)),
+                ('freight', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('customer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_orders', to='entrega.customer')),
+                ('shipper', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='entrega.shipper')),
+            ],
+            options={
+                'db_table': 'ArchivedOrder',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedOrderdetails',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('unit_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('quantity', models.IntegerField(blank=True, null=True)),
+                ('discount', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='orderdetails_set', to='entrega.archivedorder')),
+                ('product', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='entrega.product')),
+            ],
+            options={
+                'db_table': 'ArchivedOrderDetails',
+            },
+        ),
+    ]
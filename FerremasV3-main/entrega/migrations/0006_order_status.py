@@ -0,0 +1,35 @@
+# Generated by Django 4.2 on 2026-10-19 19:05
+
+from django.db import migrations, models
+
+
+def backfill_shipped(apps, schema_editor):
+    # Until now an order was shipped when shipped_date was set
+    for name in ('Order', 'ArchivedOrder'):
+        model = apps.get_model('entrega', name)
+        model.objects.filter(shipped_date__isnull=False).update(status='shipped')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entrega', '0005_order_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedorder',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('paid', 'Paid'), ('picking', 'Picking'), ('shipped', 'Shipped'), ('delivered', 'Delivered'), ('cancelled', 'Cancelled')], default='pending', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('paid', 'Paid'), ('picking', 'Picking'), ('shipped', 'Shipped'), ('delivered', 'Delivered'), ('cancelled', 'Cancelled')], default='pending', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'order_date'], name='order_status_date_idx'),
+        ),
+        migrations.RunPython(backfill_shipped, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2 on 2026-10-19 20:38
+
+from django.db import migrations, models
+
+
+def backfill_counted(apps, schema_editor):
+    # Until now every order up to the watermark's order_id had been counted
+    watermark = apps.get_model('entrega', 'Watermark').objects.filter(name='recommendations').first()
+    if watermark is None:
+        return
+    for name in ('Order', 'ArchivedOrder'):
+        model = apps.get_model('entrega', name)
+        model.objects.filter(order_id__lte=watermark.position).update(recommendations_counted=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entrega', '0007_revoked_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedorder',
+            name='recommendations_counted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='recommendations_counted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['recommendations_counted', 'order_id'], name='order_reco_pending_idx'),
+        ),
+        migrations.RunPython(backfill_counted, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 
 class CustomUserManager(BaseUserManager):
@@ -92,6 +93,26 @@ class Customer(models.Model):
 
 
 class Order(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('paid', 'Paid'),
+        ('picking', 'Picking'),
+        ('shipped', 'Shipped'),
+        ('delivered', 'Delivered'),
+        ('cancelled', 'Cancelled'),
+    ]
+    # Allowed status changes, anything else is rejected
+    TRANSITIONS = {
+        'pending': ('paid', 'cancelled'),
+        'paid': ('picking', 'shipped', 'cancelled'),
+        'picking': ('shipped', 'cancelled'),
+        'shipped': ('delivered',),
+        'delivered': (),
+        'cancelled': (),
+    }
+    # Orders still holding stock
+    OPEN_STATUSES = ('pending', 'paid', 'picking')
+
     order_id = models.AutoField(primary_key=True)
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, blank=True, null=True)
     order_date = models.DateTimeField(blank=True, null=True)
@@ -99,13 +120,28 @@ class Order(models.Model):
     shipped_date = models.DateTimeField(blank=True, null=True)
     freight = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     shipper = models.ForeignKey('Shipper', on_delete=models.SET_NULL, blank=True, null=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    # Set once the order is in the "bought together" counts (see entrega/recommendations.py)
+    recommendations_counted = models.BooleanField(default=False)
 
     class Meta:
         db_table = 'Order'
+        indexes = [
+            models.Index(fields=['status', 'order_date'], name='order_status_date_idx'),
+            models.Index(fields=['recommendations_counted', 'order_id'], name='order_reco_pending_idx'),
+        ]
 
     def __str__(self):
         return f"Order #{self.order_id}"
 
+    def can_transition_to(self, status):
+        return status in self.TRANSITIONS.get(self.status, ())
+
+    @classmethod
+    def statuses_before(cls, status):
+        """Statuses from which ``status`` can be reached in one step."""
+        return [current for current, targets in cls.TRANSITIONS.items() if status in targets]
+
 
 class Orderdetails(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, blank=True, null=True)
@@ -177,3 +213,115 @@ class Supplier(models.Model):
 
     def __str__(self):
         return self.contact_name or "Unnamed Supplier"
+
+
+class Watermark(models.Model):
+    name = models.CharField(max_length=100, primary_key=True)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'Watermark'
+
+    def __str__(self):
+        return f"{self.name}: {self.position}"
+
+
+class ProductCooccurrence(models.Model):
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='cooccurrences')
+    related_product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='+')
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'ProductCooccurrence'
+        unique_together = ('product', 'related_product')
+
+
+class ProductRecommendation(models.Model):
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='recommendations')
+    related_product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'ProductRecommendation'
+        unique_together = ('product', 'rank')
+        ordering = ['product', 'rank']
+
+
+class Job(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    job_id = models.BigAutoField(primary_key=True)
+    job_type = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=64, blank=True, null=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'Job'
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),
+            models.Index(fields=['status', 'job_type', 'run_after'], name='job_status_type_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job #{self.job_id} ({self.job_type}, {self.status})"
+
+
+class ArchivedOrder(models.Model):
+    order_id = models.IntegerField(primary_key=True)
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, blank=True, null=True, related_name='archived_orders')
+    order_date = models.DateTimeField(blank=True, null=True)
+    required_date = models.DateTimeField(blank=True, null=True)
+    shipped_date = models.DateTimeField(blank=True, null=True)
+    freight = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    shipper = models.ForeignKey(Shipper, on_delete=models.SET_NULL, blank=True, null=True, related_name='+')
+    status = models.CharField(max_length=10, choices=Order.STATUS_CHOICES, default='pending')
+    recommendations_counted = models.BooleanField(default=False)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'ArchivedOrder'
+
+    def __str__(self):
+        return f"Archived order #{self.order_id}"
+
+
+class ArchivedOrderdetails(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    # Same accessor as Orderdetails so OrderSerializer works on archived orders
+    order = models.ForeignKey(ArchivedOrder, on_delete=models.CASCADE, related_name='orderdetails_set')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, blank=True, null=True, related_name='+')
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    quantity = models.IntegerField(blank=True, null=True)
+    discount = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
+
+    class Meta:
+        db_table = 'ArchivedOrderDetails'
+
+
+class RevokedToken(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    # Either a single token (jti) or every token of a user issued before revoked_at
+    jti = models.CharField(max_length=255, unique=True, blank=True, null=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True, related_name='+')
+    revoked_at = models.DateTimeField(default=timezone.now, db_index=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'RevokedToken'
+
+    def __str__(self):
+        return f"Revoked {self.jti or f'user {self.user_id}'}"
@@ -0,0 +1,244 @@
+"""
+On-demand profiling of single requests.
+
+An employee gets a signed, single-use token from ``api/profiling/token/``
+and sends it in the ``X-Profile`` header of the request to profile (with
+whatever credentials that request needs, e.g. a customer's for checkout).
+``ProfilingMiddleware`` then runs the request under:
+
+- ``cProfile`` (``X-Profile-Format: pstats``, the default), saved as a
+  ``.pstats`` file for ``python -m pstats`` or snakeviz, or
+- a stack sampler (``X-Profile-Format: collapsed``) taking the request
+  thread's stack every ``SAMPLE_INTERVAL`` seconds, saved in the collapsed
+  format of flamegraph.pl / speedscope.
+
+Profiles go to ``PROFILING['DIR']`` next to a ``.json`` file with the
+route, status and timing, and the response carries ``X-Profile-Id``.
+A streaming body is read whole while profiling, so the profile covers
+the queries and serialization of every page; that one response is then
+held in memory and sent once read.
+Requests without the header only pay for a dictionary lookup.
+
+Tokens are spent in ``PROFILING['CACHE']``, which must be shared by every
+process (Redis, Memcached, database or file cache): with a per-process
+cache (LocMem, dummy) a token would be single-use in each worker, so
+profiling is refused unless ``DEBUG`` is on. A token also stops working
+once its employee is deactivated, demoted or has their JWTs revoked.
+"""
+import collections
+import cProfile
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework_simplejwt.settings import api_settings
+
+from . import revocation
+from .models import User
+
+DEFAULTS = {
+    'DIR': None,
+    'TOKEN_MAX_AGE': 600,
+    'SAMPLE_INTERVAL': 0.001,
+    'CACHE': 'default',
+}
+
+HEADER = 'X-Profile'
+FORMAT_HEADER = 'X-Profile-Format'
+FORMATS = ('pstats', 'collapsed')
+_SALT = 'entrega.profiling'
+_PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+logger = logging.getLogger(__name__)
+
+
+def get_option(name):
+    return getattr(settings, 'PROFILING', {}).get(name, DEFAULTS[name])
+
+
+def profile_dir():
+    return str(get_option('DIR') or os.path.join(settings.BASE_DIR, 'profiles'))
+
+
+def available():
+    """Whether tokens can be single-use: the cache is shared, or ``DEBUG`` is on."""
+    backend = settings.CACHES[get_option('CACHE')]['BACKEND']
+    return settings.DEBUG or backend not in _PER_PROCESS_CACHES
+
+
+def issue_token(user):
+    """Signed token allowing one profiled request within ``TOKEN_MAX_AGE``."""
+    return signing.dumps({'user': user.pk, 'iat': int(time.time()), 'nonce': uuid.uuid4().hex}, salt=_SALT)
+
+
+def _issuer_allowed(payload):
+    # Same cutoff as the issuer's JWTs: revoked with them, e.g. on deactivation
+    if revocation.is_revoked({api_settings.USER_ID_CLAIM: payload['user'], 'iat': payload.get('iat', 0)}):
+        return False
+    return User.objects.filter(pk=payload['user'], is_active=True, user_type='employee').exists()
+
+
+def redeem_token(token):
+    """Payload of a valid token not used before, or None."""
+    if not available():
+        logger.warning("Profiling token ignored: PROFILING['CACHE'] is per process, tokens would not be single-use")
+        return None
+    try:
+        payload = signing.loads(token, salt=_SALT, max_age=get_option('TOKEN_MAX_AGE'))
+    except signing.BadSignature:
+        return None
+    if not _issuer_allowed(payload):
+        return None
+    # add() is a no-op for a key already there: the token is spent
+    used = caches[get_option('CACHE')].add(f"profile-token:{payload['nonce']}", True, get_option('TOKEN_MAX_AGE'))
+    return payload if used else None
+
+
+class StackSampler:
+    """Counts the stacks of one thread, sampled from a background thread."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def enable(self):
+        self._thread.start()
+
+    def disable(self):
+        self._stop.set()
+        self._thread.join()
+
+    def dump_stats(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+def save(profiler, fmt, request, response, elapsed, payload):
+    """Write the profile and its metadata, returns the profile id."""
+    match = request.resolver_match
+    route = (match.url_name or match.view_name) if match else 'unmatched'
+    profile_id = f"{datetime.now(dt_timezone.utc):%Y%m%dT%H%M%S}-{route}-{elapsed * 1000:.0f}ms-{uuid.uuid4().hex[:6]}"
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    profiler.dump_stats(os.path.join(directory, f'{profile_id}.{fmt}'))
+    with open(os.path.join(directory, f'{profile_id}.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'id': profile_id,
+            'format': fmt,
+            'route': route,
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'duration_ms': round(elapsed * 1000, 3),
+            'requested_by': payload['user'],
+            'created': datetime.now(dt_timezone.utc).isoformat(),
+        }, f, indent=2)
+    return profile_id
+
+
+def list_profiles():
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if name.endswith('.json'):
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                profiles.append(json.load(f))
+    return profiles
+
+
+def _redeem(request):
+    """``(payload, format)`` when the request asks for a valid profile, else None."""
+    payload = redeem_token(request.headers[HEADER])
+    fmt = request.headers.get(FORMAT_HEADER, FORMATS[0])
+    if payload is None or fmt not in FORMATS:
+        # Not an error for the request itself: serve it unprofiled
+        return None
+    return payload, fmt
+
+
+async def _replay(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def read_stream(response):
+    """Read a streaming body in this thread and put it back, already read."""
+    if not response.is_async:
+        response.streaming_content = list(response.streaming_content)
+        return
+
+    async def read():
+        return [chunk async for chunk in response.streaming_content]
+
+    # Under ASGI the pages' sync_to_async calls come back to this thread
+    response.streaming_content = _replay(async_to_sync(read)())
+
+
+class ProfilingMiddleware(MiddlewareMixin):
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if HEADER not in request.headers:
+            return self.get_response(request)
+        profile = _redeem(request)
+        if profile is None:
+            return self.get_response(request)
+        return self.profile(request, *profile, self.get_response)
+
+    async def __acall__(self, request):
+        if HEADER not in request.headers:
+            return await self.get_response(request)
+        profile = await sync_to_async(_redeem)(request)
+        if profile is None:
+            return await self.get_response(request)
+        # Both profilers follow one thread: run the rest of the chain from a
+        # worker thread, where the view's sync_to_async calls (ORM, serializers,
+        # rendering) also run
+        return await sync_to_async(self.profile)(request, *profile, async_to_sync(self.get_response))
+
+    def profile(self, request, payload, fmt, get_response):
+        if fmt == 'pstats':
+            profiler = cProfile.Profile()
+        else:
+            profiler = StackSampler(threading.get_ident(), get_option('SAMPLE_INTERVAL'))
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = get_response(request)
+            if response.streaming:
+                read_stream(response)
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - started
+        response['X-Profile-Id'] = save(profiler, fmt, request, response, elapsed, payload)
+        return response
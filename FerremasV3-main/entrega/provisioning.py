@@ -0,0 +1,149 @@
+"""
+Bulk user provisioning (``manage.py import_users`` and the bulk register
+endpoint).
+
+Passwords are hashed in a thread pool, since PBKDF2 dominates the cost
+of creating a user (``hashlib`` releases the GIL while hashing, so the
+threads use every CPU), then ``User`` rows and their ``Customer`` / ``Supplier``
+profile (same rule as ``UserRegistrationSerializer``) are inserted with
+``bulk_create``. Initial tokens are minted from the ids already in memory.
+
+The pool is a thread pool, not a process pool, because the bulk register
+endpoint hashes inside web workers that already run threads (the login
+pool, the server's own), and forking such a process can deadlock the
+child. It is separate from the login pool so a bulk import does not hold
+up logins, and shared by concurrent imports in the process.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from .authentication import tokens_for_user
+from .models import Customer, Supplier, User
+
+DEFAULTS = {
+    'HASH_WORKERS': None,     # None uses every CPU
+    'BATCH_SIZE': 500,        # rows per INSERT / IN (...) lookup
+    'MAX_USERS': 1000,        # per request on the bulk register endpoint
+}
+
+
+def get_option(name):
+    return getattr(settings, 'PROVISIONING', {}).get(name, DEFAULTS[name])
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _reset_pool():
+    global _pool, _pool_lock
+    _pool, _pool_lock = None, threading.Lock()
+
+
+# Threads do not survive fork: a child builds its own pool
+os.register_at_fork(after_in_child=_reset_pool)
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = get_option('HASH_WORKERS') or os.cpu_count() or 1
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='provisioning-hash')
+        return _pool
+
+
+def hash_passwords(passwords, workers=None):
+    """Hash ``passwords`` in the hashing thread pool, keeping their order."""
+    if workers == 1 or len(passwords) <= 1:
+        return [make_password(password) for password in passwords]
+    if workers:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='provisioning-hash') as pool:
+            return list(pool.map(make_password, passwords))
+    return list(_get_pool().map(make_password, passwords))
+
+
+def username_conflicts(usernames, batch_size=None):
+    """Usernames repeated in ``usernames`` or already taken."""
+    batch_size = batch_size or get_option('BATCH_SIZE')
+    seen, conflicts = set(), set()
+    for username in usernames:
+        (conflicts if username in seen else seen).add(username)
+    for chunk in _chunks(sorted(seen), batch_size):
+        conflicts.update(User.objects.filter(username__in=chunk).values_list('username', flat=True))
+    return conflicts
+
+
+def _load_pks(instances, key, batch_size):
+    # MySQL cannot return ids from a bulk INSERT: read them back by a unique column
+    if not instances or instances[0].pk is not None:
+        return
+    model = type(instances[0])
+    for chunk in _chunks(instances, batch_size):
+        pks = dict(
+            model.objects.filter(**{f'{key}__in': [getattr(obj, key) for obj in chunk]}).values_list(key, 'pk')
+        )
+        for obj in chunk:
+            obj.pk = pks[getattr(obj, key)]
+
+
+def create_users(rows, hashed_passwords, user_type='customer', batch_size=None):
+    """
+    Insert users from validated ``rows`` (username, email, first_name,
+    last_name) and already hashed passwords, with their profile.
+    """
+    batch_size = batch_size or get_option('BATCH_SIZE')
+    users = [
+        User(
+            username=row['username'],
+            email=User.objects.normalize_email(row.get('email')),
+            first_name=row.get('first_name', ''),
+            last_name=row.get('last_name', ''),
+            user_type=user_type,
+            password=hashed,
+        )
+        for row, hashed in zip(rows, hashed_passwords)
+    ]
+    with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=batch_size)
+        _load_pks(users, 'username', batch_size)
+
+        # Assigning profile.user also caches the profile on the user
+        if user_type == 'customer':
+            profile_model = Customer
+            profiles = [
+                Customer(user=user, contact_name=user.first_name, last_name=user.last_name) for user in users
+            ]
+        else:
+            profile_model = Supplier
+            profiles = [Supplier(user=user, contact_name=user.first_name) for user in users]
+        profile_model.objects.bulk_create(profiles, batch_size=batch_size)
+        _load_pks(profiles, 'user_id', batch_size)
+    return users
+
+
+def provision_users(rows, user_type='customer', workers=None, batch_size=None):
+    hashed = hash_passwords([row['password'] for row in rows], workers)
+    return create_users(rows, hashed, user_type, batch_size)
+
+
+def mint_tokens(users):
+    """Initial token pair per user, without querying the profiles again."""
+    tokens = {}
+    for user in users:
+        if user.user_type == 'customer':
+            profile_ids = {'customer_id': user.customer.pk}
+        else:
+            profile_ids = {'supplier_id': user.supplier.pk}
+        tokens[user.username] = tokens_for_user(user, **profile_ids)
+    return tokens
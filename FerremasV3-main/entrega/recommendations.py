@@ -0,0 +1,146 @@
+"""
+"Frequently bought together" recommendations.
+
+Pair counts between products bought in the same order are kept in
+``ProductCooccurrence`` (a sparse co-occurrence matrix) and the best
+``RECOMMENDATIONS_TOP_N`` neighbours of each product are materialized in
+``ProductRecommendation`` so the product detail endpoint only needs one
+indexed lookup.
+
+Orders are consumed incrementally: each one is flagged
+``recommendations_counted`` in the transaction that counts it, so an order
+committed after a newer one is still picked up by the next refresh
+(a highest-id watermark would skip it for good). Archived orders count
+too, whether they were counted before being archived or not.
+"""
+from collections import Counter
+from itertools import combinations, groupby
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import (
+    ArchivedOrder, ArchivedOrderdetails, Order, Orderdetails, ProductCooccurrence, ProductRecommendation,
+    Watermark,
+)
+
+# Row locked by refreshes and archive batches (see lock())
+WATERMARK_NAME = 'recommendations'
+
+SOURCES = ((Order, Orderdetails), (ArchivedOrder, ArchivedOrderdetails))
+
+
+def get_top_n():
+    return getattr(settings, 'RECOMMENDATIONS_TOP_N', 10)
+
+
+def _count_pairs(rows):
+    # rows are (order_id, product_id) tuples sorted by order_id
+    pairs = Counter()
+    for _, group in groupby(rows, key=lambda row: row[0]):
+        products = sorted({product_id for _, product_id in group})
+        for a, b in combinations(products, 2):
+            pairs[(a, b)] += 1
+            pairs[(b, a)] += 1
+    return pairs
+
+
+def _merge_pairs(pairs, batch_size):
+    affected = {product_id for product_id, _ in pairs}
+    existing = {
+        (row.product_id, row.related_product_id): row
+        for row in ProductCooccurrence.objects.filter(product_id__in=affected)
+    }
+    to_update, to_create = [], []
+    for (product_id, related_id), count in pairs.items():
+        row = existing.get((product_id, related_id))
+        if row:
+            row.count += count
+            to_update.append(row)
+        else:
+            to_create.append(ProductCooccurrence(
+                product_id=product_id, related_product_id=related_id, count=count
+            ))
+    ProductCooccurrence.objects.bulk_update(to_update, ['count'], batch_size=batch_size)
+    ProductCooccurrence.objects.bulk_create(to_create, batch_size=batch_size)
+    return affected
+
+
+def _rebuild_top_n(product_ids, top_n, batch_size):
+    product_ids = sorted(product_ids)
+    for start in range(0, len(product_ids), batch_size):
+        chunk = product_ids[start:start + batch_size]
+        rows = (
+            ProductCooccurrence.objects
+            .filter(product_id__in=chunk)
+            .order_by('product_id', '-count', 'related_product_id')
+            .values_list('product_id', 'related_product_id', 'count')
+        )
+        recommendations = []
+        for product_id, group in groupby(rows, key=lambda row: row[0]):
+            for rank, (_, related_id, count) in enumerate(group, start=1):
+                if rank > top_n:
+                    break
+                recommendations.append(ProductRecommendation(
+                    product_id=product_id, related_product_id=related_id, rank=rank, score=count
+                ))
+        ProductRecommendation.objects.filter(product_id__in=chunk).delete()
+        ProductRecommendation.objects.bulk_create(recommendations, batch_size=batch_size)
+
+
+def lock():
+    """
+    Serialize with refreshes for the rest of the transaction: taken by
+    refreshes and by ``archive_orders``, so an order is never moved to the
+    archive between being counted and being flagged (it would be counted
+    twice).
+    """
+    Watermark.objects.select_for_update().get_or_create(name=WATERMARK_NAME)
+
+
+def _count_orders(order_model, detail_model, full, batch_size):
+    """Fold one table's uncounted (or, with ``full``, all) orders in; returns (orders, affected)."""
+    pending = order_model.objects.order_by('order_id')
+    if not full:
+        pending = pending.filter(recommendations_counted=False)
+    orders, affected, last = 0, set(), 0
+    while True:
+        ids = list(pending.filter(order_id__gt=last).values_list('order_id', flat=True)[:batch_size])
+        if not ids:
+            return orders, affected
+        rows = list(
+            detail_model.objects
+            .filter(order_id__in=ids, product__isnull=False)
+            .order_by('order_id')
+            .values_list('order_id', 'product_id')
+        )
+        orders += len({order_id for order_id, _ in rows})
+        pairs = _count_pairs(rows)
+        if pairs:
+            affected |= _merge_pairs(pairs, batch_size)
+        order_model.objects.filter(order_id__in=ids).update(recommendations_counted=True)
+        last = ids[-1]
+
+
+def refresh_recommendations(full=False, top_n=None, batch_size=1000):
+    """
+    Fold orders not counted yet, hot and archived, into the co-occurrence
+    matrix and rebuild the top-N table for the products they touched.
+    ``full`` drops everything and recounts every order, archived ones
+    included. Returns a dict with the orders counted and affected products.
+    """
+    top_n = top_n or get_top_n()
+    with transaction.atomic():
+        lock()
+        if full:
+            ProductCooccurrence.objects.all().delete()
+            ProductRecommendation.objects.all().delete()
+
+        orders, affected = 0, set()
+        for order_model, detail_model in SOURCES:
+            counted, products = _count_orders(order_model, detail_model, full, batch_size)
+            orders += counted
+            affected |= products
+        _rebuild_top_n(affected, top_n, batch_size)
+
+    return {'orders': orders, 'products': len(affected)}
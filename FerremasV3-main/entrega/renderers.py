@@ -0,0 +1,97 @@
+"""
+JSON renderer and parser backed by orjson, for ``REST_FRAMEWORK``::
+
+    'DEFAULT_RENDERER_CLASSES': ('entrega.renderers.FastJSONRenderer', ...),
+    'DEFAULT_PARSER_CLASSES': ('entrega.renderers.FastJSONParser', ...),
+
+The output is that of DRF's ``JSONRenderer``: orjson writes the same
+compact UTF-8 JSON, and the types it would format differently
+(``Decimal``, ``datetime``, ``date``, ``time``, lazy strings) go through
+DRF's own ``JSONEncoder.default``. Data orjson refuses (integers over 64
+bits, non-string keys), Decimals that become floats written with an
+exponent, and indented output (browsable API,
+``Accept: application/json; indent=4``) are rendered by ``JSONRenderer``
+itself. Likewise the parser leaves bodies with numbers of 19 digits or
+more, and invalid ones, to the stdlib parser. Without orjson installed
+both classes are plain ``JSONRenderer`` / ``JSONParser``.
+
+Two differences remain for ``float`` values in the data (serializers
+here return Decimals as strings, so API responses have none):
+
+- Below 1e-4 or from 1e16 up, json writes ``1e-05`` / ``1e+16`` and
+  orjson ``0.00001`` / ``1e16``. These are the same numbers written
+  differently. Catching them would mean scanning the whole output,
+  which costs more than the rendering itself.
+- With ``STRICT_JSON`` (the default), DRF raises on NaN and infinity,
+  while orjson writes ``null``.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import json
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib encoder
+    orjson = None
+
+if orjson is not None:
+    # Only str, int, float, bool, None, dict and list are left to orjson
+    _OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    _encoder_default = JSONEncoder().default
+
+
+def _default(obj):
+    value = _encoder_default(obj)
+    # Decimals become floats: only those json writes without an exponent
+    # are written the same by orjson, the rest make it fall back
+    if isinstance(value, float) and value and not 1e-4 <= abs(value) < 1e16:
+        raise TypeError('float written with an exponent')
+    return value
+
+# orjson reads integers over 64 bits as floats, json keeps them exact. Digits
+# become b'0' and the rest b' ', then a plain substring search finds any run
+# of 19 digits (a regex is slower than parsing the body)
+_DIGITS = bytes(ord('0') if ord('0') <= i <= ord('9') else ord(' ') for i in range(256))
+_LONG_NUMBER = b'0' * 19
+_LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped like JSONRenderer, so the output stays valid JavaScript
+        if b'\xe2\x80' in ret:
+            for separator, escaped in _LINE_SEPARATORS:
+                ret = ret.replace(separator, escaped)
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if _LONG_NUMBER not in body.translate(_DIGITS):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        # Same result or error message as JSONParser
+        try:
+            return json.loads(body.decode(encoding), parse_constant=json.strict_constant)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
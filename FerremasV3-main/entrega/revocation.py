@@ -0,0 +1,202 @@
+"""
+JWT revocation (logout and forced revocation).
+
+Revocations are persisted in ``RevokedToken`` and mirrored in a
+per-process ``RevocationFilter``: a dict of revoked ``jti`` and a dict of
+per-user cutoffs (every token of that user issued before the cutoff is
+revoked). A daemon thread folds in rows newer than its watermark every
+``JWT_REVOCATION['SYNC_INTERVAL']`` seconds, so the authentication path
+only does in-memory lookups.
+"""
+import logging
+import os
+import threading
+import time
+from functools import partial
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import RevokedToken, User
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'SYNC_INTERVAL': 5,   # seconds between incremental syncs, 0 disables the thread
+    'OVERLAP': 30,        # seconds re-read behind the watermark (commit lag, clock skew)
+}
+
+
+def get_option(name):
+    return getattr(settings, 'JWT_REVOCATION', {}).get(name, DEFAULTS[name])
+
+
+class RevocationFilter:
+    def __init__(self):
+        self.jtis = {}        # jti -> expiry (unix time)
+        self.users = {}       # user_id -> cutoff (unix time)
+        self.watermark = None
+        self._lock = threading.Lock()          # writers: add() and sync()
+        self._start_lock = threading.Lock()
+        self._started = False
+
+    def is_revoked(self, token):
+        if not self._started:
+            self.start()
+        if token.get('jti') in self.jtis:
+            return True
+        cutoff = self.users.get(token.get(api_settings.USER_ID_CLAIM))
+        return cutoff is not None and token.get('iat', 0) < cutoff
+
+    def add(self, jti, user_id, revoked_at, expires_at):
+        with self._lock:
+            self._add(jti, user_id, revoked_at, expires_at)
+
+    def _add(self, jti, user_id, revoked_at, expires_at):
+        if jti:
+            self.jtis[jti] = expires_at.timestamp()
+        elif user_id is not None:
+            # iat is in whole seconds: a token issued later in the same second stays valid
+            cutoff = int(revoked_at.timestamp())
+            self.users[user_id] = max(self.users.get(user_id, 0), cutoff)
+
+    def sync(self):
+        """Fold in revocations newer than the watermark and drop expired ones."""
+        now = timezone.now()
+        rows = RevokedToken.objects.filter(expires_at__gt=now)
+        if self.watermark is not None:
+            rows = rows.filter(revoked_at__gte=self.watermark - timedelta(seconds=get_option('OVERLAP')))
+        rows = list(rows.values_list('jti', 'user_id', 'revoked_at', 'expires_at'))
+
+        with self._lock:
+            for row in rows:
+                self._add(*row)
+            self.watermark = now
+            # Dicts are swapped, not mutated, so readers never see a resize
+            horizon = now.timestamp()
+            self.jtis = {jti: exp for jti, exp in self.jtis.items() if exp > horizon}
+            user_horizon = horizon - api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+            self.users = {user: cutoff for user, cutoff in self.users.items() if cutoff > user_horizon}
+
+    def start(self):
+        with self._start_lock:
+            if self._started:
+                return
+            # Initial full load happens once per process
+            self.sync()
+            interval = get_option('SYNC_INTERVAL')
+            if interval:
+                threading.Thread(
+                    target=self._run, args=(interval,), name='jwt-revocation-sync', daemon=True
+                ).start()
+            self._started = True
+
+    def reset(self):
+        self.jtis, self.users, self.watermark = {}, {}, None
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._started = False
+
+    def _run(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.sync()
+            except Exception:
+                logger.warning("JWT revocation sync failed", exc_info=True)
+            finally:
+                connection.close()
+
+
+_filter = RevocationFilter()
+# Threads do not survive fork (e.g. gunicorn --preload): start over in the child
+os.register_at_fork(after_in_child=_filter.reset)
+
+
+def start():
+    """Load the revocations now (does nothing once loaded)."""
+    _filter.start()
+
+
+def is_started():
+    return _filter._started
+
+
+def is_revoked(token):
+    return _filter.is_revoked(token)
+
+
+def revoke(token):
+    """Revoke a single validated token (access or refresh) until it expires."""
+    expires_at = datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc)
+    if expires_at <= timezone.now():
+        return
+    revoked, _ = RevokedToken.objects.get_or_create(
+        jti=token['jti'],
+        defaults={'user_id': token.get(api_settings.USER_ID_CLAIM), 'expires_at': expires_at},
+    )
+    _filter.add(revoked.jti, revoked.user_id, revoked.revoked_at, revoked.expires_at)
+
+
+def revoke_user(user_id):
+    """
+    Revoke every token issued to ``user_id`` before the current second
+    (``iat`` has a one second resolution).
+    """
+    now = timezone.now()
+    revoked = RevokedToken.objects.create(
+        user_id=user_id, revoked_at=now, expires_at=now + api_settings.REFRESH_TOKEN_LIFETIME
+    )
+    _filter.add(None, revoked.user_id, revoked.revoked_at, revoked.expires_at)
+
+
+def _revoke_existing(user_id):
+    # Profiles are also deleted along with their user, whose tokens go with it
+    if User.objects.filter(pk=user_id).exists():
+        revoke_user(user_id)
+
+
+def revoke_changed_user(sender, instance, update_fields=None, **kwargs):
+    """
+    ``pre_save`` handler for ``User``: claims-authenticated requests never
+    load the user, so deactivating a user or changing their ``user_type``
+    revokes every token issued to them (they log in again to get the new
+    claims). ``QuerySet.update`` sends no signal; call ``revoke_user`` after
+    a bulk change.
+    """
+    if instance.pk is None:
+        return
+    if update_fields is not None and not {'is_active', 'user_type'} & set(update_fields):
+        return
+    stored = sender.objects.filter(pk=instance.pk).values('is_active', 'user_type').first()
+    if stored is None:
+        return
+    if (stored['is_active'] and not instance.is_active) or stored['user_type'] != instance.user_type:
+        transaction.on_commit(partial(revoke_user, instance.pk))
+
+
+def revoke_changed_profile(sender, instance, **kwargs):
+    """
+    ``pre_save`` handler for ``Customer`` and ``Supplier``: moving a profile
+    to another user revokes the tokens of the user it leaves, which carry
+    its id. A new profile revokes nothing: older tokens just lack its id.
+    """
+    if instance.pk is None:
+        return
+    user_id = sender.objects.filter(pk=instance.pk).values_list('user_id', flat=True).first()
+    if user_id is not None and user_id != instance.user_id:
+        transaction.on_commit(partial(revoke_user, user_id))
+
+
+def revoke_deleted_profile(sender, instance, **kwargs):
+    """``post_delete`` handler for ``Customer`` and ``Supplier``."""
+    if instance.user_id is not None:
+        transaction.on_commit(partial(_revoke_existing, instance.user_id))
+
+
+def purge_expired():
+    deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
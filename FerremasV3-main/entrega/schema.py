@@ -0,0 +1,113 @@
+"""
+OpenAPI schema, generated once instead of on every documentation hit.
+
+drf_yasg introspects every view and ``swagger_auto_schema`` each time a
+schema view is requested. Here the schema is generated at build time by
+``python manage.py build_schema``, which writes ``schema-<version>.json``
+and ``.yaml`` to ``OPENAPI_SCHEMA['ARTIFACT_DIR']``, or otherwise on the
+first request of each process. Both the documents and the Swagger object
+used by the Swagger UI / ReDoc pages are then kept in memory.
+
+The schema is public and does not depend on the request, so one copy
+serves every client. Rebuild the artifact whenever the endpoints change.
+"""
+import hashlib
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+from .metrics import record_cache
+
+DEFAULTS = {
+    'ARTIFACT_DIR': None,
+    'USE_ARTIFACT': True,
+}
+
+VERSION = 'v1'
+
+INFO = openapi.Info(
+    title="API de Integración",
+    default_version=VERSION,
+    description="Documentación de la API de Integración",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="soporte@example.com"),
+    license=openapi.License(name="MIT License"),
+)
+
+CODECS = {
+    'json': OpenAPICodecJson,
+    'yaml': OpenAPICodecYaml,
+}
+
+_lock = threading.RLock()
+_cache = {}
+
+
+def get_option(name):
+    return getattr(settings, 'OPENAPI_SCHEMA', {}).get(name, DEFAULTS[name])
+
+
+def generate_schema():
+    """Introspect the API (the expensive part), all endpoints included."""
+    return OpenAPISchemaGenerator(INFO).get_schema(request=None, public=True)
+
+
+def encode(schema, fmt):
+    return CODECS[fmt](validators=[]).encode(schema)
+
+
+def artifact_path(fmt):
+    directory = get_option('ARTIFACT_DIR')
+    if directory is None:
+        return None
+    return Path(directory) / f'schema-{VERSION}.{fmt}'
+
+
+def write_artifacts():
+    """Generate the schema and write one file per format, returns their paths."""
+    schema = generate_schema()
+    paths = []
+    for fmt in CODECS:
+        path = artifact_path(fmt)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(encode(schema, fmt))
+        paths.append(path)
+    return paths
+
+
+def get_schema():
+    """The Swagger object of this process, generated on first use."""
+    with _lock:
+        if 'schema' not in _cache:
+            _cache['schema'] = generate_schema()
+        return _cache['schema']
+
+
+def get_document(fmt):
+    """``(content, etag)`` of the schema encoded as ``fmt``, from the artifact when there is one."""
+    with _lock:
+        record_cache('openapi_schema', fmt in _cache)
+        if fmt not in _cache:
+            path = artifact_path(fmt)
+            if get_option('USE_ARTIFACT') and path is not None and path.exists():
+                content = path.read_bytes()
+            else:
+                content = encode(get_schema(), fmt)
+            _cache[fmt] = (content, '"%s"' % hashlib.sha256(content).hexdigest()[:32])
+        return _cache[fmt]
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+
+
+class PrecomputedSchemaGenerator(OpenAPISchemaGenerator):
+    """Hands the in-memory schema to drf_yasg's Swagger UI and ReDoc views."""
+
+    def get_schema(self, request=None, public=False):
+        return get_schema()
@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.utils import timezone
 from .models import *
+from . import provisioning
 
 # User Registration and Authentication Serializers
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -37,6 +39,33 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         
         return user
 
+class BulkUserItemSerializer(serializers.Serializer):
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    email = serializers.EmailField(required=False, allow_blank=True, default='')
+    password = serializers.CharField(write_only=True, validators=[validate_password])
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True, default='')
+
+class BulkUserRegistrationSerializer(serializers.Serializer):
+    user_type = serializers.ChoiceField(choices=User.USER_TYPE_CHOICES, default='customer')
+    users = BulkUserItemSerializer(many=True, allow_empty=False)
+    tokens = serializers.BooleanField(default=False)
+    
+    def validate_users(self, users):
+        max_users = provisioning.get_option('MAX_USERS')
+        if len(users) > max_users:
+            raise serializers.ValidationError(f"At most {max_users} users per request")
+        return users
+    
+    def validate(self, attrs):
+        # One IN (...) query for the whole batch instead of a unique check per user
+        conflicts = provisioning.username_conflicts([user['username'] for user in attrs['users']])
+        if conflicts:
+            raise serializers.ValidationError(
+                {'users': f"Usernames repeated or already taken: {', '.join(sorted(conflicts))}"}
+            )
+        return attrs
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -58,6 +87,16 @@ class ProductSerializer(serializers.ModelSerializer):
         model = Product
         fields = '__all__'
 
+class RelatedProductSerializer(serializers.ModelSerializer):
+    product_id = serializers.IntegerField(source='related_product.product_id', read_only=True)
+    product_name = serializers.CharField(source='related_product.product_name', read_only=True)
+    unit_price = serializers.DecimalField(source='related_product.unit_price', max_digits=10, decimal_places=2, read_only=True)
+    picture = serializers.CharField(source='related_product.picture', read_only=True)
+
+    class Meta:
+        model = ProductRecommendation
+        fields = ('product_id', 'product_name', 'unit_price', 'picture', 'score')
+
 class ProductCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Product
@@ -137,6 +176,8 @@ class OrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = '__all__'
+        # Status only changes through OrderStatusView transitions
+        read_only_fields = ('status',)
 
 class OrderCreateSerializer(serializers.ModelSerializer):
     order_details = serializers.ListField(child=serializers.DictField(), write_only=True)
@@ -149,9 +190,9 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         order_details_data = validated_data.pop('order_details')
         customer = self.context['request'].user.customer
         
-        # Create order
+        # Create order (by id: a claims user's customer only carries its pk)
         order = Order.objects.create(
-            customer=customer,
+            customer_id=customer.pk,
             order_date=timezone.now(),
             **validated_data
         )
@@ -165,6 +206,14 @@ class OrderCreateSerializer(serializers.ModelSerializer):
         
         return order
 
+class BulkShipSerializer(serializers.Serializer):
+    order_ids = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=5000)
+    shipper = serializers.PrimaryKeyRelatedField(queryset=Shipper.objects.all())
+    shipped_date = serializers.DateTimeField(required=False)
+
+class OrderStatusSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES)
+
 # Billing Info Serializers
 class BillingInfoSerializer(serializers.ModelSerializer):
     class Meta:
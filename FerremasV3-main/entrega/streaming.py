@@ -0,0 +1,115 @@
+"""
+Streaming JSON arrays for "everything" list endpoints (every order, every
+customer).
+
+``StreamingJSONResponse(queryset, serializer_class)`` reads the queryset in
+pages of ``STREAMING['CHUNK_SIZE']`` rows by primary key (``pk > last``
+ordered by pk, the same order as an unordered queryset here), serializes
+each page with ``serializer_class(page, many=True)`` and sends its rows
+while the next page is read. Peak memory is one page of model instances
+and their JSON, whatever the size of the table; ``select_related`` and
+``prefetch_related`` on the queryset apply page by page.
+
+The body is byte for byte what ``FastJSONRenderer`` gives for the whole
+list (see ``entrega.renderers`` for how that compares with DRF's
+``JSONRenderer``). Pages are separate queries, so rows written while a
+long stream is being sent may or may not be in it. The pages are read in
+the context (replica routing, slow query tags) of the view that created
+the response.
+
+Pass the view's ``request``: under ASGI the body is then an async
+iterator reading one page per ``sync_to_async`` call, since Django reads
+a sync iterator into a list before sending any of it there. APIViews
+stream only when ``streams(request)``: other negotiated formats (the
+browsable API) go through the usual DRF ``Response``.
+"""
+import contextvars
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+from .renderers import FastJSONRenderer
+
+DEFAULTS = {
+    'CHUNK_SIZE': 500,
+}
+
+
+def get_option(name):
+    return getattr(settings, 'STREAMING', {}).get(name, DEFAULTS[name])
+
+
+def pages(queryset, chunk_size):
+    """``queryset`` in lists of at most ``chunk_size`` instances, by primary key."""
+    queryset = queryset.order_by('pk')
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(pk__gt=last)
+        page = list(page[:chunk_size])
+        if not page:
+            return
+        yield page
+        if len(page) < chunk_size:
+            return
+        last = page[-1].pk
+
+
+class StreamingJSONRenderer(FastJSONRenderer):
+    def render_pages(self, pages):
+        """One JSON array from lists of rows, rendered a list at a time."""
+        yield b'['
+        first = True
+        for rows in pages:
+            if not rows:
+                continue
+            # Compact '[a,b]': the rows without the brackets
+            body = self.render(rows)[1:-1]
+            yield body if first else b',' + body
+            first = False
+        yield b']'
+
+
+def _in_context(context, iterator):
+    while True:
+        try:
+            yield context.run(next, iterator)
+        except StopIteration:
+            return
+
+
+async def _threaded(iterator):
+    # One chunk (one page) per trip to the request's thread: Django would
+    # otherwise read a sync iterator into a list before sending anything
+    step = sync_to_async(next)
+    while True:
+        chunk = await step(iterator, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def is_asgi(request):
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+def streams(request):
+    """Whether DRF negotiated JSON for ``request``, the one format streamed."""
+    renderer = getattr(request, 'accepted_renderer', None)
+    return renderer is None or renderer.format == 'json'
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    def __init__(self, queryset, serializer_class, request=None, context=None, chunk_size=None, **kwargs):
+        chunk_size = chunk_size or get_option('CHUNK_SIZE')
+        rows = (
+            serializer_class(page, many=True, context=context or {}).data
+            for page in pages(queryset, chunk_size)
+        )
+        kwargs.setdefault('content_type', 'application/json')
+        # Iterated after the view and its middleware have returned: keep their context
+        chunks = _in_context(contextvars.copy_context(), StreamingJSONRenderer().render_pages(rows))
+        if is_asgi(request):
+            chunks = _threaded(chunks)
+        super().__init__(chunks, **kwargs)
@@ -0,0 +1,84 @@
+"""
+Post-checkout jobs run by ``manage.py run_workers``.
+"""
+from pathlib import Path
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Sum
+from django.template.loader import render_to_string
+
+from .compression import invalidate_catalog
+from .jobs import enqueue_many, register
+from .models import Order, Orderdetails, Product
+from .recommendations import refresh_recommendations
+
+
+def enqueue_post_checkout(order, product_ids):
+    enqueue_many([
+        ('order_confirmation_email', {'order_id': order.order_id}),
+        ('order_invoice', {'order_id': order.order_id}),
+        ('stock_recalculation', {'product_ids': sorted(set(product_ids))}),
+        ('order_rollups', {'order_id': order.order_id}),
+    ])
+
+
+@register('order_confirmation_email', batch_size=50)
+def send_order_confirmations(payloads):
+    orders = Order.objects.filter(
+        order_id__in=[p['order_id'] for p in payloads]
+    ).select_related('customer__user')
+    messages = [
+        EmailMessage(
+            subject=f"Order #{order.order_id} confirmed",
+            body=render_to_string('entrega/order_confirmation.txt', {'order': order}),
+            to=[order.customer.user.email],
+        )
+        for order in orders
+        if order.customer and order.customer.user and order.customer.user.email
+    ]
+    # One connection for the whole batch
+    get_connection().send_messages(messages)
+
+
+@register('order_invoice', batch_size=20)
+def render_invoices(payloads):
+    orders = Order.objects.filter(
+        order_id__in=[p['order_id'] for p in payloads]
+    ).select_related('customer').prefetch_related('orderdetails_set__product')
+    invoice_dir = Path(settings.MEDIA_ROOT) / 'invoices'
+    invoice_dir.mkdir(parents=True, exist_ok=True)
+    for order in orders:
+        details = list(order.orderdetails_set.all())
+        total = sum((d.unit_price or 0) * (d.quantity or 0) for d in details) + (order.freight or 0)
+        content = render_to_string('entrega/invoice.txt', {
+            'order': order, 'details': details, 'total': total,
+        })
+        (invoice_dir / f"order_{order.order_id}.txt").write_text(content, encoding='utf-8')
+
+
+@register('stock_recalculation', batch_size=100)
+def recalculate_stock(payloads):
+    product_ids = {pid for p in payloads for pid in p.get('product_ids', [])}
+    # units_in_order is what open (not yet shipped) orders still hold, in one GROUP BY
+    pending = dict(
+        Orderdetails.objects
+        .filter(product_id__in=product_ids, order__status__in=Order.OPEN_STATUSES)
+        .values_list('product_id')
+        .annotate(total=Sum('quantity'))
+        .values_list('product_id', 'total')
+    )
+    products = list(Product.objects.filter(product_id__in=product_ids).only('product_id', 'units_in_order'))
+    for product in products:
+        product.units_in_order = pending.get(product.product_id) or 0
+    Product.objects.bulk_update(products, ['units_in_order'])
+    # bulk_update sends no post_save
+    invalidate_catalog()
+
+
+@register('order_rollups', batch_size=1000)
+def update_rollups(payloads):
+    # The refresh is incremental, so a whole batch of orders costs one run
+    refresh_recommendations()
+    # ?related=1 on product_detail reads the recommendations
+    invalidate_catalog()
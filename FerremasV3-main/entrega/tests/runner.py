@@ -0,0 +1,11 @@
+from django.test.runner import DiscoverRunner
+
+
+class ParallelDiscoverRunner(DiscoverRunner):
+    """DiscoverRunner running in parallel unless --parallel says otherwise."""
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        # "auto" is one process per CPU, or DJANGO_TEST_PROCESSES
+        parser.set_defaults(parallel='auto')
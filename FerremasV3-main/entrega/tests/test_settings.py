@@ -1,4 +1,42 @@
-SECRET_KEY = "fake-key"
-INSTALLED_APPS = [
-    "tests",
-]
\ No newline at end of file
+"""
+Settings for the test suite, used by ``python manage.py test`` unless
+DJANGO_SETTINGS_MODULE or --settings says otherwise.
+
+- In-memory SQLite, whatever DB_PROFILE and the replica variables say.
+- MD5 password hashing: PBKDF2 is slow on purpose and almost every test
+  creates users and logs in.
+- Tables created straight from the models instead of running migrations;
+  the only data migration (0006) backfills rows an empty database does
+  not have.
+- Test classes spread over one process per CPU (DJANGO_TEST_PROCESSES or
+  --parallel N to change it, --parallel 1 to debug). Each process gets its
+  own copy of the database, and setUpTestData fixtures are built once per
+  class in the process running it.
+"""
+from apiIntegracion.settings import *  # noqa: F401,F403
+
+
+class DisableMigrations:
+    def __contains__(self, app_label):
+        return True
+
+    def __getitem__(self, app_label):
+        return None
+
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+MIGRATION_MODULES = DisableMigrations()
+
+TEST_RUNNER = 'entrega.tests.runner.ParallelDiscoverRunner'
+
+# Nothing written under BASE_DIR while testing
+SLOW_QUERIES = {**SLOW_QUERIES, 'ENABLED': False}  # noqa: F405
+METRICS = {**METRICS, 'DIR': None}  # noqa: F405
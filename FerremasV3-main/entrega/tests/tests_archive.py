@@ -0,0 +1,51 @@
+import datetime
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from entrega.archive import archive_orders
+from entrega.models import Product, Order, Orderdetails, ArchivedOrder, ArchivedOrderdetails, Customer, User
+
+class OrderArchiveTest(TestCase):
+    def setUp(self):
+        # Crea un cliente con una orden antigua despachada y una orden reciente
+        self.user = User.objects.create_user(username="testcustomer", password="testpassword", user_type="customer")
+        self.customer = Customer.objects.create(user=self.user)
+        product = Product.objects.create(product_name="Martillo", unit_price=5000)
+        old_date = timezone.now() - datetime.timedelta(days=400)
+        self.old_order = Order.objects.create(customer=self.customer, order_date=old_date, shipped_date=old_date, status='shipped')
+        Orderdetails.objects.create(order=self.old_order, product=product, unit_price=5000, quantity=2)
+        self.new_order = Order.objects.create(customer=self.customer, order_date=timezone.now())
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'testcustomer', 'password': 'testpassword'},
+            content_type='application/json'
+        )
+        self.access_token = response.json().get('access')
+        print("Unitaria -  Crea órdenes antiguas y recientes para archivar")
+
+    # Prueba que solo las órdenes antiguas despachadas pasan al archivo
+    def test_archive_moves_old_orders(self):
+        self.assertEqual(archive_orders(older_than_days=365), 1)
+        self.assertEqual(list(Order.objects.values_list('order_id', flat=True)), [self.new_order.order_id])
+        self.assertTrue(ArchivedOrder.objects.filter(order_id=self.old_order.order_id).exists())
+        self.assertEqual(ArchivedOrderdetails.objects.get().quantity, 2)
+        self.assertFalse(Orderdetails.objects.exists())
+        print("Unitaria -  Prueba que solo las órdenes antiguas despachadas se archivan")
+
+    # Prueba que el detalle y la lista por order_id consultan el archivo
+    def test_lookup_falls_back_to_archive(self):
+        archive_orders(older_than_days=365)
+        response = self.client.get(
+            reverse('order_detail', args=[self.old_order.order_id]),
+            HTTP_AUTHORIZATION=f'Bearer {self.access_token}'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.json()['archived'])
+        self.assertEqual(len(response.json()['order_details']), 1)
+        response = self.client.get(
+            reverse('order_list'), {'order_id': f'{self.old_order.order_id},{self.new_order.order_id}'},
+            HTTP_AUTHORIZATION=f'Bearer {self.access_token}'
+        )
+        self.assertEqual([o['order_id'] for o in response.json()], [self.old_order.order_id, self.new_order.order_id])
+        print("Integracion - Prueba que la consulta por order_id usa el archivo")
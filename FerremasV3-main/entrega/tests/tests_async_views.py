@@ -0,0 +1,87 @@
+import json
+from decimal import Decimal
+from asgiref.sync import iscoroutinefunction
+from django.test import TestCase, override_settings
+from django.test.client import AsyncClientHandler
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from entrega.models import Category, Customer, Order, Orderdetails, Product, Shipper, Supplier, User
+
+class AsyncViewsTest(TestCase):
+    def setUp(self):
+        # Crea catálogo, un cliente con una orden y otro cliente sin órdenes
+        category = Category.objects.create(category_name="Herramientas")
+        supplier = Supplier.objects.create(contact_name="Proveedor")
+        self.product = Product.objects.create(
+            product_name="Taladro", category=category, supplier=supplier, unit_price=Decimal('149.99')
+        )
+        Product.objects.create(product_name="Martillo", category=category, unit_price=Decimal('9.90'))
+        customer_user = User.objects.create_user(username="testcustomer", password="testpassword", user_type="customer")
+        customer = Customer.objects.create(user=customer_user, contact_name="Cliente")
+        other_user = User.objects.create_user(username="othercustomer", password="testpassword", user_type="customer")
+        Customer.objects.create(user=other_user)
+        self.order = Order.objects.create(
+            customer=customer, order_date=timezone.now(), shipper=Shipper.objects.create(company_name="Chilexpress")
+        )
+        Orderdetails.objects.create(order=self.order, product=self.product, unit_price=Decimal('149.99'), quantity=2)
+        print("Integracion - Crear catálogo y orden para vistas asíncronas")
+
+    def auth(self, username):
+        response = self.client.post(
+            reverse('token_obtain_pair'), {'username': username, 'password': 'testpassword'},
+            content_type='application/json'
+        )
+        return {'HTTP_AUTHORIZATION': f"Bearer {response.json()['access']}"}
+
+    def assertSameResponse(self, sync_url, async_url, **headers):
+        sync_response = self.client.get(sync_url, **headers)
+        async_response = self.client.get(async_url, **headers)
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        # Las listas completas de órdenes se envían en streaming
+        bodies = [
+            b''.join(response.streaming_content) if response.streaming else response.content
+            for response in (sync_response, async_response)
+        ]
+        self.assertEqual(json.loads(bodies[1]), json.loads(bodies[0]))
+        return json.loads(bodies[1])
+
+    # Prueba que en ASGI ningún middleware obliga a correr la cadena en un hilo
+    def test_middleware_chain_stays_async(self):
+        handler = AsyncClientHandler()
+        with override_settings(DEBUG=True), self.assertNoLogs('django.request', 'DEBUG'):
+            handler.load_middleware(is_async=True)
+        self.assertTrue(iscoroutinefunction(handler._middleware_chain))
+        print("Unitaria -  Prueba que la cadena de middleware es asíncrona")
+
+    # Prueba que el catálogo asíncrono responde igual que el síncrono
+    def test_catalog_matches_sync_views(self):
+        self.assertSameResponse(reverse('product_list'), reverse('product_list_async'))
+        self.assertSameResponse(reverse('product_list') + '?search=tala', reverse('product_list_async') + '?search=tala')
+        self.assertSameResponse(
+            reverse('product_detail', args=[self.product.pk]), reverse('product_detail_async', args=[self.product.pk])
+        )
+        self.assertSameResponse(reverse('category_list'), reverse('category_list_async'))
+        response = self.client.get(reverse('product_detail_async', args=[999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        print("Integracion - Prueba el catálogo asíncrono")
+
+    # Prueba que las órdenes asíncronas responden igual y respetan los permisos
+    def test_orders_match_sync_views(self):
+        headers = self.auth('testcustomer')
+        orders = self.assertSameResponse(reverse('order_list'), reverse('order_list_async'), **headers)
+        self.assertEqual(orders[0]['order_details'][0]['product_name'], "Taladro")
+        self.assertSameResponse(
+            reverse('order_detail', args=[self.order.pk]), reverse('order_detail_async', args=[self.order.pk]), **headers
+        )
+        response = self.client.get(reverse('order_detail_async', args=[self.order.pk]), **self.auth('othercustomer'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        print("Integracion - Prueba las órdenes asíncronas")
+
+    # Prueba que las órdenes asíncronas exigen autenticación y solo aceptan GET
+    def test_orders_require_authentication(self):
+        self.assertEqual(self.client.get(reverse('order_list_async')).status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get(reverse('order_list_async'), HTTP_AUTHORIZATION='Bearer invalido')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.client.post(reverse('product_list_async')).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        print("Integracion - Prueba la autenticación de las vistas asíncronas")
@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from entrega import revocation
+from entrega.authentication import ClaimsRefreshToken
+from entrega.models import Customer, User
+
+class ClaimsAuthenticationTest(TestCase):
+    def setUp(self):
+        # Crea un cliente y obtiene su token JWT con claims
+        self.user = User.objects.create_user(
+            username="testcustomer", password="testpassword",
+            email="cliente@test.com", user_type="customer"
+        )
+        self.customer = Customer.objects.create(user=self.user)
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'testcustomer', 'password': 'testpassword'},
+            content_type='application/json'
+        )
+        self.access_token = response.json().get('access')
+        # La carga inicial de revocaciones es una vez por proceso, no por request
+        revocation.start()
+        print("Integracion - Crear cliente y token con claims")
+
+    # Prueba que el token incluye user_type y customer_id
+    def test_token_contains_claims(self):
+        token = AccessToken(self.access_token)
+        self.assertEqual(token['user_type'], 'customer')
+        self.assertEqual(token['customer_id'], self.customer.pk)
+        self.assertIsNone(token['supplier_id'])
+        print("Unitaria -  Prueba que el token incluye los claims de perfil")
+
+    # Prueba que el carrito se resuelve sin consultas de autenticación
+    def test_cart_without_auth_queries(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('cart'), HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        print("Integracion - Prueba que el carrito no consulta usuario ni perfil")
+
+    # Prueba que el perfil sigue cargando el usuario completo
+    def test_profile_loads_full_user(self):
+        response = self.client.get(reverse('user_profile'), HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        self.assertEqual(response.json()['email'], "cliente@test.com")
+        print("Integracion - Prueba que el perfil carga el usuario completo")
+
+    # Prueba que un token revocado es rechazado
+    def test_revoked_token_is_rejected(self):
+        revocation.revoke(AccessToken(self.access_token))
+        response = self.client.get(reverse('cart'), HTTP_AUTHORIZATION=f'Bearer {self.access_token}')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        print("Integracion - Prueba que un token revocado es rechazado")
+
+    # Prueba que desactivar al usuario revoca sus tokens
+    def test_deactivated_user_is_rejected(self):
+        # El corte por usuario queda en el filtro del proceso: se limpia al terminar
+        self.addCleanup(revocation._filter.reset)
+        # Token emitido un segundo antes (iat tiene resolución de segundos)
+        token = AccessToken(self.access_token)
+        token['iat'] -= 1
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        response = self.client.get(reverse('cart'), HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        print("Integracion - Prueba que un usuario desactivado pierde acceso")
+
+    # Prueba que cambiar el tipo de usuario revoca sus tokens, también el de refresco
+    def test_demoted_user_is_rejected(self):
+        self.addCleanup(revocation._filter.reset)
+        employee = User.objects.create_user(username="testemployee", password="testpassword", user_type="employee")
+        refresh = ClaimsRefreshToken.for_user(employee)
+        access = refresh.access_token
+        # Tokens emitidos un segundo antes (iat tiene resolución de segundos)
+        refresh['iat'] -= 1
+        access['iat'] -= 1
+        response = self.client.get(reverse('job_metrics'), HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            employee.user_type = 'customer'
+            employee.save()
+        response = self.client.get(reverse('job_metrics'), HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('token_refresh'), {'refresh': str(refresh)}, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        print("Integracion - Prueba que un usuario degradado pierde acceso")
+
+    # Prueba que borrar el perfil de cliente revoca los tokens que llevan su id
+    def test_deleted_profile_revokes_tokens(self):
+        self.addCleanup(revocation._filter.reset)
+        token = AccessToken(self.access_token)
+        token['iat'] -= 1
+        with self.captureOnCommitCallbacks(execute=True):
+            self.customer.delete()
+        response = self.client.get(reverse('cart'), HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Un usuario borrado con su perfil no deja nada que revocar
+        with self.captureOnCommitCallbacks(execute=True):
+            Customer.objects.create(user=self.user)
+            self.user.delete()
+        print("Integracion - Prueba que borrar el perfil revoca los tokens")
+
+class TokenRevocationTest(TestCase):
+    def setUp(self):
+        # Crea un cliente con su par de tokens y limpia el filtro en memoria
+        revocation._filter.reset()
+        self.addCleanup(revocation._filter.reset)
+        self.user = User.objects.create_user(username="testcustomer", password="testpassword", user_type="customer")
+        Customer.objects.create(user=self.user)
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'testcustomer', 'password': 'testpassword'},
+            content_type='application/json'
+        )
+        self.tokens = response.json()
+        print("Integracion - Crear cliente con tokens para revocación")
+
+    def get_cart(self):
+        return self.client.get(reverse('cart'), HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+
+    # Prueba que el logout revoca el token de acceso y el de refresco
+    def test_logout_revokes_access_and_refresh(self):
+        response = self.client.post(
+            reverse('user_logout'), {'refresh': self.tokens['refresh']},
+            HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}",
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_205_RESET_CONTENT)
+        self.assertEqual(self.get_cart().status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(
+            reverse('token_refresh'), {'refresh': self.tokens['refresh']}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        print("Integracion - Prueba que el logout revoca access y refresh")
+
+    # Prueba que otro worker ve la revocación tras sincronizar, sin consultas por request
+    def test_other_worker_sees_revocation_after_sync(self):
+        worker = revocation.RevocationFilter()
+        with self.settings(JWT_REVOCATION={'SYNC_INTERVAL': 0}):
+            worker.start()
+        revocation.revoke_user(self.user.pk)
+        token = AccessToken(self.tokens['access'])
+        token['iat'] -= 1
+        self.assertFalse(worker.is_revoked(token))
+        worker.sync()
+        with self.assertNumQueries(0):
+            self.assertTrue(worker.is_revoked(token))
+        print("Unitaria -  Prueba la sincronización incremental del filtro de revocación")
+
+    # Prueba que el corte por usuario se compara en segundos enteros con iat
+    def test_user_cutoff_in_whole_seconds(self):
+        worker = revocation.RevocationFilter()
+        with self.settings(JWT_REVOCATION={'SYNC_INTERVAL': 0}):
+            worker.start()
+        revoked_at = datetime(2030, 1, 1, 12, 0, 0, 600000, tzinfo=dt_timezone.utc)
+        worker.add(None, self.user.pk, revoked_at, revoked_at + timedelta(days=1))
+        token = AccessToken(self.tokens['access'])
+        token['iat'] = int(revoked_at.timestamp())
+        self.assertFalse(worker.is_revoked(token))
+        token['iat'] -= 1
+        self.assertTrue(worker.is_revoked(token))
+        print("Unitaria -  Prueba que un token emitido en el mismo segundo tras revocar es válido")
@@ -0,0 +1,109 @@
+import gzip
+import json
+import unittest
+from decimal import Decimal
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from entrega import compression
+from entrega.compression import CompressionMiddleware, negotiate
+from entrega.models import Category, Product
+
+CATALOG = {'MIN_SIZE': 200, 'CATALOG_VIEWS': ['product_list', 'category_products']}
+
+class CompressionMiddlewareTest(TestCase):
+    def respond(self, response, accept='gzip, deflate'):
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept))
+
+    # Prueba la negociación de Accept-Encoding
+    def test_negotiate(self):
+        self.assertEqual(negotiate('gzip, deflate'), 'gzip')
+        self.assertIsNone(negotiate('identity'))
+        self.assertIsNone(negotiate('gzip;q=0'))
+        self.assertIsNone(negotiate(''))
+        self.assertEqual(negotiate('*'), compression.encodings()[0])
+        print("Unitaria -  Prueba la negociación de Accept-Encoding")
+
+    # Prueba que solo se comprime JSON sobre el umbral
+    def test_json_above_threshold_only(self):
+        data = [{'product_name': f'Producto {i}', 'unit_price': '1990.00'} for i in range(100)]
+        response = self.respond(JsonResponse(data, safe=False))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.content)), data)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+
+        self.assertFalse(self.respond(JsonResponse({'ok': True})).has_header('Content-Encoding'))
+        self.assertFalse(self.respond(HttpResponse('x' * 5000, content_type='text/html')).has_header('Content-Encoding'))
+        self.assertFalse(self.respond(JsonResponse(data, safe=False), accept='identity').has_header('Content-Encoding'))
+        print("Unitaria -  Prueba la compresión de JSON sobre el umbral")
+
+    # Prueba la compresión de respuestas JSON en streaming
+    def test_streaming(self):
+        chunks = [b'[', b'{"id": 1}', b',{"id": 2}', b']']
+        response = self.respond(StreamingHttpResponse(iter(chunks), content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(b''.join(response.streaming_content))), [{'id': 1}, {'id': 2}])
+        print("Unitaria -  Prueba la compresión en streaming")
+
+    @unittest.skipIf(compression.brotli is None, "brotli no está instalado")
+    def test_brotli_preferred(self):
+        data = [{'id': i} for i in range(500)]
+        response = self.respond(JsonResponse(data, safe=False), accept='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(json.loads(compression.brotli.decompress(response.content)), data)
+        print("Unitaria -  Prueba que brotli tiene preferencia")
+
+@override_settings(COMPRESSION=CATALOG)
+class CatalogCacheTest(TestCase):
+    def setUp(self):
+        # Crea una categoría con productos y limpia la caché
+        self.category = Category.objects.create(category_name="Herramientas")
+        for i in range(20):
+            Product.objects.create(product_name=f"Martillo {i}", category=self.category, unit_price=Decimal('4990.00'))
+        cache.clear()
+        self.addCleanup(cache.clear)
+        print("Integracion - Crear catálogo y limpiar la caché")
+
+    def get(self, url, accept='gzip'):
+        return self.client.get(url, HTTP_ACCEPT_ENCODING=accept, HTTP_ACCEPT='application/json')
+
+    # Prueba que la segunda petición sale de la caché ya comprimida
+    def test_cached_precompressed(self):
+        url = reverse('product_list')
+        first = self.get(url)
+        self.assertEqual(first['Content-Encoding'], 'gzip')
+        with self.assertNumQueries(0):
+            second = self.get(url)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(len(json.loads(gzip.decompress(second.content))), 20)
+
+        with self.assertNumQueries(0):
+            plain = self.get(url, accept='identity')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertEqual(json.loads(plain.content), json.loads(gzip.decompress(first.content)))
+        print("Integracion - Prueba el catálogo precomprimido en caché")
+
+    # Prueba la compresión y la caché del catálogo en una cadena ASGI
+    async def test_async_chain(self):
+        url = reverse('product_list')
+        headers = {'Accept-Encoding': 'gzip', 'Accept': 'application/json'}
+        first = await self.async_client.get(url, headers=headers)
+        self.assertEqual(first['Content-Encoding'], 'gzip')
+        second = await self.async_client.get(url, headers=headers)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(len(json.loads(gzip.decompress(second.content))), 20)
+        response = await self.async_client.get(reverse('product_list_async'), headers=headers)
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 20)
+        print("Integracion - Prueba la compresión en ASGI")
+
+    # Prueba que guardar un producto invalida el catálogo
+    def test_invalidated_on_save(self):
+        url = reverse('category_products', args=[self.category.pk])
+        self.get(url, accept='identity')
+        Product.objects.create(product_name="Sierra", category=self.category, unit_price=Decimal('9990.00'))
+        response = self.get(url, accept='identity')
+        self.assertEqual(len(response.json()), 21)
+        print("Integracion - Prueba la invalidación del catálogo")
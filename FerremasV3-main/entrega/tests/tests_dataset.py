@@ -0,0 +1,68 @@
+from datetime import date
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.test import TestCase
+from entrega.models import Cart, Customer, Order, Orderdetails, Product, Supplier, User
+
+class GenerateDatasetTest(TestCase):
+    def generate(self, **options):
+        options = {'seed': 7, 'products': 200, 'customers': 50, 'carts': 40, 'orders': 400,
+                   'end_date': date(2024, 12, 31), 'days': 365, 'batch_size': 64, **options}
+        call_command('generate_dataset', stdout=StringIO(), **options)
+
+    # Prueba que se generan todas las tablas con las cantidades pedidas
+    def test_generates_counts(self):
+        self.generate()
+        self.assertEqual(Product.objects.count(), 200)
+        self.assertEqual(Customer.objects.filter(user__username__startswith='gen_customer_').count(), 50)
+        self.assertEqual(User.objects.filter(user_type='employee').count(), 5)
+        self.assertEqual(Cart.objects.count(), 40)
+        self.assertEqual(Order.objects.count(), 400)
+        self.assertTrue(Orderdetails.objects.count() >= 400)
+        self.assertTrue(User.objects.get(username='gen_customer_1').check_password('testpass123'))
+        with self.assertRaises(CommandError):
+            self.generate()
+        print("Integracion - Prueba la generación del dataset")
+
+    # Prueba que la misma semilla produce los mismos datos
+    def test_deterministic(self):
+        def snapshot():
+            return (
+                list(Product.objects.order_by('pk').values_list('product_name', 'unit_price')),
+                list(Order.objects.order_by('pk').values_list('order_date', 'status')),
+                list(Orderdetails.objects.order_by('pk').values_list('quantity', flat=True)),
+            )
+        self.generate()
+        first = snapshot()
+        Order.objects.all().delete()
+        Product.objects.all().delete()
+        User.objects.all().delete()
+        self.generate()
+        self.assertEqual(snapshot(), first)
+        print("Unitaria -  Prueba que el dataset es reproducible")
+
+    # Prueba la popularidad Zipf de los productos y la estacionalidad de los pedidos
+    def test_distributions(self):
+        self.generate(orders=2000, products=500)
+        lines = list(
+            Orderdetails.objects.values('product').annotate(n=Count('id')).order_by('-n').values_list('n', flat=True)
+        )
+        total = sum(lines)
+        # Con popularidad uniforme los 10 primeros serían ~2% de las líneas
+        self.assertTrue(sum(lines[:10]) / total > 0.2)
+
+        december = Order.objects.filter(order_date__month=12).count()
+        february = Order.objects.filter(order_date__month=2).count()
+        self.assertTrue(december > 1.8 * february)
+        print("Unitaria -  Prueba las distribuciones del dataset")
+
+class CreateSampleDataTest(TestCase):
+    # Prueba que create_sample_data funciona con los campos reales de Supplier y Customer
+    def test_create_sample_data(self):
+        call_command('create_sample_data', stdout=StringIO())
+        self.assertEqual(Supplier.objects.count(), 2)
+        self.assertEqual(Product.objects.filter(supplier__contact_name='John Smith').count(), 2)
+        self.assertEqual(User.objects.get(username='testcustomer').customer.last_name, 'Customer')
+        print("Integracion - Prueba create_sample_data")
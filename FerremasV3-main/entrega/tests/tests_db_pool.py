@@ -0,0 +1,86 @@
+import sqlite3
+import threading
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from entrega.db.pool import ConnectionPool, PoolTimeout
+from entrega.models import User
+
+def usable(connection):
+    try:
+        connection.execute('SELECT 1')
+    except sqlite3.Error:
+        return False
+    return True
+
+class ConnectionPoolTest(SimpleTestCase):
+    def pool(self, **options):
+        return ConnectionPool(lambda: sqlite3.connect(':memory:', check_same_thread=False), usable, **options)
+
+    # Prueba que una conexión devuelta al pool se reutiliza
+    def test_reuses_released_connection(self):
+        pool = self.pool(max_size=2)
+        connection = pool.acquire()
+        pool.release(connection)
+        self.assertIs(pool.acquire(), connection)
+        stats = pool.stats()
+        self.assertEqual((stats['created'], stats['reused'], stats['in_use']), (1, 1, 1))
+        print("Unitaria -  Prueba la reutilización de conexiones del pool")
+
+    # Prueba que con el pool lleno se espera una conexión libre o se agota el tiempo
+    def test_waits_for_free_connection_and_times_out(self):
+        pool = self.pool(max_size=1, timeout=0.05)
+        connection = pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+
+        threading.Timer(0.01, pool.release, args=[connection]).start()
+        pool.timeout = 5
+        self.assertIs(pool.acquire(), connection)
+        stats = pool.stats()
+        self.assertEqual((stats['waits'], stats['timeouts'], stats['size']), (2, 1, 1))
+        print("Unitaria -  Prueba la espera y el timeout del pool")
+
+    # Prueba que las conexiones caídas o viejas se descartan antes de entregarlas
+    def test_discards_unusable_and_old_connections(self):
+        pool = self.pool(max_size=1, ping_after=0)
+        connection = pool.acquire()
+        connection.close()
+        pool.release(connection)
+        self.assertIsNot(pool.acquire(), connection)
+
+        pool = self.pool(max_size=1, recycle=0)
+        connection = pool.acquire()
+        pool.release(connection)
+        self.assertIsNot(pool.acquire(), connection)
+        self.assertEqual(pool.stats()['discarded'], 1)
+        print("Unitaria -  Prueba el descarte de conexiones caídas o viejas")
+
+    # Prueba que una conexión descartada libera su lugar en el pool
+    def test_release_discard_frees_slot(self):
+        pool = self.pool(max_size=1, timeout=0.05)
+        pool.release(pool.acquire(), discard=True)
+        pool.acquire()
+        self.assertEqual(pool.stats()['created'], 2)
+        print("Unitaria -  Prueba que descartar una conexión libera su lugar")
+
+class DatabasePoolViewTest(TestCase):
+    def setUp(self):
+        # Crea un empleado y un cliente para consultar las estadísticas del pool
+        User.objects.create_user(username="testemployee", password="testpassword", user_type="employee")
+        User.objects.create_user(username="testcustomer", password="testpassword", user_type="customer")
+        print("Integracion - Crear empleado y cliente para estadísticas del pool")
+
+    def get(self, username):
+        token = self.client.post(
+            reverse('token_obtain_pair'), {'username': username, 'password': 'testpassword'}
+        ).data['access']
+        return self.client.get(reverse('db_pool_stats'), HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    # Prueba que solo los empleados ven las estadísticas del pool
+    def test_pool_stats_for_employees_only(self):
+        self.assertEqual(self.get('testcustomer').status_code, status.HTTP_403_FORBIDDEN)
+        response = self.get('testemployee')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['profile'], 'sqlite')
+        print("Integracion - Prueba las estadísticas del pool para empleados")
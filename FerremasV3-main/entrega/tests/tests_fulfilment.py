@@ -0,0 +1,53 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from entrega.models import Product, Order, Orderdetails, Shipper, User
+
+class BulkFulfilmentTest(TestCase):
+    def setUp(self):
+        # Crea un empleado, un despachador y tres órdenes pendientes
+        User.objects.create_user(username="testemployee", password="testpassword", user_type="employee")
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'testemployee', 'password': 'testpassword'},
+            content_type='application/json'
+        )
+        self.access_token = response.json().get('access')
+        self.shipper = Shipper.objects.create(company_name="Chilexpress")
+        self.martillo = Product.objects.create(product_name="Martillo", unit_price=5000)
+        self.clavos = Product.objects.create(product_name="Clavos", unit_price=1000)
+        self.orders = [Order.objects.create(order_date=timezone.now(), status='paid') for _ in range(3)]
+        for order in self.orders:
+            Orderdetails.objects.create(order=order, product=self.martillo, unit_price=5000, quantity=1)
+            Orderdetails.objects.create(order=order, product=self.clavos, unit_price=1000, quantity=10)
+        print("Integracion - Crear empleado y órdenes pendientes para despacho masivo")
+
+    def ship(self, order_ids):
+        return self.client.post(
+            reverse('order_ship'), {'order_ids': order_ids, 'shipper': self.shipper.pk},
+            HTTP_AUTHORIZATION=f'Bearer {self.access_token}',
+            content_type='application/json'
+        )
+
+    # Prueba el despacho masivo y la lista de picking agregada por producto
+    def test_bulk_ship_and_pick_list(self):
+        ids = [order.order_id for order in self.orders[:2]]
+        response = self.ship(ids + [9999])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['shipped'], 2)
+        self.assertEqual(response.json()['skipped'], [9999])
+        self.assertEqual(
+            [(row['product_name'], row['quantity'], row['orders']) for row in response.json()['pick_list']],
+            [("Martillo", 2, 2), ("Clavos", 20, 2)]
+        )
+        self.assertEqual(Order.objects.filter(shipper=self.shipper, status='shipped').count(), 2)
+        print("Integracion - Prueba el despacho masivo y la lista de picking")
+
+    # Prueba que las órdenes ya despachadas no se vuelven a despachar
+    def test_already_shipped_orders_are_skipped(self):
+        self.ship([self.orders[0].order_id])
+        response = self.ship([order.order_id for order in self.orders])
+        self.assertEqual(response.json()['shipped'], 2)
+        self.assertEqual(response.json()['skipped'], [self.orders[0].order_id])
+        print("Integracion - Prueba que no se despachan órdenes ya despachadas")
@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import Client, TestCase
 from django.urls import reverse
 from rest_framework import status
 from entrega.models import Category, Product, Supplier, Customer
@@ -6,15 +6,16 @@ from django.contrib.auth import get_user_model
 User = get_user_model()
 
 class CategoryIntegrationTest(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         # Crear un usuario de prueba y obtener token JWT
-        self.user = User.objects.create_superuser(username="testuser", password="testpassword")
-        response = self.client.post(
+        cls.user = User.objects.create_superuser(username="testuser", password="testpassword")
+        response = Client().post(
             reverse('token_obtain_pair'),
             {'username': 'testuser', 'password': 'testpassword'},
             content_type='application/json'
         )
-        self.access_token = response.json().get('access')
+        cls.access_token = response.json().get('access')
 
     def test_create_category_integration(self):
         # Prueba la creación de una categoría vía API
@@ -116,15 +117,16 @@ class CategoryIntegrationTest(TestCase):
         print("Integracion - Prueba que no se puede crear una categoría sin campos obligatorios")
 
 class ProductIntegrationTest(TestCase):
-    def setUp(self):
-        self.user = User.objects.create_superuser(username="testuser", password="testpassword")
-        response = self.client.post(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(username="testuser", password="testpassword")
+        response = Client().post(
             reverse('token_obtain_pair'),
             {'username': 'testuser', 'password': 'testpassword'},
             content_type='application/json'
         )
-        self.access_token = response.json().get('access')
-        self.category = Category.objects.create(category_name="Herramientas")
+        cls.access_token = response.json().get('access')
+        cls.category = Category.objects.create(category_name="Herramientas")
         print("Integracion - Crear usuario y categoría para productos")
 
     def test_create_product(self):
@@ -165,14 +167,15 @@ class ProductIntegrationTest(TestCase):
         print("Integracion - Prueba el borrado de un producto vía API")
 
 class SupplierIntegrationTest(TestCase):
-    def setUp(self):
-        self.user = User.objects.create_superuser(username="testuser", password="testpassword")
-        response = self.client.post(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(username="testuser", password="testpassword")
+        response = Client().post(
             reverse('token_obtain_pair'),
             {'username': 'testuser', 'password': 'testpassword'},
             content_type='application/json'
         )
-        self.access_token = response.json().get('access')
+        cls.access_token = response.json().get('access')
         print("Integracion - Crear usuario para proveedores")
 
     def test_create_supplier(self):
@@ -217,22 +220,23 @@ class SupplierIntegrationTest(TestCase):
         print("Integracion - Prueba el borrado de un proveedor vía API")
 
 class OrderIntegrationTest(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         # Crea un usuario tipo customer
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username="testcustomer",
             password="testpassword",
             user_type="customer"
         )
         # Crea el perfil Customer asociado (agrega otros campos obligatorios si existen)
-        Customer.objects.create(user=self.user)
+        Customer.objects.create(user=cls.user, contact_name="Juan")
         # Obtén el token JWT
-        response = self.client.post(
+        response = Client().post(
             reverse('token_obtain_pair'),
             {'username': 'testcustomer', 'password': 'testpassword'},
             content_type='application/json'
         )
-        self.access_token = response.json().get('access')
+        cls.access_token = response.json().get('access')
         print("Integracion - Crear usuario y perfil Customer para órdenes")
 
     def test_create_order(self):
@@ -252,6 +256,7 @@ class OrderIntegrationTest(TestCase):
             content_type='application/json'
         )
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['customer_name'], "Juan")
         print("Integracion - Prueba la creación de una orden vía API (con producto en carrito)")
 
     def test_list_orders(self):
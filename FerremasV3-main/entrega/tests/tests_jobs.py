@@ -0,0 +1,130 @@
+from datetime import timedelta
+from unittest import mock
+from django.core import mail
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from entrega import jobs
+from entrega.models import Job, Product, Customer, Cart, User
+
+class JobQueueTest(TestCase):
+    def setUp(self):
+        self.calls = []
+        jobs.register('test_batch', batch_size=10)(self.calls.append)
+        self.addCleanup(jobs._handlers.pop, 'test_batch', None)
+        print("Unitaria -  Registra un handler de prueba para la cola de trabajos")
+
+    # Prueba que los trabajos se encolan recién al confirmar la transacción
+    def test_enqueue_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue('test_batch', {'n': 1})
+            self.assertEqual(Job.objects.count(), 0)
+        self.assertEqual(Job.objects.count(), 1)
+        print("Unitaria -  Prueba que los trabajos se encolan al confirmar la transacción")
+
+    # Prueba que los trabajos del mismo tipo se procesan en un solo lote
+    def test_same_type_jobs_are_batched(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue_many([('test_batch', {'n': n}) for n in range(3)])
+        processed = jobs.run_worker('test', burst=True)
+        self.assertEqual(processed, 3)
+        self.assertEqual(self.calls, [[{'n': 0}, {'n': 1}, {'n': 2}]])
+        self.assertEqual(Job.objects.filter(status='done').count(), 3)
+        print("Unitaria -  Prueba que los trabajos del mismo tipo se procesan en lote")
+
+    # Prueba que un worker que pierde la carrera por un lote toma el siguiente en vez de dormir
+    def test_claim_retries_after_losing_race(self):
+        jobs.register('test_single')(self.calls.append)
+        self.addCleanup(jobs._handlers.pop, 'test_single', None)
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue_many([('test_single', {'n': n}) for n in range(2)])
+        first = Job.objects.order_by('job_id').first()
+        real_uuid4 = jobs.uuid.uuid4
+
+        def other_worker_first():
+            # Otro worker reclama el primer trabajo entre la lectura y el UPDATE
+            Job.objects.filter(pk=first.pk, status='queued').update(status='running', locked_by='otro')
+            return real_uuid4()
+
+        with mock.patch.object(jobs.uuid, 'uuid4', side_effect=other_worker_first):
+            claimed = jobs.claim('test')
+        self.assertEqual([job.payload for job in claimed], [{'n': 1}])
+        self.assertEqual(jobs.claim('test'), [])
+        print("Unitaria -  Prueba que perder la carrera no deja trabajos esperando")
+
+    # Prueba el reintento con backoff y el fallo definitivo al agotar intentos
+    def test_retry_with_backoff_then_fail(self):
+        def failing(payloads):
+            raise RuntimeError("boom")
+        jobs.register('test_failing')(failing)
+        self.addCleanup(jobs._handlers.pop, 'test_failing', None)
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue('test_failing', max_attempts=2)
+        jobs.work_once('test')
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), ('queued', 1))
+        self.assertGreater(job.run_after, job.created_at)
+        self.assertIn("boom", job.last_error)
+        Job.objects.update(run_after=job.created_at)
+        jobs.work_once('test')
+        self.assertEqual(Job.objects.get().status, 'failed')
+        print("Unitaria -  Prueba el reintento con backoff y el fallo definitivo")
+
+    # Prueba que un trabajo que mata a su worker se reencola hasta agotar intentos
+    def test_abandoned_job_fails_after_max_attempts(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue('test_batch', max_attempts=2)
+        for _ in range(2):
+            self.assertEqual(len(jobs.claim('muerto')), 1)
+            Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+            jobs.requeue_abandoned()
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts, job.locked_by), ('failed', 2, None))
+        self.assertIn("Abandoned", job.last_error)
+        self.assertEqual(jobs.claim('test'), [])
+        print("Unitaria -  Prueba el fallo definitivo de un trabajo abandonado")
+
+class PostCheckoutJobsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testcustomer", password="testpassword",
+            email="cliente@test.com", user_type="customer"
+        )
+        self.customer = Customer.objects.create(user=self.user, contact_name="Cliente")
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'testcustomer', 'password': 'testpassword'},
+            content_type='application/json'
+        )
+        self.access_token = response.json().get('access')
+        print("Integracion - Crear cliente para trabajos post-checkout")
+
+    # Prueba que crear una orden encola y procesa los trabajos post-checkout
+    def test_order_create_enqueues_post_checkout_jobs(self):
+        product = Product.objects.create(product_name="Martillo", unit_price=5000)
+        Cart.objects.create(customer=self.customer, product=product, num_of_products=2, total_price=10000)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('order_create'), {},
+                HTTP_AUTHORIZATION=f'Bearer {self.access_token}',
+                content_type='application/json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            set(Job.objects.values_list('job_type', flat=True)),
+            {'order_confirmation_email', 'order_invoice', 'stock_recalculation', 'order_rollups'}
+        )
+        with self.settings(MEDIA_ROOT=self._media_root()):
+            jobs.run_worker('test', burst=True)
+        self.assertFalse(Job.objects.exclude(status='done').exists())
+        self.assertEqual(len(mail.outbox), 1)
+        product.refresh_from_db()
+        self.assertEqual(product.units_in_order, 2)
+        print("Integracion - Prueba que crear una orden encola los trabajos post-checkout")
+
+    def _media_root(self):
+        import tempfile
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return directory.name
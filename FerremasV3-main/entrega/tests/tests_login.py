@@ -0,0 +1,74 @@
+import threading
+from unittest import mock
+from django.contrib.auth.signals import user_login_failed
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from entrega import login
+from entrega.models import Customer, User
+
+class LoginPoolTest(TestCase):
+    def setUp(self):
+        # Crea un cliente para probar los endpoints de login
+        self.user = User.objects.create_user(username="testcustomer", password="testpassword", user_type="customer")
+        Customer.objects.create(user=self.user)
+        print("Integracion - Crear cliente para login")
+
+    def post(self, name, username, password):
+        return self.client.post(
+            reverse(name), {'username': username, 'password': password}, content_type='application/json'
+        )
+
+    # Prueba el login síncrono y asíncrono con credenciales válidas
+    def test_login_sync_and_async(self):
+        for name in ('user_login', 'user_login_async'):
+            response = self.post(name, 'testcustomer', 'testpassword')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn('access', response.json()['tokens'])
+            self.assertEqual(self.post(name, 'testcustomer', 'incorrecta').status_code, status.HTTP_401_UNAUTHORIZED)
+        print("Integracion - Prueba el login síncrono y asíncrono")
+
+    # Prueba que un usuario inexistente se rechaza sin calcular el hash
+    def test_unknown_username_is_rejected_without_hashing(self):
+        with mock.patch.object(User, 'check_password') as check_password:
+            response = self.post('user_login_async', 'noexiste', 'testpassword')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        check_password.assert_not_called()
+        print("Integracion - Prueba el rechazo rápido de usuarios inexistentes")
+
+    # Prueba que un cuerpo JSON que no es objeto responde 400
+    def test_non_object_body_returns_400(self):
+        for name in ('user_login', 'user_login_async'):
+            for body in ('["testcustomer"]', '"testcustomer"', '3'):
+                response = self.client.post(reverse(name), body, content_type='application/json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        print("Integracion - Prueba que un cuerpo que no es objeto responde 400")
+
+    # Prueba que el login fallido emite user_login_failed y respeta AUTHENTICATION_BACKENDS
+    def test_failed_signal_and_custom_backends(self):
+        failures = []
+        def receiver(credentials, **kwargs):
+            failures.append(credentials)
+        user_login_failed.connect(receiver)
+        self.addCleanup(user_login_failed.disconnect, receiver)
+        for name in ('user_login', 'user_login_async'):
+            self.post(name, 'testcustomer', 'incorrecta')
+        self.assertEqual([c['username'] for c in failures], ['testcustomer', 'testcustomer'])
+        self.assertNotIn('incorrecta', str(failures))
+        
+        backends = ['django.contrib.auth.backends.ModelBackend', 'django.contrib.auth.backends.RemoteUserBackend']
+        with self.settings(AUTHENTICATION_BACKENDS=backends), \
+                mock.patch.object(login, 'authenticate', return_value=None) as authenticate:
+            for name in ('user_login', 'user_login_async'):
+                self.assertEqual(self.post(name, 'testcustomer', 'testpassword').status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(authenticate.call_count, 2)
+        print("Integracion - Prueba la señal de login fallido y los backends configurados")
+
+    # Prueba que con el pool saturado el login responde 429
+    def test_saturated_pool_returns_429(self):
+        with mock.patch.object(login, '_slots', threading.BoundedSemaphore(1)) as slots:
+            slots.acquire()
+            response = self.post('user_login', 'testcustomer', 'testpassword')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '1')
+        print("Integracion - Prueba que el pool saturado responde 429")
@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+from asgiref.sync import sync_to_async
+import re
+from decimal import Decimal
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from entrega import metrics
+from entrega.compression import invalidate_catalog
+from entrega.models import Customer, Product, User
+
+class MetricsTest(TestCase):
+    def setUp(self):
+        # Crea un producto y deja el registro de métricas vacío
+        Product.objects.create(product_name="Martillo", unit_price=Decimal('9.99'))
+        metrics.registry.clear()
+        self.addCleanup(metrics.registry.clear)
+        # Las páginas del catálogo en caché sobreviven al rollback de cada prueba
+        invalidate_catalog()
+        print("Integracion - Crear producto y limpiar métricas")
+
+    def scrape(self, **kwargs):
+        # Sin token el endpoint solo responde con DEBUG
+        with override_settings(DEBUG=True):
+            response = self.client.get(reverse('metrics'), **kwargs)
+        return response, response.content.decode()
+
+    # Prueba que se registran latencia, estado, consultas y serializadores por ruta (sin la caché del catálogo)
+    @override_settings(COMPRESSION={**settings.COMPRESSION, 'CATALOG_VIEWS': ()})
+    def test_records_requests_per_route(self):
+        self.client.get(reverse('product_list'))
+        self.client.get(reverse('product_list'))
+        self.client.get(reverse('product_detail', args=[999999]))
+
+        response, text = self.scrape()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn('ferremas_http_requests_total{method="GET",route="product_list",status="200"} 2', text)
+        self.assertIn('ferremas_http_requests_total{method="GET",route="product_detail",status="404"} 1', text)
+        self.assertIn('ferremas_http_request_duration_seconds_bucket{method="GET",route="product_list",le="+Inf"} 2', text)
+        self.assertIn('ferremas_http_request_duration_seconds_count{method="GET",route="product_list"} 2', text)
+        self.assertIn('ferremas_db_queries_total{alias="default",route="product_list"}', text)
+        self.assertIn('ferremas_serializer_duration_seconds_count{phase="render",serializer="ProductSerializer(many)"} 2', text)
+        print("Integracion - Prueba las métricas por ruta")
+
+    # Prueba que las vistas asíncronas registran sus consultas hechas en otros hilos
+    async def test_records_async_requests(self):
+        response = await self.async_client.get(reverse('product_list_async'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        text = metrics.render()
+        self.assertIn('ferremas_http_requests_total{method="GET",route="product_list_async",status="200"} 1', text)
+        self.assertIn('ferremas_db_queries_total{alias="default",route="product_list_async"}', text)
+        print("Integracion - Prueba las métricas de una vista asíncrona")
+
+    def streamed_customers(self):
+        # Un empleado y tres clientes, leídos de a uno por página
+        User.objects.create_user(username="testemployee", password="testpassword", user_type="employee")
+        for i in range(3):
+            user = User.objects.create_user(username=f"cliente{i}", password="testpassword", user_type="customer")
+            Customer.objects.create(user=user, contact_name=f"Cliente {i}")
+        override = override_settings(STREAMING={'CHUNK_SIZE': 1})
+        override.enable()
+        self.addCleanup(override.disable)
+        token = self.client.post(
+            reverse('token_obtain_pair'), {'username': "testemployee", 'password': 'testpassword'}
+        ).data['access']
+        return {'Authorization': f'Bearer {token}', 'Accept': 'application/json'}
+
+    def queries(self, route):
+        found = re.search(rf'ferremas_db_queries_total{{alias="default",route="{route}"}} (\d+)', metrics.render())
+        return found and int(found[1])
+
+    # Prueba que una respuesta en streaming se registra al cerrarse, con las consultas de todas sus páginas
+    def test_records_streamed_responses(self):
+        headers = self.streamed_customers()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('customer_list'), headers=headers)
+            self.assertIsNone(self.queries('customer_list'))
+            self.assertEqual(len(json.loads(b''.join(response.streaming_content))), 3)
+        # Autenticación más cuatro páginas (la última vacía)
+        self.assertGreaterEqual(len(queries), 4)
+        self.assertEqual(self.queries('customer_list'), len(queries))
+        self.assertIn('ferremas_http_requests_total{method="GET",route="customer_list",status="200"} 1',
+                      metrics.render())
+        print("Integracion - Prueba las métricas de una respuesta en streaming")
+
+    # Prueba lo mismo bajo ASGI, donde las páginas se leen en otro hilo
+    async def test_records_async_streamed_responses(self):
+        headers = await sync_to_async(self.streamed_customers)()
+        response = await self.async_client.get(reverse('customer_list'), headers=headers)
+        self.assertIsNone(self.queries('customer_list'))
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(json.loads(b''.join(chunks))), 3)
+        self.assertGreaterEqual(self.queries('customer_list'), 4)
+        print("Integracion - Prueba las métricas de una respuesta en streaming bajo ASGI")
+
+    # Prueba que los histogramas son acumulativos y que se calcula la tasa de aciertos de caché
+    def test_histogram_and_cache_ratio(self):
+        for value in (0.001, 0.02, 20):
+            metrics.registry.observe('http_request_duration_seconds', {'route': 'x', 'method': 'GET'}, value)
+        for hit in (True, True, True, False):
+            metrics.record_cache('test', hit)
+
+        text = metrics.render()
+        self.assertIn('ferremas_http_request_duration_seconds_bucket{method="GET",route="x",le="0.005"} 1', text)
+        self.assertIn('ferremas_http_request_duration_seconds_bucket{method="GET",route="x",le="0.025"} 2', text)
+        self.assertIn('ferremas_http_request_duration_seconds_bucket{method="GET",route="x",le="10"} 2', text)
+        self.assertIn('ferremas_http_request_duration_seconds_bucket{method="GET",route="x",le="+Inf"} 3', text)
+        self.assertIn('ferremas_cache_hit_ratio{cache="test"} 0.75', text)
+        print("Unitaria -  Prueba histogramas y tasa de aciertos")
+
+    # Prueba que /metrics suma los archivos de los demás procesos
+    def test_aggregates_worker_files(self):
+        with tempfile.TemporaryDirectory() as tmp, override_settings(METRICS={'DIR': tmp}):
+            metrics.record_cache('test', True)
+            metrics.flush()
+            self.assertTrue(os.path.exists(os.path.join(tmp, f'metrics-{os.getpid()}.json')))
+
+            other = metrics.registry.snapshot()
+            with open(os.path.join(tmp, 'metrics-1.json'), 'w') as f:
+                json.dump(other, f)
+            metrics.record_cache('test', False)
+
+            text = metrics.render()
+        self.assertIn('ferremas_cache_requests_total{cache="test",result="hit"} 2', text)
+        self.assertIn('ferremas_cache_requests_total{cache="test",result="miss"} 1', text)
+        print("Unitaria -  Prueba la suma de métricas entre procesos")
+
+    # Prueba que con METRICS['TOKEN'] el endpoint exige el token
+    def test_token(self):
+        with override_settings(METRICS={'TOKEN': 'secret'}):
+            self.assertEqual(self.scrape()[0].status_code, status.HTTP_401_UNAUTHORIZED)
+            response, _ = self.scrape(HTTP_AUTHORIZATION='Bearer secret')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Sin token y sin DEBUG el endpoint se niega
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertNotIn(b'ferremas_', response.content)
+        print("Integracion - Prueba el token del endpoint de métricas")
@@ -29,9 +29,10 @@ class CategoryModelTest(TestCase):
         print("Unitaria -  Prueba el método __str__ cuando category_name es None")
 
 class ProductModelTest(TestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         # Crea una categoría para usarla como ForeignKey en los productos
-        self.category = Category.objects.create(category_name="Electricidad")
+        cls.category = Category.objects.create(category_name="Electricidad")
         print("Unitaria -  Crea una categoría para usarla como ForeignKey en los productos")
 
     # Prueba que se puede crear un producto con los campos obligatorios
@@ -0,0 +1,95 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from entrega.models import Order, Customer, User
+
+class OrderStatusTest(TestCase):
+    def setUp(self):
+        # Crea un empleado, un cliente y una orden pendiente del cliente
+        User.objects.create_user(username="testemployee", password="testpassword", user_type="employee")
+        customer_user = User.objects.create_user(username="testcustomer", password="testpassword", user_type="customer")
+        self.customer = Customer.objects.create(user=customer_user)
+        self.order = Order.objects.create(customer=self.customer, order_date=timezone.now())
+        self.employee_token = self.token('testemployee')
+        self.customer_token = self.token('testcustomer')
+        print("Integracion - Crear empleado, cliente y orden pendiente")
+
+    def token(self, username):
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': username, 'password': 'testpassword'},
+            content_type='application/json'
+        )
+        return response.json().get('access')
+
+    def change_status(self, new_status, token):
+        return self.client.put(
+            reverse('order_status', args=[self.order.pk]), {'status': new_status},
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            content_type='application/json'
+        )
+
+    # Prueba una secuencia de transiciones válidas hasta despachado
+    def test_valid_transitions(self):
+        for new_status in ('paid', 'picking', 'shipped'):
+            response = self.change_status(new_status, self.employee_token)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'shipped')
+        self.assertIsNotNone(self.order.shipped_date)
+        print("Integracion - Prueba transiciones válidas de estado de orden")
+
+    # Prueba que una transición no permitida es rechazada
+    def test_invalid_transition(self):
+        response = self.change_status('delivered', self.employee_token)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'pending')
+        print("Integracion - Prueba que una transición inválida es rechazada")
+
+    # Prueba que el cliente solo puede cancelar su orden
+    def test_customer_can_only_cancel(self):
+        self.assertEqual(self.change_status('paid', self.customer_token).status_code, status.HTTP_403_FORBIDDEN)
+        # Solo órdenes pendientes: una pagada o en preparación ya no
+        for current in ('paid', 'picking'):
+            Order.objects.filter(pk=self.order.pk).update(status=current)
+            self.assertEqual(self.change_status('cancelled', self.customer_token).status_code, status.HTTP_403_FORBIDDEN)
+            self.order.refresh_from_db()
+            self.assertEqual(self.order.status, current)
+        Order.objects.filter(pk=self.order.pk).update(status='pending')
+        self.assertEqual(self.change_status('cancelled', self.customer_token).status_code, status.HTTP_200_OK)
+        print("Integracion - Prueba que el cliente solo puede cancelar su orden")
+
+    # Prueba que fijar shipped_date al actualizar la orden pasa por la transición a despachado
+    def test_update_shipped_date_ships_order(self):
+        def update(data):
+            return self.client.put(
+                reverse('order_update', args=[self.order.pk]), data,
+                HTTP_AUTHORIZATION=f'Bearer {self.employee_token}',
+                content_type='application/json'
+            )
+        shipped_date = timezone.now().isoformat()
+        self.assertEqual(update({'shipped_date': shipped_date}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.order.refresh_from_db()
+        self.assertEqual((self.order.status, self.order.shipped_date), ('pending', None))
+        
+        Order.objects.filter(pk=self.order.pk).update(status='paid')
+        response = update({'shipped_date': shipped_date, 'freight': '2990.00'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['status'], 'shipped')
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, 'shipped')
+        self.assertIsNotNone(self.order.shipped_date)
+        print("Integracion - Prueba que fijar shipped_date despacha la orden")
+
+    # Prueba la cola de órdenes por estado
+    def test_status_queue(self):
+        Order.objects.create(order_date=timezone.now(), status='paid')
+        response = self.client.get(
+            reverse('order_status_queue'), {'status': 'paid'},
+            HTTP_AUTHORIZATION=f'Bearer {self.employee_token}'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([o['status'] for o in response.json()], ['paid'])
+        print("Integracion - Prueba la cola de órdenes por estado")
@@ -0,0 +1,151 @@
+import os
+import pstats
+import tempfile
+import time
+from decimal import Decimal
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from entrega import profiling, revocation
+from entrega.models import Product, User
+
+class ProfilingTest(TestCase):
+    def setUp(self):
+        # Crea un empleado, un cliente y un producto, y un directorio para los perfiles
+        User.objects.create_user(username="testemployee", password="testpassword", user_type="employee")
+        User.objects.create_user(username="testcustomer", password="testpassword", user_type="customer")
+        Product.objects.create(product_name="Sierra", unit_price=Decimal('39.90'))
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        # Los tokens se gastan en una caché compartida entre procesos (archivos)
+        self.profiling = {'DIR': self.dir, 'CACHE': 'profiling'}
+        shared = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                  'LOCATION': os.path.join(self.dir, 'cache')}
+        override = override_settings(PROFILING=self.profiling, CACHES={**settings.CACHES, 'profiling': shared})
+        override.enable()
+        self.addCleanup(override.disable)
+        cache.clear()
+        self.addCleanup(cache.clear)
+        print("Integracion - Crear empleado, cliente y directorio de perfiles")
+
+    def headers(self, username):
+        token = self.client.post(
+            reverse('token_obtain_pair'), {'username': username, 'password': 'testpassword'}
+        ).data['access']
+        return {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+    def profile_token(self):
+        response = self.client.post(reverse('profiling_token'), **self.headers('testemployee'))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['token']
+
+    # Prueba que solo los empleados obtienen tokens de perfilado
+    def test_token_employee_only(self):
+        response = self.client.post(reverse('profiling_token'), **self.headers('testcustomer'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        print("Integracion - Prueba que solo empleados perfilan")
+
+    # Prueba que un request con el token queda perfilado con cProfile, una sola vez
+    def test_profiles_request_once(self):
+        token = self.profile_token()
+        response = self.client.get(reverse('product_list'), HTTP_X_PROFILE=token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profile_id = response['X-Profile-Id']
+        self.assertIn('-product_list-', profile_id)
+        stats = pstats.Stats(os.path.join(self.dir, f'{profile_id}.pstats'))
+        self.assertTrue(any(func[2] == 'get' and 'viewsProducts' in func[0] for func in stats.stats))
+
+        response = self.client.get(reverse('product_list'), HTTP_X_PROFILE=token)
+        self.assertNotIn('X-Profile-Id', response)
+        response = self.client.get(reverse('product_list'), HTTP_X_PROFILE=token + 'x')
+        self.assertNotIn('X-Profile-Id', response)
+
+        response = self.client.get(reverse('profile_list'), **self.headers('testemployee'))
+        self.assertEqual([p['id'] for p in response.data], [profile_id])
+        self.assertEqual(response.data[0]['route'], 'product_list')
+        self.assertEqual(response.data[0]['status'], 200)
+        print("Integracion - Prueba el perfilado de un request")
+
+    # Prueba que en ASGI el perfil incluye el trabajo síncrono de la vista asíncrona
+    async def test_profiles_async_request(self):
+        token = await sync_to_async(self.profile_token)()
+        response = await self.async_client.get(reverse('product_list_async'), headers={'X-Profile': token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = pstats.Stats(os.path.join(self.dir, f"{response['X-Profile-Id']}.pstats"))
+        # Las consultas del ORM asíncrono corren en el hilo perfilado
+        self.assertTrue(any(func[2] == 'execute' and 'sqlite3' in func[0] for func in stats.stats))
+        print("Integracion - Prueba el perfilado de un request ASGI")
+
+    # Prueba que el perfil de una respuesta en streaming incluye la lectura de sus páginas
+    def test_profiles_streamed_response(self):
+        response = self.client.get(reverse('customer_list'), HTTP_X_PROFILE=self.profile_token(),
+                                   **self.headers('testemployee'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b''.join(response.streaming_content), b'[]')
+        stats = pstats.Stats(os.path.join(self.dir, f"{response['X-Profile-Id']}.pstats"))
+        self.assertTrue(any(func[2] == 'pages' and 'streaming' in func[0] for func in stats.stats))
+        print("Integracion - Prueba el perfilado de una respuesta en streaming")
+
+    # Prueba lo mismo bajo ASGI, donde el cuerpo es un iterador asíncrono
+    async def test_profiles_async_streamed_response(self):
+        token = await sync_to_async(self.profile_token)()
+        headers = await sync_to_async(self.headers)('testemployee')
+        response = await self.async_client.get(
+            reverse('customer_list'), headers={'X-Profile': token, 'Authorization': headers['HTTP_AUTHORIZATION']}
+        )
+        self.assertTrue(response.is_async)
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), b'[]')
+        stats = pstats.Stats(os.path.join(self.dir, f"{response['X-Profile-Id']}.pstats"))
+        self.assertTrue(any(func[2] == 'pages' and 'streaming' in func[0] for func in stats.stats))
+        print("Integracion - Prueba el perfilado de una respuesta en streaming bajo ASGI")
+
+    # Prueba que sin caché compartida (LocMem) y sin DEBUG no se perfila
+    def test_refused_with_per_process_cache(self):
+        token = self.profile_token()
+        with override_settings(PROFILING={'DIR': self.dir}):
+            response = self.client.post(reverse('profiling_token'), **self.headers('testemployee'))
+            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            with self.assertLogs('entrega.profiling', 'WARNING'):
+                response = self.client.get(reverse('product_list'), HTTP_X_PROFILE=token)
+            self.assertNotIn('X-Profile-Id', response)
+            with override_settings(DEBUG=True):
+                self.assertTrue(profiling.available())
+        print("Integracion - Prueba que sin caché compartida no se perfila")
+
+    # Prueba que el token deja de servir si el empleado pierde su rol o se revocan sus tokens
+    def test_token_checks_issuer(self):
+        employee = User.objects.get(username="testemployee")
+        token = self.profile_token()
+        employee.user_type = 'customer'
+        employee.save()
+        response = self.client.get(reverse('product_list'), HTTP_X_PROFILE=token)
+        self.assertNotIn('X-Profile-Id', response)
+        employee.user_type = 'employee'
+        employee.save()
+
+        self.addCleanup(revocation._filter.reset)
+        # Emitido un segundo antes de revocar (iat tiene resolución de segundos)
+        token = signing.dumps({'user': employee.pk, 'iat': int(time.time()) - 1, 'nonce': 'n'}, salt=profiling._SALT)
+        revocation.revoke_user(employee.pk)
+        response = self.client.get(reverse('product_list'), HTTP_X_PROFILE=token)
+        self.assertNotIn('X-Profile-Id', response)
+        print("Integracion - Prueba que el token revisa al empleado que lo emitió")
+
+    # Prueba el formato de pilas colapsadas del muestreador
+    def test_collapsed_stacks(self):
+        with override_settings(PROFILING={**self.profiling, 'SAMPLE_INTERVAL': 0.0005}):
+            response = self.client.get(
+                reverse('product_list'), HTTP_X_PROFILE=self.profile_token(), HTTP_X_PROFILE_FORMAT='collapsed'
+            )
+        path = os.path.join(self.dir, f"{response['X-Profile-Id']}.collapsed")
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        for line in lines:
+            stack, count = line.rsplit(' ', 1)
+            self.assertTrue(int(count) > 0 and ';' in stack)
+        print("Unitaria -  Prueba el formato de pilas colapsadas")
@@ -0,0 +1,114 @@
+import csv
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from entrega import provisioning
+from entrega.models import Customer, Supplier, User
+
+class ProvisioningTest(TestCase):
+    def setUp(self):
+        # Crea un empleado y un cliente para probar el registro masivo
+        self.employee = User.objects.create_user(username="testemployee", password="testpassword", user_type="employee")
+        self.customer = User.objects.create_user(username="testcustomer", password="testpassword", user_type="customer")
+        Customer.objects.create(user=self.customer)
+        print("Integracion - Crear empleado y cliente para registro masivo")
+
+    def authenticate(self, username):
+        response = self.client.post(reverse('token_obtain_pair'), {'username': username, 'password': 'testpassword'})
+        return {'HTTP_AUTHORIZATION': f"Bearer {response.data['access']}"}
+
+    def rows(self, count, prefix='empresa'):
+        return [
+            {'username': f'{prefix}{i}', 'email': f'{prefix}{i}@ferremas.cl', 'password': 'Clave-Segura-123',
+             'first_name': f'Contacto {i}', 'last_name': 'B2B'}
+            for i in range(count)
+        ]
+
+    # Prueba que el pool de hilos conserva el orden y genera hashes válidos
+    def test_hash_passwords_in_thread_pool(self):
+        for workers in (None, 2):
+            hashed = provisioning.hash_passwords(['uno', 'dos', 'tres'], workers)
+            user = User(password=hashed[1])
+            self.assertTrue(user.check_password('dos'))
+            self.assertFalse(user.check_password('uno'))
+        print("Unitaria -  Prueba el hash de contraseñas en paralelo")
+
+    # Prueba que los usuarios y sus perfiles se crean en bloque y los tokens llevan los claims
+    def test_provision_users_creates_profiles_and_tokens(self):
+        users = provisioning.provision_users(self.rows(3), 'customer', workers=1, batch_size=2)
+        self.assertEqual(User.objects.filter(username__startswith='empresa').count(), 3)
+        customer = Customer.objects.get(user__username='empresa1')
+        self.assertEqual((customer.contact_name, customer.last_name), ('Contacto 1', 'B2B'))
+        self.assertTrue(User.objects.get(username='empresa1').check_password('Clave-Segura-123'))
+
+        with self.assertNumQueries(0):
+            tokens = provisioning.mint_tokens(users)
+        access = AccessToken(tokens['empresa1']['access'])
+        self.assertEqual(access['customer_id'], customer.pk)
+        self.assertEqual(access['user_type'], 'customer')
+        print("Unitaria -  Prueba el alta masiva con perfiles y tokens")
+
+    # Prueba que solo los empleados pueden usar el registro masivo
+    def test_bulk_register_requires_employee(self):
+        response = self.client.post(
+            reverse('user_register_bulk'), {'users': self.rows(1)},
+            content_type='application/json', **self.authenticate('testcustomer')
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        print("Integracion - Prueba que el registro masivo es solo para empleados")
+
+    # Prueba el registro masivo de empleados con tokens iniciales
+    def test_bulk_register_employees(self):
+        response = self.client.post(
+            reverse('user_register_bulk'),
+            {'user_type': 'employee', 'users': self.rows(2, 'bodega'), 'tokens': True},
+            content_type='application/json', **self.authenticate('testemployee')
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['users']), 2)
+        self.assertEqual(Supplier.objects.filter(user__username__startswith='bodega').count(), 2)
+        access = AccessToken(response.data['tokens']['bodega0']['access'])
+        self.assertEqual(access['supplier_id'], Supplier.objects.get(user__username='bodega0').pk)
+        print("Integracion - Prueba el registro masivo de empleados")
+
+    # Prueba que los nombres de usuario repetidos o existentes se rechazan sin crear nada
+    def test_bulk_register_rejects_conflicts(self):
+        rows = self.rows(2) + [dict(self.rows(1)[0]), dict(self.rows(1, 'testcustomer')[0], username='testcustomer')]
+        response = self.client.post(
+            reverse('user_register_bulk'), {'users': rows},
+            content_type='application/json', **self.authenticate('testemployee')
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('empresa0', str(response.data['users']))
+        self.assertIn('testcustomer', str(response.data['users']))
+        self.assertFalse(User.objects.filter(username__startswith='empresa').exists())
+        print("Integracion - Prueba el rechazo de usuarios repetidos")
+
+    # Prueba el comando import_users desde un CSV
+    def test_import_users_command(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'usuarios.csv')
+            tokens_path = os.path.join(tmp, 'tokens.json')
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=['username', 'email', 'password', 'first_name', 'last_name'])
+                writer.writeheader()
+                writer.writerows(self.rows(4))
+            out = StringIO()
+            call_command('import_users', path, '--hash-workers', '2', '--tokens', tokens_path, stdout=out)
+            with open(tokens_path, encoding='utf-8') as f:
+                tokens = json.load(f)
+
+            self.assertEqual(Customer.objects.filter(user__username__startswith='empresa').count(), 4)
+            self.assertEqual(set(tokens), {f'empresa{i}' for i in range(4)})
+            self.assertIn('users/s', out.getvalue())
+
+            with self.assertRaises(CommandError):
+                call_command('import_users', path, stdout=StringIO())
+        print("Integracion - Prueba el comando import_users")
@@ -0,0 +1,85 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework import status
+from entrega.archive import archive_orders
+from entrega.models import ArchivedOrder, Product, Order, Orderdetails, ProductRecommendation
+from entrega.recommendations import refresh_recommendations
+
+class RecommendationsTest(TestCase):
+    def setUp(self):
+        # Crea productos y órdenes donde martillo y clavos se compran juntos
+        self.martillo = Product.objects.create(product_name="Martillo", unit_price=5000)
+        self.clavos = Product.objects.create(product_name="Clavos", unit_price=1000)
+        self.sierra = Product.objects.create(product_name="Sierra", unit_price=8000)
+        self.create_order(self.martillo, self.clavos)
+        self.create_order(self.martillo, self.clavos, self.sierra)
+        print("Unitaria -  Crea productos y órdenes para recomendaciones")
+
+    def create_order(self, *products, **fields):
+        order = Order.objects.create(**fields)
+        for product in products:
+            Orderdetails.objects.create(order=order, product=product, unit_price=product.unit_price, quantity=1)
+        return order
+
+    # Prueba que el top-N se ordena por co-ocurrencia
+    def test_full_refresh_ranks_by_cooccurrence(self):
+        result = refresh_recommendations(full=True)
+        self.assertEqual(result['orders'], 2)
+        related = list(ProductRecommendation.objects.filter(product=self.martillo))
+        self.assertEqual([r.related_product for r in related], [self.clavos, self.sierra])
+        self.assertEqual([r.score for r in related], [2, 1])
+        print("Unitaria -  Prueba que el top-N se ordena por co-ocurrencia")
+
+    # Prueba que el refresco incremental solo procesa órdenes nuevas
+    def test_incremental_refresh(self):
+        refresh_recommendations(full=True)
+        self.create_order(self.martillo, self.sierra)
+        self.create_order(self.martillo, self.sierra)
+        result = refresh_recommendations()
+        self.assertEqual(result['orders'], 2)
+        top = ProductRecommendation.objects.get(product=self.martillo, rank=1)
+        self.assertEqual(top.related_product, self.sierra)
+        self.assertEqual(top.score, 3)
+        print("Unitaria -  Prueba que el refresco incremental solo procesa órdenes nuevas")
+
+    # Prueba que una orden con id menor confirmada después de una mayor igual se cuenta
+    def test_late_commit_with_lower_id(self):
+        refresh_recommendations(full=True)
+        newest = Order.objects.order_by('-order_id').first().order_id
+        self.create_order(self.clavos, self.sierra, order_id=newest + 10)
+        self.assertEqual(refresh_recommendations()['orders'], 1)
+        self.create_order(self.clavos, self.sierra, order_id=newest + 5)
+        self.assertEqual(refresh_recommendations()['orders'], 1)
+        self.assertEqual(ProductRecommendation.objects.get(product=self.sierra, related_product=self.clavos).score, 3)
+        print("Unitaria -  Prueba que una orden confirmada tarde igual se cuenta")
+
+    # Prueba que las órdenes archivadas siguen en las recomendaciones, contadas o no
+    def test_archived_orders_count(self):
+        old = timezone.now() - timedelta(days=800)
+        Order.objects.update(status='delivered', order_date=old)
+        self.create_order(self.martillo, self.sierra)
+        self.assertEqual(archive_orders(older_than_days=365), 2)
+        self.assertFalse(ArchivedOrder.objects.filter(recommendations_counted=True).exists())
+
+        # Sin contar al archivarse: el refresco incremental las lee del archivo
+        self.assertEqual(refresh_recommendations()['orders'], 3)
+        for full in (False, True):
+            result = refresh_recommendations(full=full)
+            self.assertEqual(result['orders'], 3 if full else 0)
+            top = ProductRecommendation.objects.get(product=self.martillo, rank=1)
+            self.assertEqual((top.related_product, top.score), (self.clavos, 2))
+        print("Unitaria -  Prueba que las órdenes archivadas siguen contando")
+
+    # Prueba que el detalle de producto incluye el bloque related solo cuando se pide
+    def test_product_detail_related_block(self):
+        refresh_recommendations(full=True)
+        url = reverse('product_detail', args=[self.clavos.pk])
+        response = self.client.get(url)
+        self.assertNotIn('related', response.json())
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'related': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['related'][0]['product_name'], "Martillo")
+        print("Integracion - Prueba que el detalle de producto incluye el bloque related")
@@ -0,0 +1,87 @@
+import io
+import json
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from entrega.compression import invalidate_catalog
+from entrega.models import Category, Product
+from entrega.renderers import FastJSONParser, FastJSONRenderer
+
+class FastJSONRendererTest(TestCase):
+    def setUp(self):
+        # Las páginas del catálogo en caché sobreviven al rollback de cada prueba
+        invalidate_catalog()
+
+    def assertSameOutput(self, data, accepted_media_type=None):
+        expected = JSONRenderer().render(data, accepted_media_type)
+        self.assertEqual(FastJSONRenderer().render(data, accepted_media_type), expected)
+
+    # Prueba que Decimal, fechas y demás tipos salen igual que con JSONRenderer
+    def test_same_output_as_json_renderer(self):
+        santiago = dt_timezone(timedelta(hours=-3))
+        self.assertSameOutput({
+            'unit_price': Decimal('4990.50'),
+            'freight': Decimal('0'),
+            'discount': Decimal('0.05'),
+            'order_date': datetime(2024, 12, 24, 18, 30, 5, 123456, tzinfo=dt_timezone.utc),
+            'required_date': datetime(2024, 12, 31, 9, 0, tzinfo=santiago),
+            'naive': datetime(2024, 1, 2, 3, 4, 5),
+            'day': date(2024, 2, 29),
+            'hour': time(8, 15),
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('Martillo'),
+            'rows': ({'product_name': 'Llave inglesa ñandú   línea', 'units_in_stock': 3}, None, True, 1.5),
+        })
+        print("Unitaria -  Prueba que la salida es idéntica a JSONRenderer")
+
+    # Prueba los casos que se delegan en JSONRenderer
+    def test_fallbacks(self):
+        self.assertSameOutput({'big': 2 ** 70})
+        self.assertSameOutput({1: 'clave no string'})
+        self.assertSameOutput({'a': [1, 2]}, 'application/json; indent=4')
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+        print("Unitaria -  Prueba los casos delegados en JSONRenderer")
+
+    # Prueba los Decimal y float que se escriben con exponente
+    def test_exponents(self):
+        for value in ('1E+16', '123456789012345678', '0.00001', '1.5E-7', '0.0001', '9999999999999999', '-0.000012'):
+            self.assertSameOutput({'raw': Decimal(value), 'rows': [Decimal(value)]})
+        with self.assertRaises(ValueError):
+            FastJSONRenderer().render({'raw': Decimal('NaN')})
+        
+        # Los float con exponente se escriben distinto pero son el mismo número
+        for value in (0.1, 1.5, 1e15, 0.0001, 1e16, 1.5e-7, 0.00001, -2.5e300):
+            rendered = FastJSONRenderer().render({'value': value})
+            self.assertEqual(json.loads(rendered), json.loads(JSONRenderer().render({'value': value})))
+            if 1e-4 <= abs(value) < 1e16:
+                self.assertSameOutput({'value': value})
+        print("Unitaria -  Prueba los números con exponente")
+
+    # Prueba que el parser da los mismos datos y errores que JSONParser
+    def test_parser(self):
+        body = '{"product": 3, "num_of_products": 2, "price": 4990.5, "name": "Cañería", "big": 123456789012345678901234}'
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body.encode())),
+            JSONParser().parse(io.BytesIO(body.encode())),
+        )
+        for invalid in (b'{"a": NaN}', b'{"a": ', b'\xff'):
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(invalid))
+        print("Unitaria -  Prueba el parser JSON rápido")
+
+    # Prueba que la API usa el renderer configurado en REST_FRAMEWORK (sin la caché del catálogo)
+    @override_settings(COMPRESSION={**settings.COMPRESSION, 'CATALOG_VIEWS': ()})
+    def test_api_response(self):
+        category = Category.objects.create(category_name="Herramientas")
+        Product.objects.create(product_name="Martillo", category=category, unit_price=Decimal('4990.00'))
+        response = self.client.get(reverse('product_list'), HTTP_ACCEPT='application/json')
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+        print("Integracion - Prueba el renderer configurado en la API")
@@ -0,0 +1,109 @@
+from decimal import Decimal
+from unittest import mock
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from entrega.db import routers
+from entrega.models import Customer, Product, User
+
+class ReplicaRoutingTest(TestCase):
+    def setUp(self):
+        # Crea un cliente y un producto, y limpia los pines de lectura
+        customer_user = User.objects.create_user(username="testcustomer", password="testpassword", user_type="customer")
+        Customer.objects.create(user=customer_user)
+        self.product = Product.objects.create(product_name="Taladro", unit_price=Decimal('149.99'))
+        cache.clear()
+        self.addCleanup(cache.clear)
+        print("Integracion - Crear cliente y producto para enrutamiento de lecturas")
+
+    def headers(self):
+        token = self.client.post(
+            reverse('token_obtain_pair'), {'username': 'testcustomer', 'password': 'testpassword'}
+        ).data['access']
+        return {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+    def replica_flags(self, method, url, **kwargs):
+        # Registra si cada lectura del request iba hacia la réplica
+        flags = []
+        def record(router, model, **hints):
+            flags.append(routers._read_from_replica.get())
+            return 'default'
+        with mock.patch.object(routers.ReplicaRouter, 'db_for_read', autospec=True, side_effect=record):
+            response = getattr(self.client, method)(url, **kwargs)
+            if response.streaming:
+                # Las respuestas en streaming consultan mientras se leen
+                response.streamed = b''.join(response.streaming_content)
+        return response, flags
+
+    # Prueba el middleware en una cadena ASGI, sin adaptarlo a síncrono
+    async def test_async_middleware(self):
+        async def get_response(request):
+            return None
+        self.assertTrue(iscoroutinefunction(routers.ReplicaRoutingMiddleware(get_response)))
+
+        flags = []
+        def record(router, model, **hints):
+            flags.append(routers._read_from_replica.get())
+            return 'default'
+        headers = await sync_to_async(self.headers)()
+        with mock.patch.object(routers.ReplicaRouter, 'db_for_read', autospec=True, side_effect=record):
+            response = await self.async_client.get(reverse('product_list_async'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(flags and all(flags))
+
+        response = await self.async_client.post(
+            reverse('cart'), {'product': self.product.pk, 'num_of_products': 1},
+            content_type='application/json', headers={'Authorization': headers['HTTP_AUTHORIZATION']}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user_id = await sync_to_async(User.objects.values_list('pk', flat=True).get)(username='testcustomer')
+        self.assertTrue(await sync_to_async(routers.is_pinned)(user_id))
+        print("Integracion - Prueba el enrutamiento de lecturas en ASGI")
+
+    # Prueba que el router usa la réplica solo si está configurada y fuera de transacciones
+    def test_router_choices(self):
+        router = routers.ReplicaRouter()
+        token = routers._read_from_replica.set(True)
+        self.addCleanup(routers._read_from_replica.reset, token)
+        self.assertEqual(router.db_for_read(Product), 'default')
+        with mock.patch.dict(settings.DATABASES, {'replica': settings.DATABASES['default']}):
+            # TestCase ya corre dentro de una transacción
+            self.assertEqual(router.db_for_read(Product), 'default')
+            with mock.patch.object(connection, 'in_atomic_block', False):
+                self.assertEqual(router.db_for_read(Product), 'replica')
+        self.assertEqual(router.db_for_write(Product), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'entrega'))
+        print("Unitaria -  Prueba las decisiones del router de réplica")
+
+    # Prueba que las lecturas del catálogo van a la réplica y las escrituras no
+    def test_catalog_reads_use_replica(self):
+        response, flags = self.replica_flags('get', reverse('product_list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(flags and all(flags))
+
+        _, flags = self.replica_flags('get', reverse('user_profile'), **self.headers())
+        self.assertFalse(any(flags))
+        print("Integracion - Prueba que el catálogo lee desde la réplica")
+
+    # Prueba que después de escribir en el carrito el cliente lee desde el primario
+    def test_reads_stick_to_primary_after_write(self):
+        headers = self.headers()
+        response = self.client.post(
+            reverse('cart'), {'product': self.product.pk, 'num_of_products': 1},
+            content_type='application/json', **headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        _, flags = self.replica_flags('get', reverse('order_list'), **headers)
+        self.assertFalse(any(flags))
+        _, flags = self.replica_flags('get', reverse('product_list'))
+        self.assertTrue(all(flags))
+
+        cache.clear()
+        _, flags = self.replica_flags('get', reverse('order_list'), **headers)
+        self.assertTrue(flags and all(flags))
+        print("Integracion - Prueba la lectura de lo propio tras escribir")
@@ -0,0 +1,61 @@
+import json
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from entrega import schema
+
+class SchemaTest(TestCase):
+    def setUp(self):
+        # Directorio temporal para los archivos del esquema y caché vacía
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        override = override_settings(OPENAPI_SCHEMA={'ARTIFACT_DIR': self.tmp.name, 'USE_ARTIFACT': True})
+        override.enable()
+        self.addCleanup(override.disable)
+        schema.clear()
+        self.addCleanup(schema.clear)
+        print("Integracion - Preparar directorio del esquema OpenAPI")
+
+    # Prueba que el esquema se genera una sola vez para todas las páginas y documentos
+    def test_schema_generated_once(self):
+        with mock.patch.object(schema, 'generate_schema', wraps=schema.generate_schema) as generate:
+            for _ in range(2):
+                self.assertEqual(self.client.get('/').status_code, status.HTTP_200_OK)
+                self.assertEqual(self.client.get(reverse('schema-redoc')).status_code, status.HTTP_200_OK)
+                response = self.client.get(reverse('schema-json', kwargs={'format': '.json'}))
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(generate.call_count, 1)
+        document = json.loads(response.content)
+        self.assertEqual(document['basePath'], '/api')
+        self.assertIn('/products/', document['paths'])
+        print("Integracion - Prueba que el esquema se genera una vez por proceso")
+
+    # Prueba que el documento responde 304 cuando el ETag coincide
+    def test_etag(self):
+        url = reverse('schema-json', kwargs={'format': '.yaml'})
+        response = self.client.get(url)
+        self.assertEqual(response['Content-Type'], 'application/yaml')
+        self.assertIn('max-age', response['Cache-Control'])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        print("Integracion - Prueba el ETag del documento OpenAPI")
+
+    # Prueba que build_schema escribe los archivos y que se sirven sin generar el esquema
+    def test_build_schema_artifact(self):
+        call_command('build_schema', stdout=StringIO())
+        call_command('build_schema', '--check', stdout=StringIO())
+        path = schema.artifact_path('json')
+        self.assertEqual(path.name, 'schema-v1.json')
+        schema.clear()
+
+        with mock.patch.object(schema, 'generate_schema') as generate:
+            response = self.client.get(reverse('schema-json', kwargs={'format': '.json'}))
+        generate.assert_not_called()
+        self.assertEqual(response.content, path.read_bytes())
+        print("Integracion - Prueba el archivo versionado del esquema")
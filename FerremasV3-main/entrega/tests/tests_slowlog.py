@@ -0,0 +1,86 @@
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from entrega.db import slowlog
+from entrega.models import Product, User
+
+class SlowQueryLogTest(TestCase):
+    def setUp(self):
+        # Registra todas las consultas (umbral 0) en un archivo temporal
+        Product.objects.create(product_name="Taladro percutor", unit_price=Decimal('89.90'))
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.file = os.path.join(tmp.name, 'slow.log')
+        override = override_settings(SLOW_QUERIES={'THRESHOLD_MS': 0, 'FILE': self.file})
+        override.enable()
+        self.addCleanup(override.disable)
+        slowlog.install(connection)
+        self.addCleanup(connection.execute_wrappers.remove, connection.execute_wrappers[0])
+        print("Integracion - Activar el registro de consultas lentas")
+
+    # Prueba que se registran vista, línea de código y plan de la consulta
+    def test_logs_view_frame_and_plan(self):
+        response = self.client.get(reverse('product_list'), {'search': 'taladro'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        entries = [e for e in slowlog.read_entries() if 'FROM "Product"' in e['sql']]
+        self.assertTrue(entries)
+        entry = entries[-1]
+        self.assertTrue(entry['view'].startswith('product_list (GET /api/products/'))
+        self.assertIn(os.path.join('entrega', 'views', 'viewsProducts.py'), entry['frame'])
+        self.assertEqual(entry['param_count'], 2)
+        self.assertNotIn('params', entry)
+        self.assertTrue(entry['explain'])
+        self.assertNotIn('EXPLAIN failed', entry['explain'][0])
+        print("Integracion - Prueba el registro de una consulta lenta")
+
+    # Prueba que los valores de los parámetros (hashes, datos de clientes) solo se registran si se pide
+    def test_params_only_with_log_params(self):
+        user = User.objects.create_user(username="cliente", password="Clave-Secreta-1", email="cliente@ferremas.cl")
+        inserts = [e for e in slowlog.read_entries() if e['sql'].startswith('INSERT INTO "auth_user"')]
+        self.assertTrue(inserts and inserts[-1]['param_count'] > 0)
+        with open(self.file, encoding='utf-8') as f:
+            lines = f.read()
+        self.assertNotIn(user.password, lines)
+        self.assertNotIn('cliente@ferremas.cl', lines)
+
+        with override_settings(SLOW_QUERIES={'THRESHOLD_MS': 0, 'FILE': self.file, 'LOG_PARAMS': True}):
+            self.client.get(reverse('product_list'), {'search': 'taladro'})
+        entries = [e for e in slowlog.read_entries() if 'FROM "Product"' in e['sql']]
+        self.assertIn("'%taladro%'", entries[-1]['params'])
+        print("Integracion - Prueba que los parámetros no se registran por defecto")
+
+    # Prueba que las vistas asíncronas también etiquetan sus consultas
+    async def test_logs_async_view(self):
+        response = await self.async_client.get(reverse('product_list_async'), {'search': 'taladro'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        views = [e['view'] for e in slowlog.read_entries() if 'FROM "Product"' in e['sql']]
+        self.assertTrue(views and views[-1].startswith('product_list_async (GET /api/'))
+        print("Integracion - Prueba el registro de consultas de una vista asíncrona")
+
+    # Prueba que el reporte agrupa consultas iguales con distintos parámetros
+    def test_report_groups_by_fingerprint(self):
+        for product_id in (1, 2, 3):
+            self.client.get(reverse('product_detail', args=[product_id]))
+        out = StringIO()
+        call_command('slowqueries', '--view', 'product_detail', '--sort', 'count', stdout=out)
+        report = out.getvalue()
+        self.assertIn('#1  3 queries', report)
+        self.assertIn('WHERE "Product"."product_id" = ? LIMIT ?', report)
+        self.assertIn('plan:', report)
+        print("Integracion - Prueba el reporte de consultas lentas")
+
+class FingerprintTest(SimpleTestCase):
+    # Prueba la normalización de SQL
+    def test_fingerprint(self):
+        self.assertEqual(
+            slowlog.fingerprint("SELECT *  FROM t2 WHERE a = 'x''y' AND b IN (%s, %s, %s) LIMIT 21"),
+            slowlog.fingerprint("SELECT * FROM t2 WHERE a = 'z' AND b IN (%s) LIMIT 5"),
+        )
+        print("Unitaria -  Prueba la huella de las consultas")
@@ -0,0 +1,43 @@
+import os
+import sqlite3
+import tempfile
+from django.db import connection, connections, transaction
+from django.test import SimpleTestCase
+from entrega.db.sqlite_tuned.base import DatabaseWrapper
+
+class SqliteTunedTest(SimpleTestCase):
+    def setUp(self):
+        # Crea una base SQLite temporal con el backend ajustado
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'tuned.sqlite3')
+        settings_dict = dict(connection.settings_dict, ENGINE='entrega.db.sqlite_tuned', NAME=self.path)
+        settings_dict.pop('PRAGMAS', None)
+        self.wrapper = DatabaseWrapper(settings_dict, alias='tuned')
+        self.addCleanup(self.wrapper.close)
+        print("Unitaria -  Crear base SQLite temporal con el backend ajustado")
+
+    def pragma(self, name):
+        with self.wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    # Prueba que los pragmas se aplican en cada conexión nueva
+    def test_pragmas_applied_on_connect(self):
+        self.assertEqual(self.pragma('journal_mode'), 'wal')
+        self.assertEqual(self.pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma('busy_timeout'), 20000)
+        self.assertEqual(self.pragma('foreign_keys'), 1)
+        print("Unitaria -  Prueba los pragmas del backend SQLite ajustado")
+
+    # Prueba que las transacciones toman el lock de escritura al comenzar
+    def test_transactions_begin_immediate(self):
+        connections['tuned'] = self.wrapper
+        self.addCleanup(connections.__delitem__, 'tuned')
+        other = sqlite3.connect(self.path, timeout=0)
+        self.addCleanup(other.close)
+        with transaction.atomic(using='tuned'):
+            # Sin escribir nada, la transacción ya tiene el lock de escritura
+            with self.assertRaises(sqlite3.OperationalError):
+                other.execute('BEGIN IMMEDIATE')
+        print("Unitaria -  Prueba que las transacciones comienzan con BEGIN IMMEDIATE")
@@ -0,0 +1,110 @@
+import gzip
+import json
+import warnings
+from decimal import Decimal
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from entrega.models import Customer, Order, Orderdetails, Product, User
+from entrega.serializers import CustomerSerializer, OrderSerializer
+from entrega.streaming import StreamingJSONRenderer, pages
+
+@override_settings(STREAMING={'CHUNK_SIZE': 4})
+class StreamingListTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Crea un empleado y 10 clientes con una orden de dos líneas cada uno
+        User.objects.create_user(username="testemployee", password="testpassword", user_type="employee")
+        product = Product.objects.create(product_name="Taladro", unit_price=Decimal('49990.00'))
+        for i in range(10):
+            user = User.objects.create_user(username=f"cliente{i}", password="testpassword", user_type="customer")
+            customer = Customer.objects.create(user=user, contact_name=f"Cliente {i}")
+            order = Order.objects.create(customer=customer, order_date=timezone.now(), freight=Decimal('2990.00'))
+            for quantity in (1, 3):
+                Orderdetails.objects.create(order=order, product=product, unit_price=Decimal('49990.00'),
+                                            quantity=quantity, discount=Decimal('0.00'))
+        print("Integracion - Crear empleado y clientes con órdenes")
+
+    def get(self, name, username="testemployee", accept='application/json', **params):
+        token = self.client.post(
+            reverse('token_obtain_pair'), {'username': username, 'password': 'testpassword'}
+        ).data['access']
+        return self.client.get(reverse(name), params, HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_ACCEPT=accept)
+
+    # Prueba que las páginas se leen por clave primaria con el tamaño pedido
+    def test_pages(self):
+        self.assertEqual([len(page) for page in pages(Order.objects.all(), 4)], [4, 4, 2])
+        self.assertEqual([len(page) for page in pages(Order.objects.all(), 5)], [5, 5])
+        self.assertEqual(list(pages(Order.objects.none(), 4)), [])
+        self.assertEqual(b''.join(StreamingJSONRenderer().render_pages([])), b'[]')
+        print("Unitaria -  Prueba la paginación por clave primaria")
+
+    # Prueba que la lista de órdenes en streaming es idéntica a la lista renderizada de una vez
+    def test_order_list_streamed(self):
+        with self.assertNumQueries(3 + 3 * 3):
+            # Usuario y sus perfiles, y por página: órdenes con cliente y transportista, líneas y productos
+            response = self.get('order_list')
+            body = b''.join(response.streaming_content)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        expected = JSONRenderer().render(OrderSerializer(Order.objects.order_by('pk'), many=True).data)
+        self.assertEqual(body, expected)
+        self.assertEqual(len(json.loads(body)), 10)
+
+        response = self.get('order_list', username="cliente3")
+        orders = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([order['customer_name'] for order in orders], ["Cliente 3"])
+        print("Integracion - Prueba la lista de órdenes en streaming")
+
+    # Prueba la lista de clientes en streaming, solo para empleados
+    def test_customer_list_streamed(self):
+        response = self.get('customer_list')
+        body = b''.join(response.streaming_content)
+        expected = JSONRenderer().render(CustomerSerializer(Customer.objects.order_by('pk'), many=True).data)
+        self.assertEqual(body, expected)
+        self.assertEqual(json.loads(body)[0]['username'], "cliente0")
+
+        response = self.get('customer_list', username="cliente0")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        print("Integracion - Prueba la lista de clientes en streaming")
+
+    # Prueba que solo se hace streaming cuando el formato negociado es JSON
+    def test_browsable_api_not_streamed(self):
+        for name in ('order_list', 'customer_list'):
+            response = self.get(name, accept='text/html')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertFalse(response.streaming)
+            self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+            self.assertEqual(len(response.data), 10)
+        response = self.get('order_list', accept='*/*', format='api')
+        self.assertFalse(response.streaming)
+        self.assertContains(response, "Cliente 3")
+        print("Integracion - Prueba la API navegable en las listas")
+
+    async def aget(self, name, **headers):
+        response = await self.async_client.post(
+            reverse('token_obtain_pair'), {'username': "testemployee", 'password': 'testpassword'}
+        )
+        headers = {'Authorization': f'Bearer {response.data["access"]}', 'Accept': 'application/json', **headers}
+        response = await self.async_client.get(reverse(name), headers=headers)
+        # Bajo ASGI el cuerpo es un iterador asíncrono: Django no lo lee entero antes de enviarlo
+        self.assertTrue(response.is_async)
+        return response, b''.join([chunk async for chunk in response.streaming_content])
+
+    # Prueba las listas en streaming bajo ASGI, sin compresión y con gzip
+    async def test_streamed_under_asgi(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            response, body = await self.aget('order_list')
+        self.assertFalse([w for w in caught if 'synchronous iterators' in str(w.message)])
+        self.assertEqual(len(json.loads(body)), 10)
+        response, body = await self.aget('order_list_async')
+        self.assertEqual(len(json.loads(body)), 10)
+
+        response, plain = await self.aget('customer_list')
+        response, compressed = await self.aget('customer_list', **{'Accept-Encoding': 'gzip'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed), plain)
+        self.assertEqual(json.loads(plain)[0]['username'], "cliente0")
+        print("Integracion - Prueba las listas en streaming bajo ASGI")
@@ -1,28 +1,17 @@
 from django.urls import path, include, re_path
 from .views import (
     viewsAuth, viewsProducts, viewsCategories, viewsSuppliers, 
-    viewsCart, viewsOrder, viewsCustomer, viewsShipper
+    viewsCart, viewsOrder, viewsCustomer, viewsShipper, viewsJobs, viewsOrderShipper,
+    viewsOrderStatus, viewsAsync, viewsDatabase, viewsMetrics, viewsProfiling
 )
 from django.conf import settings
 from django.conf.urls.static import static
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Ecommerce API",
-        default_version='v1',
-        description="API documentation for the Ecommerce project",
-    ),
-    public=True,
-    permission_classes=(AllowAny,),
-)
-
 urlpatterns = [
     # JWT Token endpoints
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
@@ -30,8 +19,12 @@ urlpatterns = [
     
     # Authentication endpoints
     path('api/auth/register/', viewsAuth.UserRegistrationView.as_view(), name='user_register'),
+    path('api/auth/register/bulk/', viewsAuth.BulkUserRegistrationView.as_view(), name='user_register_bulk'),
     path('api/auth/login/', viewsAuth.login_view, name='user_login'),
+    path('api/auth/login/async/', viewsAuth.login_async_view, name='user_login_async'),
     path('api/auth/profile/', viewsAuth.UserProfileView.as_view(), name='user_profile'),
+    path('api/auth/logout/', viewsAuth.LogoutView.as_view(), name='user_logout'),
+    path('api/auth/revoke/', viewsAuth.RevokeUserTokensView.as_view(), name='user_revoke_tokens'),
     
     # Category endpoints
     path('api/categories/', viewsCategories.CategoryListView.as_view(), name='category_list'),
@@ -58,14 +51,46 @@ urlpatterns = [
     path('api/cart/clear/', viewsCart.CartClearView.as_view(), name='cart_clear'),
     path('api/cart/<int:cart_id>/', viewsCart.CartItemView.as_view(), name='cart_item'),
     
+    # Customer endpoints
+    path('api/customers/', viewsCustomer.CustomerListView.as_view(), name='customer_list'),
+    
     # Order endpoints
     path('api/orders/', viewsOrder.OrderListView.as_view(), name='order_list'),
     path('api/orders/create/', viewsOrder.OrderCreateView.as_view(), name='order_create'),
+    path('api/orders/ship/', viewsOrderShipper.OrderShipperView.as_view(), name='order_ship'),
+    path('api/orders/status/', viewsOrderStatus.OrderStatusQueueView.as_view(), name='order_status_queue'),
     path('api/orders/<int:order_id>/', viewsOrder.OrderDetailView.as_view(), name='order_detail'),
     path('api/orders/<int:order_id>/manage/', viewsOrder.OrderUpdateView.as_view(), name='order_update'),
+    path('api/orders/<int:order_id>/status/', viewsOrderStatus.OrderStatusView.as_view(), name='order_status'),
+    
+    # Async (ASGI) read endpoints, same responses as the ones above
+    path('api/categories/async/', viewsAsync.category_list, name='category_list_async'),
+    path('api/categories/<int:category_id>/async/', viewsAsync.category_detail, name='category_detail_async'),
+    path('api/products/async/', viewsAsync.product_list, name='product_list_async'),
+    path('api/products/<int:product_id>/async/', viewsAsync.product_detail, name='product_detail_async'),
+    path('api/orders/async/', viewsAsync.order_list, name='order_list_async'),
+    path('api/orders/<int:order_id>/async/', viewsAsync.order_detail, name='order_detail_async'),
+    
+    # Background jobs
+    path('api/jobs/metrics/', viewsJobs.JobMetricsView.as_view(), name='job_metrics'),
     
-    # Swagger documentation
-    path('', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    # Database connection pool
+    path('api/db/pool/', viewsDatabase.DatabasePoolView.as_view(), name='db_pool_stats'),
+    
+    # Request profiling
+    path('api/profiling/', viewsProfiling.ProfileListView.as_view(), name='profile_list'),
+    path('api/profiling/token/', viewsProfiling.ProfilingTokenView.as_view(), name='profiling_token'),
+    
+    # Prometheus metrics
+    path('metrics', viewsMetrics.metrics_view, name='metrics'),
     
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+# Swagger documentation, only imported when enabled
+if settings.API_DOCS:
+    from .views.viewsSchema import schema_view
+
+    urlpatterns += [
+        path('', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
+        path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    ]
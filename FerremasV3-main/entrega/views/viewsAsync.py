@@ -0,0 +1,134 @@
+"""
+Native async read endpoints for ASGI deployments (uvicorn).
+
+Same responses as the catalog and order read APIViews, but the queries go
+through the async ORM (``aget`` / ``async for``) with every relation the
+serializers read preloaded, so one process can keep many requests in
+flight. DRF 3.14 views are sync only, hence plain async Django views.
+The full order list is streamed like the sync one (JSON only, there is
+no browsable API here).
+"""
+import functools
+
+from django.http import Http404, JsonResponse
+from rest_framework.exceptions import AuthenticationFailed
+from ..archive import afind_order, afind_orders, is_archived, preload_orders
+from ..authentication import ClaimsUser, aauthenticate
+from ..models import Category, Customer, Order, Product, ProductRecommendation
+from ..serializers import CategorySerializer, OrderSerializer, ProductSerializer, RelatedProductSerializer
+from ..streaming import StreamingJSONResponse
+from .viewsProducts import filter_products
+
+def _error(data, status):
+    if not isinstance(data, dict):
+        data = {'detail': data}
+    return JsonResponse(data, status=status)
+
+def async_get(authenticated=False):
+    """GET only, 404 on Http404 and, if ``authenticated``, a JWT in request.user."""
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return _error(f'Method "{request.method}" not allowed.', 405)
+            if authenticated:
+                try:
+                    auth = await aauthenticate(request)
+                except AuthenticationFailed as e:
+                    return _error(e.detail, 401)
+                if auth is None:
+                    return _error('Authentication credentials were not provided.', 401)
+                request.user, request.auth = auth
+            try:
+                return await view(request, *args, **kwargs)
+            except Http404:
+                return _error('Not found.', 404)
+        return wrapper
+    return decorator
+
+async def _acustomer(user):
+    # Claims users carry the customer id, regular users need the lookup
+    if isinstance(user, ClaimsUser):
+        return user.customer
+    return await Customer.objects.aget(user=user)
+
+@async_get()
+async def product_list(request):
+    products = filter_products(Product.objects.select_related('category', 'supplier'), request.GET)
+    products = [product async for product in products]
+    return JsonResponse(ProductSerializer(products, many=True).data, safe=False)
+
+@async_get()
+async def product_detail(request, product_id):
+    try:
+        product = await Product.objects.select_related('category', 'supplier').aget(product_id=product_id)
+    except Product.DoesNotExist:
+        raise Http404
+    data = ProductSerializer(product).data
+
+    if request.GET.get('related') in ('1', 'true', 'True'):
+        related = (
+            ProductRecommendation.objects
+            .filter(product_id=product_id)
+            .select_related('related_product')
+        )
+        related = [recommendation async for recommendation in related]
+        data['related'] = RelatedProductSerializer(related, many=True).data
+    return JsonResponse(data)
+
+@async_get()
+async def category_list(request):
+    categories = [category async for category in Category.objects.all()]
+    return JsonResponse(CategorySerializer(categories, many=True).data, safe=False)
+
+@async_get()
+async def category_detail(request, category_id):
+    try:
+        category = await Category.objects.aget(category_id=category_id)
+    except Category.DoesNotExist:
+        raise Http404
+    return JsonResponse(CategorySerializer(category).data)
+
+@async_get(authenticated=True)
+async def order_list(request):
+    customer = None
+    if request.user.user_type == 'customer':
+        try:
+            customer = await _acustomer(request.user)
+        except Customer.DoesNotExist:
+            return _error({'error': 'Customer profile not found'}, 404)
+        orders = Order.objects.filter(customer=customer)
+    elif request.user.user_type == 'employee':
+        orders = Order.objects.all()
+    else:
+        return _error({'error': 'Invalid user type'}, 403)
+
+    # Lookups by id also search the archive
+    order_ids = request.GET.get('order_id')
+    if order_ids:
+        try:
+            order_ids = [int(order_id) for order_id in order_ids.split(',')]
+        except ValueError:
+            return _error({'error': 'order_id must be a comma separated list of integers'}, 400)
+        orders = await afind_orders(order_ids, customer=customer)
+        return JsonResponse(OrderSerializer(orders, many=True).data, safe=False)
+    # Sent a page at a time, each page read in a sync_to_async call
+    return StreamingJSONResponse(preload_orders(orders), OrderSerializer, request)
+
+@async_get(authenticated=True)
+async def order_detail(request, order_id):
+    order = await afind_order(order_id)
+
+    if request.user.user_type == 'customer':
+        try:
+            customer = await _acustomer(request.user)
+        except Customer.DoesNotExist:
+            return _error({'error': 'Customer profile not found'}, 404)
+        if order.customer_id != customer.pk:
+            return _error({'error': 'Access denied'}, 403)
+    elif request.user.user_type != 'employee':
+        return _error({'error': 'Access denied'}, 403)
+
+    data = OrderSerializer(order).data
+    data['archived'] = is_archived(order)
+    return JsonResponse(data)
@@ -1,14 +1,21 @@
+import json
+from asgiref.sync import sync_to_async
 from rest_framework import status, generics
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import authenticate
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from ..serializers import UserRegistrationSerializer, UserSerializer
+from ..authentication import get_full_user, tokens_for_user
+from ..login import LoginThrottled, acheck_credentials, check_credentials
+from ..serializers import BulkUserRegistrationSerializer, UserRegistrationSerializer, UserSerializer
 from ..models import User
+from .. import provisioning, revocation
 
 class UserRegistrationView(APIView):
     permission_classes = [AllowAny]
@@ -26,19 +33,43 @@ class UserRegistrationView(APIView):
         if serializer.is_valid():
             user = serializer.save()
             
-            # Generate tokens
-            refresh = RefreshToken.for_user(user)
-            
             return Response({
                 'message': 'User registered successfully',
                 'user': UserSerializer(user).data,
-                'tokens': {
-                    'refresh': str(refresh),
-                    'access': str(refresh.access_token),
-                }
+                'tokens': tokens_for_user(user)
             }, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class BulkUserRegistrationView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    @swagger_auto_schema(
+        operation_description="Register a batch of users of one type, optionally with initial tokens (Employee only)",
+        request_body=BulkUserRegistrationSerializer,
+        responses={
+            201: openapi.Response(description="Users created successfully"),
+            400: openapi.Response(description="Bad request"),
+            403: openapi.Response(description="Permission denied")
+        }
+    )
+    def post(self, request):
+        if request.user.user_type != 'employee':
+            return Response({'error': 'Only employees can register users in bulk'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        serializer = BulkUserRegistrationSerializer(data=request.data)
+        if serializer.is_valid():
+            data = serializer.validated_data
+            users = provisioning.provision_users(data['users'], data['user_type'])
+            response = {
+                'message': f'{len(users)} users registered successfully',
+                'users': UserSerializer(users, many=True).data,
+            }
+            if data['tokens']:
+                response['tokens'] = provisioning.mint_tokens(users)
+            return Response(response, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
 class UserProfileView(APIView):
     permission_classes = [IsAuthenticated]
     
@@ -47,7 +78,7 @@ class UserProfileView(APIView):
         responses={200: UserSerializer}
     )
     def get(self, request):
-        serializer = UserSerializer(request.user)
+        serializer = UserSerializer(get_full_user(request.user))
         return Response(serializer.data)
     
     @swagger_auto_schema(
@@ -56,7 +87,7 @@ class UserProfileView(APIView):
         responses={200: UserSerializer}
     )
     def put(self, request):
-        serializer = UserSerializer(request.user, data=request.data, partial=True)
+        serializer = UserSerializer(get_full_user(request.user), data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data)
@@ -76,24 +107,126 @@ class UserProfileView(APIView):
     ),
     responses={
         200: openapi.Response(description="Login successful"),
-        401: openapi.Response(description="Invalid credentials")
+        401: openapi.Response(description="Invalid credentials"),
+        429: openapi.Response(description="Too many logins in progress, retry shortly")
     }
 )
 def login_view(request):
+    if not isinstance(request.data, dict):
+        return Response({'error': 'Username and password required'}, status=status.HTTP_400_BAD_REQUEST)
     username = request.data.get('username')
     password = request.data.get('password')
     
     if username and password:
-        user = authenticate(username=username, password=password)
+        try:
+            user = check_credentials(username, password, request)
+        except LoginThrottled:
+            return Response({'error': 'Too many login attempts in progress, retry shortly'}, 
+                          status=status.HTTP_429_TOO_MANY_REQUESTS, headers={'Retry-After': '1'})
         if user:
-            refresh = RefreshToken.for_user(user)
             return Response({
                 'message': 'Login successful',
                 'user': UserSerializer(user).data,
-                'tokens': {
-                    'refresh': str(refresh),
-                    'access': str(refresh.access_token),
-                }
+                'tokens': tokens_for_user(user)
             })
         return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
     return Response({'error': 'Username and password required'}, status=status.HTTP_400_BAD_REQUEST)
+
+async def login_async_view(request):
+    """
+    Same contract as login_view for ASGI deployments: the event loop keeps
+    serving other requests while the password is hashed in the login pool.
+    Credentials are checked as in entrega.login (AUTHENTICATION_BACKENDS and
+    user_login_failed included).
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({'error': 'Username and password required'}, status=400)
+    username = data.get('username')
+    password = data.get('password')
+    
+    if username and password:
+        try:
+            user = await acheck_credentials(username, password, request)
+        except LoginThrottled:
+            response = JsonResponse({'error': 'Too many login attempts in progress, retry shortly'}, status=429)
+            response['Retry-After'] = '1'
+            return response
+        if user:
+            tokens = await sync_to_async(tokens_for_user)(user)
+            return JsonResponse({
+                'message': 'Login successful',
+                'user': UserSerializer(user).data,
+                'tokens': tokens
+            })
+        return JsonResponse({'error': 'Invalid credentials'}, status=401)
+    return JsonResponse({'error': 'Username and password required'}, status=400)
+
+# JWT API: no session cookie to protect (csrf_exempt is not async-aware in Django 4.2)
+login_async_view.csrf_exempt = True
+
+
+
+class LogoutView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    @swagger_auto_schema(
+        operation_description="Revoke the current access token and, if given, the refresh token",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'refresh': openapi.Schema(type=openapi.TYPE_STRING),
+            }
+        ),
+        responses={
+            205: openapi.Response(description="Logged out"),
+            400: openapi.Response(description="Invalid refresh token")
+        }
+    )
+    def post(self, request):
+        refresh = request.data.get('refresh')
+        if refresh:
+            try:
+                refresh = RefreshToken(refresh)
+            except TokenError:
+                return Response({'error': 'Invalid refresh token'}, status=status.HTTP_400_BAD_REQUEST)
+            if str(refresh.get('user_id')) != str(request.user.pk):
+                return Response({'error': 'Refresh token belongs to another user'}, 
+                              status=status.HTTP_400_BAD_REQUEST)
+            revocation.revoke(refresh)
+        
+        revocation.revoke(request.auth)
+        return Response({'message': 'Logged out'}, status=status.HTTP_205_RESET_CONTENT)
+
+
+class RevokeUserTokensView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    @swagger_auto_schema(
+        operation_description="Revoke every token issued so far to a user (Employee only)",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'user_id': openapi.Schema(type=openapi.TYPE_INTEGER),
+            },
+            required=['user_id']
+        ),
+        responses={
+            200: openapi.Response(description="Tokens revoked"),
+            403: openapi.Response(description="Permission denied"),
+            404: openapi.Response(description="User not found")
+        }
+    )
+    def post(self, request):
+        if request.user.user_type != 'employee':
+            return Response({'error': 'Only employees can revoke tokens'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        user = get_object_or_404(User, pk=request.data.get('user_id'))
+        revocation.revoke_user(user.pk)
+        return Response({'message': f'Tokens of {user.username} revoked'})
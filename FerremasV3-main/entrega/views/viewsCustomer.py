@@ -7,6 +7,7 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from ..models import Customer
 from ..serializers import CustomerSerializer
+from ..streaming import StreamingJSONResponse, streams
 
 class CustomerListView(APIView):
     permission_classes = [IsAuthenticated]
@@ -20,6 +21,8 @@ class CustomerListView(APIView):
             return Response({'error': 'Only employees can view customer list'}, 
                           status=status.HTTP_403_FORBIDDEN)
         
-        customers = Customer.objects.all()
-        serializer = CustomerSerializer(customers, many=True)
-        return Response(serializer.data)
+        # JSON is sent a page at a time, memory bounded by the page size
+        customers = Customer.objects.select_related('user')
+        if streams(request):
+            return StreamingJSONResponse(customers, CustomerSerializer, request)
+        return Response(CustomerSerializer(customers, many=True).data)
@@ -0,0 +1,28 @@
+from django.conf import settings
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from ..db.pool import pool_stats
+
+class DatabasePoolView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    @swagger_auto_schema(
+        operation_description="Connection pool statistics of this process per database alias (Employee only)",
+        responses={
+            200: openapi.Response(description="Pool statistics by database alias"),
+            403: openapi.Response(description="Permission denied")
+        }
+    )
+    def get(self, request):
+        if request.user.user_type != 'employee':
+            return Response({'error': 'Only employees can view database pool statistics'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        return Response({
+            'profile': getattr(settings, 'DB_PROFILE', 'sqlite'),
+            'pools': pool_stats(),
+        })
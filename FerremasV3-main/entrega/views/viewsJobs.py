@@ -0,0 +1,24 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from ..jobs import queue_metrics
+
+class JobMetricsView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    @swagger_auto_schema(
+        operation_description="Background job queue counts per job type and status (Employee only)",
+        responses={
+            200: openapi.Response(description="Queue metrics by job type"),
+            403: openapi.Response(description="Permission denied")
+        }
+    )
+    def get(self, request):
+        if request.user.user_type != 'employee':
+            return Response({'error': 'Only employees can view job metrics'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        return Response(queue_metrics())
@@ -0,0 +1,19 @@
+import hmac
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_safe
+from .. import metrics
+
+@require_safe
+def metrics_view(request):
+    """Prometheus scrape endpoint, protected by ``METRICS['TOKEN']``.
+
+    Without a token it is only served with ``DEBUG`` on: route names, status
+    codes and query counts are not for everyone.
+    """
+    token = metrics.get_option('TOKEN')
+    if not token and not settings.DEBUG:
+        return HttpResponse('Metrics need METRICS_TOKEN\n', status=403, content_type='text/plain')
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse('Invalid metrics token\n', status=401, content_type='text/plain')
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -3,21 +3,30 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from ..models import Order, Orderdetails, Customer, Cart
 from ..serializers import OrderSerializer, OrderCreateSerializer, OrderDetailsSerializer
+from ..jobs import enqueue
+from ..tasks import enqueue_post_checkout
+from ..archive import find_order, find_orders, is_archived, preload_orders
+from ..streaming import StreamingJSONResponse, streams
 
 class OrderListView(APIView):
     permission_classes = [IsAuthenticated]
     
     @swagger_auto_schema(
         operation_description="Get user's orders (customers see their own, employees see all)",
+        manual_parameters=[
+            openapi.Parameter('order_id', openapi.IN_QUERY, description="Comma separated order IDs, archived orders included", type=openapi.TYPE_STRING),
+        ],
         responses={200: OrderSerializer(many=True)}
     )
     def get(self, request):
+        customer = None
         if request.user.user_type == 'customer':
             try:
                 customer = request.user.customer
@@ -31,8 +40,24 @@ class OrderListView(APIView):
             return Response({'error': 'Invalid user type'}, 
                           status=status.HTTP_403_FORBIDDEN)
         
-        serializer = OrderSerializer(orders, many=True)
-        return Response(serializer.data)
+        # Lookups by id also search the archive
+        order_ids = request.GET.get('order_id')
+        if order_ids:
+            try:
+                order_ids = [int(order_id) for order_id in order_ids.split(',')]
+            except ValueError:
+                return Response({'error': 'order_id must be a comma separated list of integers'}, 
+                              status=status.HTTP_400_BAD_REQUEST)
+            orders = find_orders(order_ids, customer=customer)
+            serializer = OrderSerializer(orders, many=True)
+            return Response(serializer.data)
+        
+        # All of the customer's orders, or every order for employees: JSON is sent
+        # a page at a time, memory bounded by the page size
+        orders = preload_orders(orders)
+        if streams(request):
+            return StreamingJSONResponse(orders, OrderSerializer, request)
+        return Response(OrderSerializer(orders, many=True).data)
 
 class OrderDetailView(APIView):
     permission_classes = [IsAuthenticated]
@@ -46,13 +71,13 @@ class OrderDetailView(APIView):
         }
     )
     def get(self, request, order_id):
-        order = get_object_or_404(Order, order_id=order_id)
+        order = find_order(order_id)
         
         # Check permissions
         if request.user.user_type == 'customer':
             try:
                 customer = request.user.customer
-                if order.customer != customer:
+                if order.customer_id != customer.pk:
                     return Response({'error': 'Access denied'}, 
                                   status=status.HTTP_403_FORBIDDEN)
             except Customer.DoesNotExist:
@@ -62,8 +87,9 @@ class OrderDetailView(APIView):
             return Response({'error': 'Access denied'}, 
                           status=status.HTTP_403_FORBIDDEN)
         
-        serializer = OrderSerializer(order)
-        return Response(serializer.data)
+        data = OrderSerializer(order).data
+        data['archived'] = is_archived(order)
+        return Response(data)
 
 class OrderCreateView(APIView):
     permission_classes = [IsAuthenticated]
@@ -100,34 +126,43 @@ class OrderCreateView(APIView):
                     return Response({'error': 'Cart is empty'}, 
                                   status=status.HTTP_400_BAD_REQUEST)
                 
-                # Create order
-                order = Order.objects.create(
-                    customer=customer,
-                    order_date=timezone.now(),
-                    required_date=request.data.get('required_date'),
-                    freight=request.data.get('freight', 0),
-                    shipper_id=request.data.get('shipper')
-                )
-                
-                # Create order details from cart
-                for cart_item in cart_items:
-                    Orderdetails.objects.create(
-                        order=order,
-                        product=cart_item.product,
-                        unit_price=cart_item.product.unit_price,
-                        quantity=cart_item.num_of_products,
-                        discount=cart_item.product.discount or 0
+                with transaction.atomic():
+                    # Create order (by id: a claims user's customer only carries its pk)
+                    order = Order.objects.create(
+                        customer_id=customer.pk,
+                        order_date=timezone.now(),
+                        required_date=request.data.get('required_date'),
+                        freight=request.data.get('freight', 0),
+                        shipper_id=request.data.get('shipper')
                     )
-                
-                # Clear cart
-                cart_items.delete()
+                    
+                    # Create order details from cart
+                    product_ids = []
+                    for cart_item in cart_items:
+                        Orderdetails.objects.create(
+                            order=order,
+                            product=cart_item.product,
+                            unit_price=cart_item.product.unit_price,
+                            quantity=cart_item.num_of_products,
+                            discount=cart_item.product.discount or 0
+                        )
+                        product_ids.append(cart_item.product_id)
+                    
+                    # Clear cart
+                    cart_items.delete()
+                    
+                    # Emails, invoice, stock and rollups run in workers once this commits
+                    enqueue_post_checkout(order, product_ids)
                 
                 return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
             else:
                 # Custom order creation logic can be added here
                 serializer = OrderCreateSerializer(data=request.data, context={'request': request})
                 if serializer.is_valid():
-                    order = serializer.save()
+                    with transaction.atomic():
+                        order = serializer.save()
+                        product_ids = order.orderdetails_set.values_list('product_id', flat=True)
+                        enqueue_post_checkout(order, [pid for pid in product_ids if pid])
                     return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
                 
@@ -150,8 +185,10 @@ class OrderUpdateView(APIView):
         ),
         responses={
             200: OrderSerializer,
+            400: openapi.Response(description="Bad request or order cannot be shipped"),
             404: openapi.Response(description="Order not found"),
-            403: openapi.Response(description="Permission denied")
+            403: openapi.Response(description="Permission denied"),
+            409: openapi.Response(description="Order status changed concurrently")
         }
     )
     def put(self, request, order_id):
@@ -161,10 +198,28 @@ class OrderUpdateView(APIView):
         
         order = get_object_or_404(Order, order_id=order_id)
         serializer = OrderSerializer(order, data=request.data, partial=True)
-        if serializer.is_valid():
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Stamping shipped_date ships the order: same transition check as OrderStatusView
+        shipping = serializer.validated_data.get('shipped_date') is not None and order.shipped_date is None
+        if shipping and not order.can_transition_to('shipped'):
+            return Response({'error': f"Cannot change order from '{order.status}' to 'shipped'"}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            if shipping:
+                updated = Order.objects.filter(order_id=order_id, status=order.status).update(status='shipped')
+                if not updated:
+                    return Response({'error': 'Order status changed, reload and retry'}, 
+                                  status=status.HTTP_409_CONFLICT)
+                order.status = 'shipped'
             serializer.save()
-            return Response(serializer.data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        if shipping:
+            product_ids = list(order.orderdetails_set.exclude(product=None).values_list('product_id', flat=True))
+            if product_ids:
+                enqueue('stock_recalculation', {'product_ids': product_ids})
+        return Response(serializer.data)
     
     def delete(self, request, order_id):
         if request.user.user_type != 'employee':
@@ -1,6 +1,77 @@
-from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from ..jobs import enqueue
+from ..models import Order, Orderdetails
+from ..serializers import BulkShipSerializer
 
 class OrderShipperView(APIView):
-    def get(self, request):
-        return Response({'message': 'OrderShipper endpoint'})
+    permission_classes = [IsAuthenticated]
+    
+    @swagger_auto_schema(
+        operation_description="Assign a shipper and stamp shipped_date for many orders at once (Employee only). "
+                              "Returns the pick list for the shipped orders aggregated by product.",
+        request_body=BulkShipSerializer,
+        responses={
+            200: openapi.Response(description="Orders shipped and pick list"),
+            400: openapi.Response(description="Bad request"),
+            403: openapi.Response(description="Permission denied")
+        }
+    )
+    def post(self, request):
+        if request.user.user_type != 'employee':
+            return Response({'error': 'Only employees can ship orders'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        serializer = BulkShipSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        order_ids = sorted(set(serializer.validated_data['order_ids']))
+        shipper = serializer.validated_data['shipper']
+        shipped_date = serializer.validated_data.get('shipped_date') or timezone.now()
+        
+        with transaction.atomic():
+            # Only orders whose status allows shipping are touched
+            pending = list(
+                Order.objects
+                .select_for_update()
+                .filter(order_id__in=order_ids, status__in=Order.statuses_before('shipped'))
+                .values_list('order_id', flat=True)
+            )
+            Order.objects.filter(order_id__in=pending).update(
+                shipper=shipper, shipped_date=shipped_date, status='shipped'
+            )
+        
+        # One GROUP BY over the shipped orders
+        pick_list = list(
+            Orderdetails.objects
+            .filter(order_id__in=pending, product__isnull=False)
+            .values('product_id', 'product__product_name')
+            .annotate(quantity=Sum('quantity'), orders=Count('order_id', distinct=True))
+            .order_by('product_id')
+        )
+        if pick_list:
+            enqueue('stock_recalculation', {'product_ids': [row['product_id'] for row in pick_list]})
+        
+        return Response({
+            'shipped': len(pending),
+            'skipped': sorted(set(order_ids) - set(pending)),
+            'shipper': shipper.pk,
+            'shipped_date': shipped_date,
+            'pick_list': [
+                {
+                    'product_id': row['product_id'],
+                    'product_name': row['product__product_name'],
+                    'quantity': row['quantity'],
+                    'orders': row['orders'],
+                }
+                for row in pick_list
+            ],
+        })
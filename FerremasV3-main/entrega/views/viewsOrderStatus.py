@@ -1,6 +1,134 @@
-from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from ..jobs import enqueue
+from ..models import Order, Customer
+from ..serializers import OrderSerializer, OrderStatusSerializer
 
-class OrderStatusView(APIView):
+class OrderStatusQueueView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    @swagger_auto_schema(
+        operation_description="Orders in a given status, oldest first (Employee only)",
+        manual_parameters=[
+            openapi.Parameter('status', openapi.IN_QUERY, description="Order status", type=openapi.TYPE_STRING,
+                              enum=[choice for choice, _ in Order.STATUS_CHOICES], required=True),
+            openapi.Parameter('limit', openapi.IN_QUERY, description="Max orders returned (default 100, max 1000)", type=openapi.TYPE_INTEGER),
+        ],
+        responses={
+            200: openapi.Response(description="Orders in the requested status"),
+            400: openapi.Response(description="Bad request"),
+            403: openapi.Response(description="Permission denied")
+        }
+    )
     def get(self, request):
-        return Response({'message': 'OrderStatus endpoint'})
+        if request.user.user_type != 'employee':
+            return Response({'error': 'Only employees can view order queues'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        order_status = request.GET.get('status')
+        if order_status not in Order.TRANSITIONS:
+            return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.GET.get('limit', 100)), 1000)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Range scan on the (status, order_date) index
+        orders = (
+            Order.objects
+            .filter(status=order_status)
+            .order_by('order_date')
+            .values('order_id', 'customer_id', 'order_date', 'required_date', 'shipper_id', 'status')[:limit]
+        )
+        return Response(list(orders))
+
+class OrderStatusView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    @swagger_auto_schema(
+        operation_description="Get order status and the statuses it can move to",
+        responses={
+            200: openapi.Response(description="Current status and allowed transitions"),
+            403: openapi.Response(description="Permission denied"),
+            404: openapi.Response(description="Order not found")
+        }
+    )
+    def get(self, request, order_id):
+        order = get_object_or_404(Order, order_id=order_id)
+        error = self._check_access(request, order)
+        if error:
+            return error
+        return Response({
+            'order_id': order.order_id,
+            'status': order.status,
+            'allowed': list(Order.TRANSITIONS[order.status]),
+        })
+    
+    @swagger_auto_schema(
+        operation_description="Move order to a new status. Employees may apply any allowed transition, "
+                              "customers may only cancel their own pending orders.",
+        request_body=OrderStatusSerializer,
+        responses={
+            200: OrderSerializer,
+            400: openapi.Response(description="Transition not allowed"),
+            403: openapi.Response(description="Permission denied"),
+            404: openapi.Response(description="Order not found"),
+            409: openapi.Response(description="Order status changed concurrently")
+        }
+    )
+    def put(self, request, order_id):
+        order = get_object_or_404(Order, order_id=order_id)
+        error = self._check_access(request, order)
+        if error:
+            return error
+        
+        serializer = OrderStatusSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        new_status = serializer.validated_data['status']
+        
+        if request.user.user_type == 'customer' and new_status != 'cancelled':
+            return Response({'error': 'Customers can only cancel orders'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        if request.user.user_type == 'customer' and order.status != 'pending':
+            # The conditional update below keeps it pending until cancelled
+            return Response({'error': 'Customers can only cancel pending orders'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        if not order.can_transition_to(new_status):
+            return Response({'error': f"Cannot change order from '{order.status}' to '{new_status}'"}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        changes = {'status': new_status}
+        if new_status == 'shipped' and order.shipped_date is None:
+            changes['shipped_date'] = timezone.now()
+        # Conditional update so two concurrent transitions cannot both win
+        updated = Order.objects.filter(order_id=order_id, status=order.status).update(**changes)
+        if not updated:
+            return Response({'error': 'Order status changed, reload and retry'}, 
+                          status=status.HTTP_409_CONFLICT)
+        
+        if new_status in ('shipped', 'cancelled'):
+            product_ids = list(order.orderdetails_set.exclude(product=None).values_list('product_id', flat=True))
+            if product_ids:
+                enqueue('stock_recalculation', {'product_ids': product_ids})
+        
+        order.refresh_from_db()
+        return Response(OrderSerializer(order).data)
+    
+    def _check_access(self, request, order):
+        if request.user.user_type == 'employee':
+            return None
+        if request.user.user_type == 'customer':
+            try:
+                if order.customer_id == request.user.customer.pk:
+                    return None
+            except Customer.DoesNotExist:
+                return Response({'error': 'Customer profile not found'}, 
+                              status=status.HTTP_404_NOT_FOUND)
+        return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
@@ -7,8 +7,30 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Q
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from ..models import Product, Category, Supplier
-from ..serializers import ProductSerializer, ProductCreateSerializer
+from ..models import Product, Category, Supplier, ProductRecommendation
+from ..serializers import ProductSerializer, ProductCreateSerializer, RelatedProductSerializer
+
+def filter_products(products, params):
+    """Apply the catalog query parameters (search, category, min_price, max_price)."""
+    search = params.get('search')
+    if search:
+        products = products.filter(
+            Q(product_name__icontains=search) | 
+            Q(category__category_name__icontains=search)
+        )
+    
+    category_id = params.get('category')
+    if category_id:
+        products = products.filter(category_id=category_id)
+    
+    min_price = params.get('min_price')
+    if min_price:
+        products = products.filter(unit_price__gte=min_price)
+    
+    max_price = params.get('max_price')
+    if max_price:
+        products = products.filter(unit_price__lte=max_price)
+    return products
 
 class ProductListView(APIView):
     permission_classes = [AllowAny]  # Anyone can view products
@@ -24,28 +46,7 @@ class ProductListView(APIView):
         responses={200: ProductSerializer(many=True)}
     )
     def get(self, request):
-        products = Product.objects.all()
-        
-        # Apply filters
-        search = request.GET.get('search')
-        if search:
-            products = products.filter(
-                Q(product_name__icontains=search) | 
-                Q(category__category_name__icontains=search)
-            )
-        
-        category_id = request.GET.get('category')
-        if category_id:
-            products = products.filter(category_id=category_id)
-        
-        min_price = request.GET.get('min_price')
-        if min_price:
-            products = products.filter(unit_price__gte=min_price)
-        
-        max_price = request.GET.get('max_price')
-        if max_price:
-            products = products.filter(unit_price__lte=max_price)
-        
+        products = filter_products(Product.objects.all(), request.GET)
         serializer = ProductSerializer(products, many=True)
         return Response(serializer.data)
 
@@ -54,6 +55,9 @@ class ProductDetailView(APIView):
     
     @swagger_auto_schema(
         operation_description="Get product by ID",
+        manual_parameters=[
+            openapi.Parameter('related', openapi.IN_QUERY, description="Include frequently bought together products", type=openapi.TYPE_BOOLEAN),
+        ],
         responses={
             200: ProductSerializer,
             404: openapi.Response(description="Product not found")
@@ -61,8 +65,17 @@ class ProductDetailView(APIView):
     )
     def get(self, request, product_id):
         product = get_object_or_404(Product, product_id=product_id)
-        serializer = ProductSerializer(product)
-        return Response(serializer.data)
+        data = ProductSerializer(product).data
+
+        # Precomputed by build_recommendations: a single indexed lookup on (product, rank)
+        if request.GET.get('related') in ('1', 'true', 'True'):
+            related = (
+                ProductRecommendation.objects
+                .filter(product_id=product_id)
+                .select_related('related_product')
+            )
+            data['related'] = RelatedProductSerializer(related, many=True).data
+        return Response(data)
 
 class ProductManagementView(APIView):
     permission_classes = [IsAuthenticated]  # Only authenticated users can manage
@@ -0,0 +1,51 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from .. import profiling
+
+class ProfilingTokenView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    @swagger_auto_schema(
+        operation_description="Issue a single-use token to profile one request: send it in the X-Profile header, "
+                              "optionally with X-Profile-Format: pstats (default) or collapsed (Employee only)",
+        responses={
+            201: openapi.Response(description="Profiling token"),
+            403: openapi.Response(description="Permission denied"),
+            503: openapi.Response(description="No shared cache to spend tokens in")
+        }
+    )
+    def post(self, request):
+        if request.user.user_type != 'employee':
+            return Response({'error': 'Only employees can profile requests'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        if not profiling.available():
+            return Response({'error': "Profiling needs a cache shared by every process in PROFILING['CACHE']"}, 
+                          status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        return Response({
+            'header': profiling.HEADER,
+            'token': profiling.issue_token(request.user),
+            'expires_in': profiling.get_option('TOKEN_MAX_AGE'),
+            'formats': profiling.FORMATS,
+        }, status=status.HTTP_201_CREATED)
+
+class ProfileListView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    @swagger_auto_schema(
+        operation_description="Stored request profiles, newest first (Employee only)",
+        responses={
+            200: openapi.Response(description="Profiles with route, status and timing"),
+            403: openapi.Response(description="Permission denied")
+        }
+    )
+    def get(self, request):
+        if request.user.user_type != 'employee':
+            return Response({'error': 'Only employees can view profiles'}, 
+                          status=status.HTTP_403_FORBIDDEN)
+        
+        return Response(profiling.list_profiles())
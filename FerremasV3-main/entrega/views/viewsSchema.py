@@ -0,0 +1,34 @@
+from django.http import HttpResponse
+from django.views.decorators.http import condition, require_safe
+from drf_yasg.views import get_schema_view
+from rest_framework.permissions import AllowAny
+from .. import schema
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'yaml': 'application/yaml',
+}
+
+# Swagger UI and ReDoc pages, fed from the schema kept in memory (see entrega/schema.py)
+schema_view = get_schema_view(
+    schema.INFO,
+    public=True,
+    permission_classes=(AllowAny,),
+    generator_class=schema.PrecomputedSchemaGenerator,
+)
+
+def _format(format):
+    return format.lstrip('.')
+
+def _etag(request, format):
+    return schema.get_document(_format(format))[1]
+
+@require_safe
+@condition(etag_func=_etag)
+def schema_document(request, format):
+    """The OpenAPI document as ``.json`` or ``.yaml``, answered with 304 when the ETag matches."""
+    fmt = _format(format)
+    content = schema.get_document(fmt)[0]
+    response = HttpResponse(content, content_type=CONTENT_TYPES[fmt])
+    response['Cache-Control'] = 'public, max-age=3600'
+    return response
@@ -6,6 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
+    if sys.argv[1:2] == ['test']:
+        # In-memory database, fast hasher, parallel runner
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'entrega.tests.test_settings')
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'apiIntegracion.settings')
     try:
         from django.core.management import execute_from_command_line
@@ -97,7 +97,7 @@ def print_usage_instructions():
         "   http://127.0.0.1:8000/ (Swagger UI)",
         "",
         "3. Test the API endpoints:",
-        "   python comprehensive_test.py",
+        "   python manage.py test entrega.tests -p \"tests*.py\"",
         "",
         "4. Login credentials:",
         "   Admin: admin / admin123",
@@ -142,8 +142,8 @@ def run_quick_test():
     print("-" * 50)
     
     try:
-        result = subprocess.run([sys.executable, "comprehensive_test.py"], 
-                              capture_output=True, text=True, timeout=30)
+        result = subprocess.run([sys.executable, "manage.py", "test", "entrega.tests", "-p", "tests*.py"], 
+                              capture_output=True, text=True, timeout=300)
         if result.returncode == 0:
             print("✅ All API tests passed!")
         else:
@@ -151,7 +151,7 @@ def run_quick_test():
             print(result.stdout)
             print(result.stderr)
     except subprocess.TimeoutExpired:
-        print("⏰ Test timeout - server might not be running")
+        print("⏰ Test timeout")
     except Exception as e:
         print(f"❌ Test error: {e}")
 